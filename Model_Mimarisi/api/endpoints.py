@@ -5,27 +5,21 @@ FastAPI tabanlı web API
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
-import os
+from typing import Optional, List, AsyncIterator, Any, Dict
+import json
+import math
 import sys
 from pathlib import Path
 
 # Model modüllerini import et
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from model.question_predictor import QuestionPredictor
-
-# Konfigürasyon
-BASE_DIR = Path(__file__).parent.parent
-DATA_FILE = BASE_DIR / "data.json"
-
-# Ortam değişkenlerinden API key al
-from dotenv import load_dotenv
-load_dotenv(BASE_DIR / ".env")
-load_dotenv(BASE_DIR.parent / ".env")
-
-GEMINI_API_KEY = os.getenv("Gemini_API_Key", "")
+from model.records import to_dicts
+from model.exceptions import LLMError
+# Ayarlar (.env ve ortam değişkenleri) config.py'de okunur; tahminleyici CLI ile ortak fabrikada kurulur
+from model.factory import create_predictor
 
 # FastAPI uygulaması
 app = FastAPI(
@@ -77,26 +71,27 @@ def get_predictor() -> QuestionPredictor:
     global predictor
     
     if predictor is None:
-        if not GEMINI_API_KEY or GEMINI_API_KEY == "BURAYA_API_ANAHTARINIZI_GIRIN":
-            raise HTTPException(
-                status_code=500,
-                detail="API anahtarı yapılandırılmamış. .env dosyasında Gemini_API_Key değerini ayarlayın."
-            )
-        
-        if not DATA_FILE.exists():
-            raise HTTPException(
-                status_code=500,
-                detail=f"Veri dosyası bulunamadı: {DATA_FILE}"
-            )
-        
-        predictor = QuestionPredictor(
-            data_path=str(DATA_FILE),
-            api_key=GEMINI_API_KEY
-        )
+        try:
+            predictor = create_predictor()
+        except ValueError as e:
+            raise HTTPException(status_code=500, detail=str(e))
     
     return predictor
 
 
+def llm_http_error(error: LLMError) -> HTTPException:
+    """LLM hatasını uygun HTTP durum koduna çevirir (429, 503, 504, 502)."""
+    headers = None
+    if error.retry_after:
+        headers = {"Retry-After": str(math.ceil(error.retry_after))}
+    return HTTPException(status_code=error.status_code, detail=str(error), headers=headers)
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Server-Sent Events biçiminde tek bir olay üretir."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 # ==================== REQUEST/RESPONSE MODELLERİ ====================
 
 class QuestionGenerationRequest(BaseModel):
@@ -112,13 +107,106 @@ class QuestionGenerationRequest(BaseModel):
     count: int = Field(
         5,
         ge=1,
-        le=10,
-        description="Üretilecek soru sayısı (1-10)"
+        le=50,
+        description="Üretilecek soru sayısı (1-50; 5'ten fazlası parçalara bölünüp paralel üretilir)"
     )
     difficulty: str = Field(
         "orta",
         description="Zorluk seviyesi: kolay, orta, zor"
     )
+    seed: Optional[int] = Field(
+        None,
+        description="Örnek soru seçimi için seed (tekrarlanabilir istek)"
+    )
+    duplicates: str = Field(
+        "reject",
+        description="Yakın kopya sorular: reject (çıkar) veya flag (işaretle)"
+    )
+    chunk_size: Optional[int] = Field(
+        None,
+        ge=1,
+        le=10,
+        description="Tek Gemini çağrısında istenen en fazla soru (varsayılan: 5)"
+    )
+    concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        le=8,
+        description="Aynı anda çalışan en fazla parça (varsayılan: 4)"
+    )
+    fresh: bool = Field(
+        False,
+        description="True ise soru havuzu atlanır ve sorular canlı üretilir"
+    )
+
+
+class GenerationSpec(BaseModel):
+    """Toplu üretim isteğindeki tek satır"""
+    category: Optional[str] = Field(None, description="Ana kategori")
+    subcategory: Optional[str] = Field(None, description="Alt kategori")
+    count: int = Field(5, ge=1, le=50, description="Üretilecek soru sayısı")
+    difficulty: str = Field("orta", description="Zorluk seviyesi: kolay, orta, zor")
+    seed: Optional[int] = Field(None, description="Örnek soru seçimi için seed")
+
+
+class BatchGenerationRequest(BaseModel):
+    """Toplu soru üretme isteği modeli"""
+    items: List[GenerationSpec] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="Üretim istekleri (en fazla 20)"
+    )
+    concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        le=8,
+        description="Tüm istekler için aynı anda çalışan en fazla Gemini çağrısı (varsayılan: 4)"
+    )
+    duplicates: str = Field(
+        "reject",
+        description="Yakın kopya sorular: reject (çıkar) veya flag (işaretle)"
+    )
+    fresh: bool = Field(
+        False,
+        description="True ise soru havuzu atlanır ve sorular canlı üretilir"
+    )
+
+
+class ExamRequest(BaseModel):
+    """Deneme sınavı isteği modeli"""
+    total: int = Field(
+        20,
+        ge=1,
+        le=50,
+        description="Sınavdaki soru sayısı (LGS Türkçe: 20)"
+    )
+    source: str = Field(
+        "stats",
+        description="Kategori dağılımı kaynağı: stats (kategori × yıl istatistikleri) veya trends (2026 trend tahmini)"
+    )
+    distribution: Optional[Dict[str, float]] = Field(
+        None,
+        description="Kategori -> ağırlık veya soru sayısı (verilirse source yok sayılır)"
+    )
+    difficulty_mix: Optional[Dict[str, float]] = Field(
+        None,
+        description="Zorluk -> oran (varsayılan: kolay 0.3, orta 0.4, zor 0.3)"
+    )
+    concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        le=20,
+        description="Aynı anda çalışan en fazla Gemini çağrısı (varsayılan: tüm plan paralel)"
+    )
+    fresh: bool = Field(
+        False,
+        description="True ise soru havuzu atlanır ve sorular canlı üretilir"
+    )
+    use_cache: bool = Field(
+        True,
+        description="False ise trend tahmini cache'ten okunmaz"
+    )
 
 
 class QuestionAnalysisRequest(BaseModel):
@@ -128,6 +216,14 @@ class QuestionAnalysisRequest(BaseModel):
         min_length=10,
         description="Analiz edilecek soru metni"
     )
+    use_cache: bool = Field(
+        True,
+        description="False ise cache'teki analiz kullanılmaz"
+    )
+    narrative: bool = Field(
+        True,
+        description="False ise kazanımlar ve ipuçları üretilmez ve Gemini çağrılmaz (düşük güvenli sonuç işaretlenir)"
+    )
 
 
 class GeneratedQuestion(BaseModel):
@@ -234,11 +330,16 @@ async def generate_questions(request: QuestionGenerationRequest):
     """
     try:
         pred = get_predictor()
-        result = pred.predict_questions(
+        result = await pred.predict_questions_async(
             category=request.category,
             subcategory=request.subcategory,
             count=request.count,
-            difficulty=request.difficulty
+            difficulty=request.difficulty,
+            seed=request.seed,
+            duplicates=request.duplicates,
+            chunk_size=request.chunk_size,
+            concurrency=request.concurrency,
+            fresh=request.fresh
         )
         
         if "error" in result:
@@ -250,16 +351,139 @@ async def generate_questions(request: QuestionGenerationRequest):
         }
     except HTTPException as e:
         raise e
+    except LLMError as e:
+        raise llm_http_error(e)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@router.post("/generate/batch")
+async def generate_questions_batch(request: BatchGenerationRequest):
+    """
+    Birden fazla üretim isteğini tek çağrıda eşzamanlı yürütür.
+    
+    Sonuçlar istek sırasıyla döner; hatalı istekler `success: false`, `error` ve
+    `status_code` ile işaretlenir, diğer isteklerin sonuçlarını etkilemez.
+    """
+    try:
+        pred = get_predictor()
+        result = await pred.predict_batch(
+            [item.model_dump() for item in request.items],
+            concurrency=request.concurrency,
+            duplicates=request.duplicates,
+            fresh=request.fresh
+        )
+        
+        if "error" in result:
+            return {"success": False, "error": result["error"]}
+        
+        return {
+            "success": result["summary"]["succeeded"] > 0,
+            "data": result
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@router.post("/generate/stream")
+async def generate_questions_stream(request: QuestionGenerationRequest):
+    """
+    Yeni LGS Türkçe sorularını Server-Sent Events olarak akıtır.
+    
+    Her soru üretildiği anda `question` olayıyla gönderilir; yakın kopyalar
+    `duplicate`, akış sonu özeti `done`, akış sırasındaki hatalar `error` olayıyla gelir.
+    """
+    try:
+        pred = get_predictor()
+        events = pred.stream_questions(
+            category=request.category,
+            subcategory=request.subcategory,
+            count=request.count,
+            difficulty=request.difficulty,
+            seed=request.seed,
+            duplicates=request.duplicates,
+            chunk_size=request.chunk_size,
+            concurrency=request.concurrency
+        )
+        
+        # İlk olay beklenir: doğrulama ve ilk çağrı hataları normal HTTP yanıtı olarak döner
+        first = await events.__anext__()
+    except HTTPException as e:
+        raise e
+    except LLMError as e:
+        raise llm_http_error(e)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    
+    if first["event"] == "error":
+        error = first["data"]
+        if error["status_code"] == 400:
+            return {"success": False, "error": error["error"]}
+        headers = {"Retry-After": str(math.ceil(error["retry_after"]))} if error.get("retry_after") else None
+        raise HTTPException(status_code=error["status_code"], detail=error["error"], headers=headers)
+    
+    async def body() -> AsyncIterator[str]:
+        yield sse_event(first["event"], first["data"])
+        try:
+            async for event in events:
+                yield sse_event(event["event"], event["data"])
+        except Exception as e:
+            yield sse_event("error", {"error": str(e), "status_code": getattr(e, "status_code", 500)})
+        finally:
+            await events.aclose()
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/exam")
+async def build_exam(request: ExamRequest):
+    """
+    Tahmin edilen 2026 kategori dağılımına uygun deneme sınavı üretir.
+    
+    Tüm kategoriler paralel üretilir; sınav içi tekrarlar ayıklanır, zorluklar dengelenir.
+    Yanıtta numaralı sorular (`exam`) ve cevap anahtarı (`answer_key`) ayrı döner.
+    """
+    try:
+        pred = get_predictor()
+        result = await pred.build_exam(
+            total=request.total,
+            source=request.source,
+            distribution=request.distribution,
+            difficulty_mix=request.difficulty_mix,
+            concurrency=request.concurrency,
+            fresh=request.fresh,
+            use_cache=request.use_cache
+        )
+        
+        if "error" in result:
+            return {"success": False, "error": result["error"]}
+        
+        return {
+            "success": True,
+            "data": result
+        }
+    except HTTPException as e:
+        raise e
+    except LLMError as e:
+        raise llm_http_error(e)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 @router.get("/predict/trends")
-async def get_trend_predictions():
+async def get_trend_predictions(
+    refresh: bool = Query(False, description="True ise cache atlanır ve tahmin yenilenir")
+):
     """2026 LGS için trend tahminlerini döndürür."""
     try:
         pred = get_predictor()
-        predictions = pred.get_2026_predictions()
+        predictions = await pred.get_2026_predictions_async(use_cache=not refresh)
         
         return {
             "success": True,
@@ -267,6 +491,8 @@ async def get_trend_predictions():
         }
     except HTTPException as e:
         raise e
+    except LLMError as e:
+        raise llm_http_error(e)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -276,7 +502,11 @@ async def analyze_question(request: QuestionAnalysisRequest):
     """Verilen soruyu analiz eder."""
     try:
         pred = get_predictor()
-        analysis = pred.analyze_question(request.question_text)
+        analysis = await pred.analyze_question_async(
+            request.question_text,
+            use_cache=request.use_cache,
+            narrative=request.narrative
+        )
         
         if "error" in analysis:
             return {"success": False, "error": analysis["error"]}
@@ -287,6 +517,8 @@ async def analyze_question(request: QuestionAnalysisRequest):
         }
     except HTTPException as e:
         raise e
+    except LLMError as e:
+        raise llm_http_error(e)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -308,15 +540,70 @@ async def get_statistics():
         return {"success": False, "error": str(e)}
 
 
+@router.get("/keywords")
+async def get_top_keywords(
+    top_n: int = Query(30, ge=1, le=500, description="Döndürülecek kelime sayısı"),
+    category: Optional[str] = Query(None, description="Kategori filtresi"),
+    year: Optional[str] = Query(None, description="Yıl filtresi (2018, MEB vb.)")
+):
+    """En sık anahtar kelimeleri döndürür (kategori/yıl bazlı)."""
+    try:
+        pred = get_predictor()
+        keywords = pred.get_top_keywords(top_n, category=category, year=year)
+        
+        return {
+            "success": True,
+            "data": {
+                "category": category,
+                "year": year,
+                "keywords": keywords
+            }
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@router.get("/search")
+async def search_questions(
+    q: str = Query(..., min_length=2, description="Arama ifadesi (ör. 'ana düşünce')"),
+    category: Optional[str] = Query(None, description="Kategori filtresi"),
+    year: Optional[str] = Query(None, description="Yıl filtresi (2018, MEB vb.)"),
+    top_k: int = Query(10, ge=1, le=100, description="Sonuç sayısı")
+):
+    """Geçmiş LGS sorularında BM25 ile tam metin arama yapar."""
+    try:
+        pred = get_predictor()
+        results = pred.search_questions(q, top_k=top_k, category=category, year=year)
+        
+        return {
+            "success": True,
+            "data": {
+                "query": q,
+                "count": len(results),
+                "results": [
+                    {"score": r["score"], "question": r["question"].to_dict()}
+                    for r in results
+                ]
+            }
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 @router.get("/sample/{category}")
 async def get_sample_questions(
     category: str,
-    count: int = Query(5, ge=1, le=20, description="Örnek soru sayısı")
+    count: int = Query(5, ge=1, le=20, description="Örnek soru sayısı"),
+    seed: Optional[int] = Query(None, description="Tekrarlanabilir örnekleme için seed")
 ):
     """Belirli bir kategoriden örnek sorular döndürür."""
     try:
         pred = get_predictor()
-        samples = pred.get_sample_questions_by_category(category, count)
+        samples = pred.get_sample_questions_by_category(category, count, seed=seed)
         
         if not samples:
             return {
@@ -329,7 +616,7 @@ async def get_sample_questions(
             "data": {
                 "category": category,
                 "count": len(samples),
-                "questions": samples
+                "questions": to_dicts(samples)
             }
         }
     except HTTPException as e:
@@ -339,17 +626,32 @@ async def get_sample_questions(
 
 
 @router.get("/history")
-async def get_generation_history():
-    """Üretim geçmişini döndürür."""
+async def get_generation_history(
+    cursor: Optional[int] = Query(None, description="Önceki sayfanın next_cursor değeri"),
+    limit: int = Query(10, ge=1, le=100, description="Sayfadaki kayıt sayısı"),
+    category: Optional[str] = Query(None, description="Kategori filtresi"),
+    difficulty: Optional[str] = Query(None, description="Zorluk filtresi"),
+    since: Optional[str] = Query(None, description="Bu zamandan sonraki kayıtlar (ISO 8601)"),
+    until: Optional[str] = Query(None, description="Bu zamandan önceki kayıtlar (ISO 8601)")
+):
+    """Üretim geçmişini yeniden eskiye sayfalar; sonraki sayfa için next_cursor gönderilir."""
     try:
         pred = get_predictor()
-        history = pred.get_prediction_history()
+        page = pred.get_history_page(
+            cursor=cursor,
+            limit=limit,
+            category=category,
+            difficulty=difficulty,
+            since=since,
+            until=until
+        )
         
         return {
             "success": True,
             "data": {
-                "total_predictions": len(history),
-                "history": history[-10:]  # Son 10 kayıt
+                "total_predictions": page["total"],
+                "history": page["items"],
+                "next_cursor": page["next_cursor"]
             }
         }
     except HTTPException as e:
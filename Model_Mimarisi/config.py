@@ -11,16 +11,14 @@ from dotenv import load_dotenv
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data"
 MODEL_DIR = BASE_DIR / "models"
+# Yeniden üretilebilir önbellek dosyaları depo dışında tutulur
+CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "lgs-turkce"
 
-# .env dosyasını yükle
+# .env dosyasını yükle (proje dizinindeki değerler üst dizindekilere göre önceliklidir)
 ENV_FILE = BASE_DIR / ".env"
-if ENV_FILE.exists():
-    load_dotenv(ENV_FILE)
-else:
-    # Üst dizindeki .env dosyasını da kontrol et
-    PARENT_ENV = BASE_DIR.parent / ".env"
-    if PARENT_ENV.exists():
-        load_dotenv(PARENT_ENV)
+PARENT_ENV = BASE_DIR.parent / ".env"
+load_dotenv(ENV_FILE)
+load_dotenv(PARENT_ENV)
 
 # Dizinleri oluştur
 DATA_DIR.mkdir(exist_ok=True)
@@ -35,10 +33,63 @@ GEMINI_API_KEY = os.getenv("Gemini_API_Key", "BURAYA_API_ANAHTARINIZI_GIRIN")
 # ==================== MODEL AYARLARI ====================
 # Gemini model seçimi
 GEMINI_MODEL = "gemini-2.0-flash"  # veya "gemini-1.5-pro", "gemini-pro"
+# Öncelik sırasıyla modeller: birincil model gecikirse sıradaki modele hedged istek gider,
+# hata/zaman aşımında sıradaki (daha hızlı/ucuz) modele geçilir
+GEMINI_MODELS = [
+    m.strip() for m in os.getenv("Gemini_Models", f"{GEMINI_MODEL},gemini-1.5-flash").split(",") if m.strip()
+]
+# Hedge için başlangıç bekleme süresi (sn; ölçüm biriktikçe p95 gecikmeye uyarlanır)
+GEMINI_HEDGE_DELAY = float(os.getenv("Gemini_Hedge_Delay", "2"))
+# Tek model çağrısı zaman aşımı (sn); aşılınca yedek modele geçilir
+GEMINI_MODEL_TIMEOUT = float(os.getenv("Gemini_Model_Timeout", "20"))
 
 # ==================== VERİ DOSYALARI ====================
 # Ana eğitim verisi
 TRAINING_DATA_FILE = str(BASE_DIR / "data.json")
+# Korpus kaynağı: dosya, dizin veya glob deseni (ör. "../*_lgs*")
+# Farklı şemalardaki yıl dosyaları otomatik olarak birleştirilir
+CORPUS_SOURCE = os.getenv("LGS_Corpus_Source", TRAINING_DATA_FILE)
+# Derlenmiş korpus snapshot'ı (python main.py --build-snapshot ile üretilir)
+SNAPSHOT_FILE = os.getenv("LGS_Snapshot_File", str(DATA_DIR / "corpus.snapshot"))
+# Kalıcı BM25 arama indeksi: ilk aramada kurulur, korpus değişince otomatik yeniden kurulur
+SEARCH_INDEX_FILE = os.getenv("LGS_Search_Index_File", str(CACHE_DIR / "search_index.npz"))
+# LLM yanıt cache'i (trend tahmini ve soru analizi): memory, sqlite veya none
+LLM_CACHE_BACKEND = os.getenv("LLM_Cache_Backend", "memory")
+LLM_CACHE_FILE = os.getenv("LLM_Cache_File", str(CACHE_DIR / "llm_cache.sqlite"))
+LLM_CACHE_TTL = float(os.getenv("LLM_Cache_TTL", "3600"))
+# Tahmin geçmişi: bellekte son History_Size kayıt, tamamı SQLite dosyasında ("none": sadece bellek)
+# Çalışma zamanı verisi olduğundan depo dışında tutulur
+HISTORY_FILE = os.getenv("History_File", str(CACHE_DIR / "history.sqlite"))
+HISTORY_SIZE = int(os.getenv("History_Size", "200"))
+# Tekrar kontrolü ve dışa aktarma için bellekte tutulan en fazla üretilmiş soru
+GENERATED_QUESTIONS_SIZE = int(os.getenv("Generated_Questions_Size", "1000"))
+# Gemini kotası (istek/dk, token/dk), çağrı zaman aşımı (sn) ve deneme sayısı
+GEMINI_RPM = float(os.getenv("Gemini_RPM", "15"))
+GEMINI_TPM = float(os.getenv("Gemini_TPM", "1000000"))
+GEMINI_TIMEOUT = float(os.getenv("Gemini_Timeout", "60"))
+GEMINI_MAX_ATTEMPTS = int(os.getenv("Gemini_Max_Attempts", "3"))
+# Önceden üretilmiş soru havuzu (on/off), alt/üst eşik, doldurma partisi ve eşzamanlılığı.
+# Varsayılan kapalı: doldurma aynı Gemini kotasını (Gemini_RPM) kullanır, boş bir anahtar
+# High_Water/Batch_Size çağrı harcar (varsayılanlarla 3; 18 anahtar için 54 çağrı)
+QUESTION_POOL = os.getenv("Question_Pool", "off").lower() in ("1", "on", "true", "yes")
+QUESTION_POOL_LOW_WATER = int(os.getenv("Question_Pool_Low_Water", "5"))
+QUESTION_POOL_HIGH_WATER = int(os.getenv("Question_Pool_High_Water", "15"))
+QUESTION_POOL_BATCH_SIZE = int(os.getenv("Question_Pool_Batch_Size", "5"))
+QUESTION_POOL_CONCURRENCY = int(os.getenv("Question_Pool_Concurrency", "1"))
+# Açılışta doldurulacak (kategori, zorluk) anahtarları: "Paragrafta Anlam:orta,Cümlede Anlam:zor"
+QUESTION_POOL_KEYS = [
+    tuple(key.strip().rsplit(":", 1)) for key in os.getenv("Question_Pool_Keys", "").split(",") if ":" in key
+]
+# LLM sağlayıcısı: gemini veya local (ağ/kota gerektirmeyen yerel yedek; yük testi ve CI için)
+LLM_PROVIDER = os.getenv("LLM_Provider", "gemini").lower()
+# Yerel sağlayıcının ortalama gecikmesi (sn), simüle hata oranı (0-1) ve seed'i
+LOCAL_LLM_LATENCY = float(os.getenv("Local_LLM_Latency", "0.2"))
+LOCAL_LLM_ERROR_RATE = float(os.getenv("Local_LLM_Error_Rate", "0"))
+LOCAL_LLM_SEED = int(os.getenv("Local_LLM_Seed", "0"))
+
+# Soru analizinde yerel kategori tahmini bu güvenin altındaysa Gemini'ye sorulur (alt kategori sadece işaretlenir)
+ANALYSIS_CONFIDENCE = float(os.getenv("Analysis_Confidence_Threshold", "0.6"))
+
 # Üretilen sorular
 GENERATED_QUESTIONS_FILE = str(DATA_DIR / "uretilen_sorular.json")
 
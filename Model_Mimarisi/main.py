@@ -5,6 +5,7 @@ Hibrit Model: Veri Analizi + Gemini API
 Kullanım:
     API Sunucusu: python main.py --api
     CLI Modu: python main.py --cli
+    Snapshot: python main.py --build-snapshot [--source ../] [--snapshot data/corpus.snapshot]
 """
 
 import argparse
@@ -34,26 +35,33 @@ def run_api_server(host: str = "0.0.0.0", port: int = 8000):
     uvicorn.run(app, host=host, port=port, reload=False)
 
 
-def run_cli_mode():
-    """CLI modunda çalıştırır."""
-    import os
-    from dotenv import load_dotenv
-    from model.question_predictor import QuestionPredictor
+def build_snapshot(source: str = None, snapshot_path: str = None):
+    """JSON korpusundan mmap ile açılabilen snapshot dosyasını derler."""
+    import config
+    from model.data_analyzer import DataAnalyzer
     
-    # .env yükle
-    load_dotenv(BASE_DIR / ".env")
-    load_dotenv(BASE_DIR.parent / ".env")
+    source = source or config.CORPUS_SOURCE
+    snapshot_path = snapshot_path or config.SNAPSHOT_FILE
     
-    api_key = os.getenv("Gemini_API_Key", "")
-    data_file = BASE_DIR / "data.json"
-    
-    if not api_key or api_key == "BURAYA_API_ANAHTARINIZI_GIRIN":
-        print("❌ Hata: Gemini API anahtarı bulunamadı!")
-        print("   .env dosyasında Gemini_API_Key değerini ayarlayın.")
+    analyzer = DataAnalyzer()
+    if not analyzer.load_data(source):
+        print(f"❌ Hata: Korpus yüklenemedi: {source}")
         return
     
-    if not data_file.exists():
-        print(f"❌ Hata: Veri dosyası bulunamadı: {data_file}")
+    path = analyzer.save_snapshot(snapshot_path)
+    print(f"✅ Snapshot oluşturuldu: {path} ({analyzer.get_total_questions()} soru)")
+
+
+def run_cli_mode():
+    """CLI modunda çalıştırır."""
+    # Ayarlar (.env dahil) config.py'de okunur; API ile aynı fabrika kullanılır
+    from model.question_predictor import QuestionPredictor
+    from model.factory import check_settings, create_predictor
+    
+    try:
+        check_settings()
+    except ValueError as e:
+        print(f"❌ Hata: {e}")
         return
     
     print("""
@@ -70,10 +78,7 @@ def run_cli_mode():
 ╚══════════════════════════════════════════════════════════════╝
     """)
     
-    predictor = QuestionPredictor(
-        data_path=str(data_file),
-        api_key=api_key
-    )
+    predictor = create_predictor()
     
     while True:
         try:
@@ -93,7 +98,7 @@ def run_cli_mode():
                 if 0 <= cat_idx < len(QuestionPredictor.SUPPORTED_CATEGORIES):
                     category = QuestionPredictor.SUPPORTED_CATEGORIES[cat_idx]
                 
-                count = int(input("Soru sayısı (1-10): "))
+                count = int(input("Soru sayısı (1-50): "))
                 difficulty = input("Zorluk (kolay/orta/zor): ").strip().lower() or "orta"
                 
                 print("\n⏳ Sorular üretiliyor...")
@@ -179,7 +184,7 @@ def run_cli_mode():
                 question = input("\nAnaliz edilecek soruyu girin:\n> ")
                 print("\n⏳ Soru analiz ediliyor...")
                 
-                analysis = predictor.analyze_question(question)
+                analysis = predictor.analyze_question(question, narrative=True)
                 
                 if "error" not in analysis:
                     result = analysis.get("analysis", {})
@@ -219,6 +224,21 @@ def main():
         action="store_true", 
         help="CLI modunda çalıştır"
     )
+    parser.add_argument(
+        "--build-snapshot",
+        action="store_true",
+        help="JSON korpusundan derlenmiş snapshot dosyasını oluştur"
+    )
+    parser.add_argument(
+        "--source",
+        default=None,
+        help="Korpus kaynağı: dosya, dizin veya glob (varsayılan: config.CORPUS_SOURCE)"
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Snapshot dosya yolu (varsayılan: config.SNAPSHOT_FILE)"
+    )
     parser.add_argument(
         "--host",
         default="0.0.0.0",
@@ -233,7 +253,9 @@ def main():
     
     args = parser.parse_args()
     
-    if args.api:
+    if args.build_snapshot:
+        build_snapshot(args.source, args.snapshot)
+    elif args.api:
         run_api_server(args.host, args.port)
     elif args.cli:
         run_cli_mode()
@@ -242,6 +264,7 @@ def main():
         print("Kullanım: python main.py --api veya python main.py --cli")
         print("--api: REST API sunucusunu başlatır")
         print("--cli: Komut satırı arayüzünü başlatır")
+        print("--build-snapshot: Derlenmiş korpus snapshot'ını oluşturur")
 
 
 if __name__ == "__main__":
@@ -4,8 +4,57 @@ Hibrit model: Veri analizi + Gemini API entegrasyonu
 """
 
 from .data_analyzer import DataAnalyzer
+from .columnar_stats import ColumnarStats
+from .corpus_index import CorpusIndex
+from .corpus_loader import CorpusLoader
+from .corpus_snapshot import CorpusSnapshot
+from .pattern_matcher import PatternMatcher
+from .keyword_frequency import KeywordFrequency
+from .sampler import StratifiedSampler
+from .records import Question, QuestionView
+from .search_index import BM25Index
+from .example_retriever import ExampleRetriever
+from .question_classifier import QuestionClassifier
+from .dedup import NearDuplicateIndex
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
+from .resilience import ResilientCaller
+from .exceptions import LLMError
+from .llm_provider import LLMProvider, GeminiProvider
+from .local_provider import LocalStandInProvider
+from .model_router import ModelRouter
+from .question_pool import QuestionPool
+from .history_store import HistoryStore
+from .exam_builder import ExamBuilder
 from .gemini_client import GeminiClient
 from .question_predictor import QuestionPredictor
 
-__all__ = ['DataAnalyzer', 'GeminiClient', 'QuestionPredictor']
-
+__all__ = [
+    'DataAnalyzer',
+    'ColumnarStats',
+    'CorpusIndex',
+    'CorpusLoader',
+    'CorpusSnapshot',
+    'PatternMatcher',
+    'KeywordFrequency',
+    'StratifiedSampler',
+    'Question',
+    'QuestionView',
+    'BM25Index',
+    'ExampleRetriever',
+    'QuestionClassifier',
+    'NearDuplicateIndex',
+    'ResponseCache',
+    'SingleFlight',
+    'ResilientCaller',
+    'LLMError',
+    'LLMProvider',
+    'GeminiProvider',
+    'LocalStandInProvider',
+    'ModelRouter',
+    'QuestionPool',
+    'HistoryStore',
+    'ExamBuilder',
+    'GeminiClient',
+    'QuestionPredictor',
+]
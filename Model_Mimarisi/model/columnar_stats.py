@@ -0,0 +1,232 @@
+"""
+LGS Türkçe Soru Tahminleme - Sütunsal İstatistik Modülü
+Sözlük kodlu NumPy dizileri üzerinde vektörel dağılım hesapları
+"""
+
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from .corpus_index import extract_year
+
+
+class _Encoder:
+    """Değer <-> tamsayı kod sözlüğü (ilk görülme sırasıyla)."""
+
+    def __init__(self, values: List[str] = None):
+        self.values: List[str] = list(values or [])
+        self.codes: Dict[str, int] = {v: i for i, v in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ColumnarStats:
+    """
+    Kategori, alt başlık, yıl ve anahtar kelime sütunlarını yükleme anında
+    tamsayı dizilerine kodlar; tüm dağılımları bincount ile hesaplar.
+    """
+
+    FIELDS = ('category', 'subcategory', 'year')
+
+    def __init__(self):
+        self._encoders = {field: _Encoder() for field in self.FIELDS}
+        self._encoders['keyword'] = _Encoder()
+        self._codes = {field: np.empty(0, dtype=np.int32) for field in self.FIELDS}
+        # Her anahtar kelime geçişi için (satır, kelime kodu)
+        self._kw_rows = np.empty(0, dtype=np.int32)
+        self._kw_codes = np.empty(0, dtype=np.int32)
+
+    @property
+    def size(self) -> int:
+        """Kodlanmış satır sayısı."""
+        return len(self._codes['category'])
+
+    def build(self, data: Dict[str, List[Any]]):
+        """
+        Sütunları sıfırdan kodlar.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+        """
+        self.__init__()
+        self.append_rows(data, 0)
+
+    def append_rows(self, data: Dict[str, List[Any]], start: int = None):
+        """
+        Yeni satırları mevcut sözlüklerle kodlayıp dizilerin sonuna ekler.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+            start: İlk yeni satır (varsayılan: kodlanmış son satırdan sonrası)
+        """
+        if start is None:
+            start = self.size
+
+        ticket_ids = data.get('Ticket_ID', [])
+        end = len(ticket_ids)
+        if end <= start:
+            return
+
+        categories = data.get('Kategori', [])
+        subcategories = data.get('Alt Başlık', [])
+        new_values = {
+            'category': [categories[i] for i in range(start, end)],
+            'subcategory': [subcategories[i] for i in range(start, end)],
+            'year': [extract_year(ticket_ids[i]) for i in range(start, end)]
+        }
+
+        for field, values in new_values.items():
+            encoder = self._encoders[field]
+            new_codes = np.fromiter(
+                (encoder.encode(v) for v in values),
+                dtype=np.int32,
+                count=len(values)
+            )
+            self._codes[field] = np.concatenate([self._codes[field], new_codes])
+
+        kw_encoder = self._encoders['keyword']
+        keywords = data.get('Keywords', [])
+        kw_rows, kw_codes = [], []
+        for row in range(start, end):
+            kw_list = keywords[row] if row < len(keywords) else None
+            if isinstance(kw_list, list):
+                for kw in kw_list:
+                    kw_rows.append(row)
+                    kw_codes.append(kw_encoder.encode(kw))
+
+        self._kw_rows = np.concatenate([self._kw_rows, np.asarray(kw_rows, dtype=np.int32)])
+        self._kw_codes = np.concatenate([self._kw_codes, np.asarray(kw_codes, dtype=np.int32)])
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> 'ColumnarStats':
+        """
+        Snapshot'taki tamsayı kodlu sütunları kopyalamadan kullanır.
+
+        Args:
+            snapshot: CorpusSnapshot
+
+        Returns:
+            ColumnarStats
+        """
+        stats = cls()
+        sources = {'category': 'Kategori', 'subcategory': 'Alt Başlık', 'year': 'year'}
+
+        for field, section in sources.items():
+            stats._encoders[field] = _Encoder(snapshot.dictionaries[section])
+            stats._codes[field] = np.frombuffer(snapshot.section(section), dtype=np.uint32).view(np.int32)
+
+        stats._encoders['keyword'] = _Encoder(snapshot.dictionaries['Keywords'])
+        offsets = np.frombuffer(snapshot.section('Keywords.offsets'), dtype=np.uint64)
+        stats._kw_codes = np.frombuffer(snapshot.section('Keywords.codes'), dtype=np.uint32).view(np.int32)
+        stats._kw_rows = np.repeat(
+            np.arange(len(offsets) - 1, dtype=np.int32),
+            np.diff(offsets).astype(np.int64)
+        )
+        return stats
+
+    def codes(self, field: str) -> np.ndarray:
+        """
+        Bir alanın satır bazlı tamsayı kodları.
+
+        Args:
+            field: category, subcategory veya year
+
+        Returns:
+            np.ndarray: Satır -> kod
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Geçersiz alan: {field}")
+        return self._codes[field]
+
+    def _counts(self, field: str) -> Dict[str, int]:
+        """Tek bir alanın değer -> sayı dağılımı."""
+        encoder = self._encoders[field]
+        counts = np.bincount(self._codes[field], minlength=len(encoder))
+        return {
+            encoder.values[code]: int(counts[code])
+            for code in np.flatnonzero(counts)
+        }
+
+    def category_distribution(self) -> Dict[str, int]:
+        """Kategori -> soru sayısı."""
+        return self._counts('category')
+
+    def year_distribution(self) -> Dict[str, int]:
+        """Yıl -> soru sayısı."""
+        return self._counts('year')
+
+    def subcategory_distribution(self) -> Dict[str, Dict[str, int]]:
+        """Kategori -> {Alt kategori -> sayı}."""
+        return self.crosstab('category', 'subcategory')
+
+    def crosstab(self, row_field: str, col_field: str) -> Dict[str, Dict[str, int]]:
+        """
+        İki alan arasında çapraz tablo (ör. kategori × yıl).
+
+        Args:
+            row_field: Satır alanı (category, subcategory, year)
+            col_field: Sütun alanı (category, subcategory, year)
+
+        Returns:
+            Dict: Satır değeri -> {Sütun değeri -> sayı}
+        """
+        matrix, row_values, col_values = self.crosstab_matrix(row_field, col_field)
+        result: Dict[str, Dict[str, int]] = {}
+        for r, c in zip(*np.nonzero(matrix)):
+            result.setdefault(row_values[r], {})[col_values[c]] = int(matrix[r, c])
+        return result
+
+    def crosstab_matrix(self, row_field: str, col_field: str) -> Tuple[np.ndarray, List[str], List[str]]:
+        """
+        Çapraz tabloyu yoğun matris olarak döndürür.
+
+        Returns:
+            Tuple: (matris, satır etiketleri, sütun etiketleri)
+        """
+        for field in (row_field, col_field):
+            if field not in self.FIELDS:
+                raise ValueError(f"Geçersiz alan: {field}")
+
+        n_rows = len(self._encoders[row_field])
+        n_cols = len(self._encoders[col_field])
+        combined = self._codes[row_field].astype(np.int64) * n_cols + self._codes[col_field]
+        matrix = np.bincount(combined, minlength=n_rows * n_cols).reshape(n_rows, n_cols)
+        return matrix, self._encoders[row_field].values, self._encoders[col_field].values
+
+    def keyword_counts(self) -> Tuple[np.ndarray, List[str]]:
+        """
+        Tüm anahtar kelimelerin frekans dizisi.
+
+        Returns:
+            Tuple: (sayılar, kelime sözlüğü)
+        """
+        encoder = self._encoders['keyword']
+        return np.bincount(self._kw_codes, minlength=len(encoder)), encoder.values
+
+    def keyword_crosstab(self, field: str) -> Tuple[np.ndarray, List[str], List[str]]:
+        """
+        Alan × anahtar kelime frekans matrisi (ör. kategori bazlı kelime sayıları).
+
+        Args:
+            field: category, subcategory veya year
+
+        Returns:
+            Tuple: (matris, alan değerleri, kelime sözlüğü)
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Geçersiz alan: {field}")
+
+        n_values = len(self._encoders[field])
+        n_keywords = len(self._encoders['keyword'])
+        field_codes = self._codes[field][self._kw_rows].astype(np.int64)
+        combined = field_codes * n_keywords + self._kw_codes
+        matrix = np.bincount(combined, minlength=n_values * n_keywords).reshape(n_values, n_keywords)
+        return matrix, self._encoders[field].values, self._encoders['keyword'].values
@@ -0,0 +1,178 @@
+"""
+LGS Türkçe Soru Tahminleme - Korpus İndeks Modülü
+Kategori, alt başlık, yıl ve anahtar kelime için ters indeksler
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Any
+
+
+def extract_year(ticket_id: str) -> str:
+    """
+    Ticket ID'den yıl bilgisini çıkarır.
+
+    Args:
+        ticket_id: LGS-2018-C-001 veya MEB-C-001 formatında ID
+
+    Returns:
+        str: Yıl ('2018') veya 'MEB'
+    """
+    if ticket_id.startswith('LGS-'):
+        return ticket_id.split('-')[1]
+    return 'MEB'
+
+
+def _contains(sorted_rows: List[int], row: int) -> bool:
+    """Artan sıralı listede ikili arama ile üyelik kontrolü."""
+    pos = bisect_left(sorted_rows, row)
+    return pos < len(sorted_rows) and sorted_rows[pos] == row
+
+
+class CorpusIndex:
+    """
+    Soru satırları üzerinde ters indeks.
+    Her alan değeri, o değere sahip satır numaralarının (artan sırada) listesine eşlenir.
+    İndeks load_data sırasında bir kez kurulur, sorgular sonuç boyutunda çalışır.
+    """
+
+    # İndeks alanı -> veri sütunu
+    FIELD_COLUMNS = {
+        'category': 'Kategori',
+        'subcategory': 'Alt Başlık',
+        'year': 'Ticket_ID',
+        'keyword': 'Keywords'
+    }
+
+    def __init__(self):
+        self.size = 0
+        self._postings: Dict[str, Dict[str, List[int]]] = {
+            field: defaultdict(list) for field in self.FIELD_COLUMNS
+        }
+
+    def build(self, data: Dict[str, List[Any]]):
+        """
+        İndeksi sıfırdan kurar.
+
+        Args:
+            data: Sütun bazlı soru verisi
+        """
+        self.size = 0
+        for postings in self._postings.values():
+            postings.clear()
+        self.add_rows(data)
+
+    def load_postings(self, postings: Dict[str, Dict[str, Any]], size: int):
+        """
+        Önceden derlenmiş posting listelerini (ör. snapshot) yükler.
+        Listeler, yeni satır eklenene kadar kopyalanmadan kullanılır.
+
+        Args:
+            postings: Alan -> {değer -> satır numaraları}
+            size: Toplam satır sayısı
+        """
+        for field, values in postings.items():
+            self._postings[field].clear()
+            self._postings[field].update(values)
+        self.size = size
+
+    def _append(self, field: str, value: str, row: int):
+        """Posting listesine satır ekler; salt okunur listeyi gerekirse kopyalar."""
+        rows = self._postings[field][value]
+        if not isinstance(rows, list):
+            rows = self._postings[field][value] = list(rows)
+        rows.append(row)
+
+    def add_rows(self, data: Dict[str, List[Any]], start: int = None):
+        """
+        Verideki yeni satırları indekse ekler.
+
+        Args:
+            data: Sütun bazlı soru verisi
+            start: İlk eklenecek satır (varsayılan: indekslenmiş son satırdan sonrası)
+        """
+        if start is None:
+            start = self.size
+
+        ticket_ids = data.get('Ticket_ID', [])
+        categories = data.get('Kategori', [])
+        subcategories = data.get('Alt Başlık', [])
+        keywords = data.get('Keywords', [])
+
+        for i in range(start, len(ticket_ids)):
+            if i < len(categories):
+                self._append('category', categories[i], i)
+            if i < len(subcategories):
+                self._append('subcategory', subcategories[i], i)
+            self._append('year', extract_year(ticket_ids[i]), i)
+
+            kw_list = keywords[i] if i < len(keywords) else None
+            if isinstance(kw_list, list):
+                # Aynı satırda tekrar eden kelime tek kez indekslenir
+                for kw in dict.fromkeys(kw_list):
+                    self._append('keyword', kw, i)
+
+        self.size = max(self.size, len(ticket_ids))
+
+    def lookup(self, field: str, value: str) -> List[int]:
+        """
+        Tek bir alan değerine sahip satırları döndürür.
+
+        Args:
+            field: category, subcategory, year veya keyword
+            value: Aranan değer
+
+        Returns:
+            List: Artan sıradaki satır numaraları (salt okunur kabul edilmeli)
+        """
+        if field not in self._postings:
+            raise ValueError(f"Geçersiz indeks alanı: {field}")
+        return self._postings[field].get(value, [])
+
+    def query(
+        self,
+        category: str = None,
+        subcategory: str = None,
+        year: str = None,
+        keyword: str = None
+    ) -> List[int]:
+        """
+        Birleşik filtre ile satırları döndürür (ör. kategori + yıl).
+        En kısa posting listesi taranır, diğerlerinde ikili arama yapılır.
+
+        Returns:
+            List: Tüm filtreleri sağlayan satır numaraları
+        """
+        filters = {
+            'category': category,
+            'subcategory': subcategory,
+            'year': year,
+            'keyword': keyword
+        }
+        postings = [
+            self.lookup(field, value)
+            for field, value in filters.items()
+            if value is not None
+        ]
+
+        if not postings:
+            return list(range(self.size))
+
+        postings.sort(key=len)
+        if len(postings) == 1:
+            return list(postings[0])
+
+        others = postings[1:]
+        return [i for i in postings[0] if all(_contains(p, i) for p in others)]
+
+    def values(self, field: str) -> List[str]:
+        """Bir alandaki tüm farklı değerleri döndürür."""
+        if field not in self._postings:
+            raise ValueError(f"Geçersiz indeks alanı: {field}")
+        return list(self._postings[field].keys())
+
+    def lookup_all(self, field: str) -> Dict[str, List[int]]:
+        """Bir alanın tüm posting listelerini döndürür."""
+        if field not in self._postings:
+            raise ValueError(f"Geçersiz indeks alanı: {field}")
+        return self._postings[field]
@@ -0,0 +1,196 @@
+"""
+LGS Türkçe Soru Tahminleme - Korpus Yükleme Modülü
+Farklı şemalardaki yıl dosyalarını tek bir sütun setinde birleştirme
+"""
+
+import glob
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Union
+
+
+# Kanonik sütun seti (data.json şeması)
+CANONICAL_COLUMNS = [
+    'Ticket_ID',
+    'Kategori',
+    'Alt Başlık',
+    'Metinler',
+    'Soru Kökleri',
+    'Cevaplar',
+    'Keywords'
+]
+
+_TURKISH_FOLD = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosuCGIOSU')
+
+
+def _schema_key(column: str) -> str:
+    """Sütun adını şemadan bağımsız bir anahtara çevirir ('Alt_Baslik' == 'Alt Başlık')."""
+    return column.translate(_TURKISH_FOLD).lower().replace(' ', '_').replace('-', '_')
+
+
+# Şema anahtarı -> kanonik sütun
+COLUMN_ALIASES = {_schema_key(col): col for col in CANONICAL_COLUMNS}
+
+
+def _normalize_keywords(value: Any) -> List[str]:
+    """Keywords değerini listeye çevirir ('a, b' -> ['a', 'b'])."""
+    if isinstance(value, list):
+        return [str(kw).strip() for kw in value if str(kw).strip()]
+    if isinstance(value, str):
+        return [kw.strip() for kw in value.split(',') if kw.strip()]
+    return []
+
+
+class CorpusLoader:
+    """
+    Birden fazla kaynaktan (dosya, dizin veya glob) LGS sorularını yükler.
+    Her şema varyantını kanonik sütunlara eşler, Ticket ID'ye göre tekrarları atar
+    ve yeni dosyaları mevcut veriyi yeniden kurmadan sona ekler.
+    """
+
+    def __init__(self):
+        self.data: Dict[str, List[Any]] = {col: [] for col in CANONICAL_COLUMNS}
+        self.loaded_files: Dict[str, tuple] = {}
+        self._ticket_ids = set()
+
+    @property
+    def total(self) -> int:
+        """Yüklü satır sayısı."""
+        return len(self.data['Ticket_ID'])
+
+    def resolve_sources(self, source: Union[str, Path]) -> List[Path]:
+        """
+        Kaynağı dosya listesine çevirir.
+
+        Args:
+            source: Dosya yolu, dizin veya glob deseni ('../*_lgs*')
+
+        Returns:
+            List: Sıralı dosya yolları
+        """
+        path = Path(source)
+        if path.is_dir():
+            return sorted(
+                p for p in path.iterdir()
+                if p.is_file() and p.suffix in ('.json', '')
+            )
+        if path.is_file():
+            return [path]
+        return sorted(Path(p) for p in glob.glob(str(source)) if Path(p).is_file())
+
+    def load(self, source: Union[str, Path]) -> int:
+        """
+        Kaynaktaki tüm dosyaları yükler; daha önce yüklenmiş ve değişmemiş
+        dosyalar atlanır.
+
+        Args:
+            source: Dosya yolu, dizin veya glob deseni
+
+        Returns:
+            int: Eklenen yeni satır sayısı
+        """
+        files = self.resolve_sources(source)
+        if not files:
+            raise FileNotFoundError(f"Veri dosyası bulunamadı: {source}")
+
+        # Dizin/glob taramasında korpus olmayan dosyalar sessizce atlanır
+        strict = len(files) == 1 and Path(source).is_file()
+
+        added = 0
+        for file_path in files:
+            added += self.append_file(file_path, strict=strict)
+        return added
+
+    def append_file(self, file_path: Union[str, Path], strict: bool = True) -> int:
+        """
+        Tek bir dosyayı normalize edip mevcut verinin sonuna ekler.
+
+        Args:
+            file_path: JSON dosya yolu
+            strict: False ise korpus olmayan dosyalar hata yerine atlanır
+
+        Returns:
+            int: Eklenen yeni satır sayısı (tekrarlar hariç)
+        """
+        path = Path(file_path)
+        stat = path.stat()
+        signature = (stat.st_mtime, stat.st_size)
+        key = str(path.resolve())
+
+        if self.loaded_files.get(key) == signature:
+            return 0
+
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                raw = json.load(f)
+            columns = self.normalize_columns(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError, ValueError) as e:
+            if strict:
+                raise ValueError(f"Geçersiz korpus dosyası ({path.name}): {e}")
+            # Korpus olmayan dosya da imzalanır, değişmedikçe tekrar okunmaz
+            self.loaded_files[key] = signature
+            return 0
+
+        added = self.extend(columns)
+        self.loaded_files[key] = signature
+        return added
+
+    def extend(self, columns: Dict[str, List[Any]]) -> int:
+        """
+        Kanonik sütunlardaki satırları tekrarları atarak ekler.
+
+        Args:
+            columns: normalize_columns çıktısı veya kanonik şemada veri
+
+        Returns:
+            int: Eklenen yeni satır sayısı
+        """
+        added = 0
+        for i, ticket_id in enumerate(columns['Ticket_ID']):
+            if ticket_id in self._ticket_ids:
+                continue
+            self._ticket_ids.add(ticket_id)
+            for col in CANONICAL_COLUMNS:
+                self.data[col].append(columns[col][i])
+            added += 1
+        return added
+
+    @staticmethod
+    def normalize_columns(raw: Any) -> Dict[str, List[Any]]:
+        """
+        Ham JSON'u kanonik sütun setine çevirir.
+
+        Args:
+            raw: Sütun bazlı JSON nesnesi (herhangi bir şema varyantı)
+
+        Returns:
+            Dict: Kanonik sütun -> değer listesi
+        """
+        if not isinstance(raw, dict):
+            raise ValueError("Sütun bazlı JSON nesnesi bekleniyordu")
+
+        columns = {}
+        for column, values in raw.items():
+            canonical = COLUMN_ALIASES.get(_schema_key(column))
+            if canonical and isinstance(values, list):
+                columns[canonical] = values
+
+        if 'Ticket_ID' not in columns:
+            raise ValueError("Ticket ID sütunu bulunamadı")
+
+        ticket_ids = [str(tid).strip() for tid in columns['Ticket_ID']]
+        size = len(ticket_ids)
+        normalized = {'Ticket_ID': ticket_ids}
+
+        for col in CANONICAL_COLUMNS[1:]:
+            values = columns.get(col, [])
+            if len(values) != size:
+                print(f"Uyarı: '{col}' sütunu {len(values)} satır, beklenen {size}")
+            values = list(values[:size]) + [None] * (size - len(values))
+
+            if col == 'Keywords':
+                normalized[col] = [_normalize_keywords(v) for v in values]
+            else:
+                normalized[col] = ['' if v is None else v for v in values]
+
+        return normalized
@@ -0,0 +1,342 @@
+"""
+LGS Türkçe Soru Tahminleme - Derlenmiş Korpus Snapshot Modülü
+JSON korpusunu mmap ile açılabilen ikili formata derleme
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, List, Any, Union
+
+from .corpus_index import CorpusIndex, extract_year
+from .corpus_loader import CorpusLoader
+
+
+MAGIC = b'LGSSNAP1'
+FORMAT_VERSION = 1
+
+# Tamsayı kodlu kategorik sütunlar
+CODED_COLUMNS = ['Kategori', 'Alt Başlık']
+# Offset indeksli metin sütunları
+TEXT_COLUMNS = ['Ticket_ID', 'Metinler', 'Soru Kökleri', 'Cevaplar']
+
+_ALIGN = 8
+
+
+class _TextColumn(Sequence):
+    """Offset tablosu + UTF-8 blob üzerinden tembel metin sütunu."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
+class _CodedColumn(Sequence):
+    """Sözlük kodlu kategorik sütun."""
+
+    def __init__(self, codes: memoryview, dictionary: List[str]):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.dictionary[c] for c in self.codes[index]]
+        return self.dictionary[self.codes[index]]
+
+
+class _KeywordColumn(Sequence):
+    """Satır başına kelime kodu listesi (offset + kod dizisi)."""
+
+    def __init__(self, offsets: memoryview, codes: memoryview, dictionary: List[str]):
+        self.offsets = offsets
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return [self.dictionary[c] for c in self.codes[start:end]]
+
+
+def _encode(values: List[str]) -> tuple:
+    """Değerleri ilk görülme sırasına göre tamsayı kodlarına çevirir."""
+    dictionary = {}
+    codes = array('I', (dictionary.setdefault(v, len(dictionary)) for v in values))
+    return codes, list(dictionary)
+
+
+def _text_sections(values: List[str]) -> tuple:
+    """Metin listesini (offset dizisi, blob) çiftine çevirir."""
+    offsets = array('Q', [0])
+    chunks = []
+    total = 0
+    for value in values:
+        encoded = (value or '').encode('utf-8')
+        chunks.append(encoded)
+        total += len(encoded)
+        offsets.append(total)
+    return offsets, b''.join(chunks)
+
+
+def _posting_sections(postings: Dict[str, List[int]], dictionary: List[str]) -> tuple:
+    """Posting listelerini sözlük sırasında (offset dizisi, satır dizisi) çiftine çevirir."""
+    offsets = array('Q', [0])
+    rows = array('I')
+    for value in dictionary:
+        rows.extend(postings.get(value, []))
+        offsets.append(len(rows))
+    return offsets, rows
+
+
+def build_snapshot(
+    data: Dict[str, List[Any]],
+    path: Union[str, Path],
+    aggregates: Dict[str, Any] = None,
+    sources: Dict[str, tuple] = None,
+    source: str = None
+) -> str:
+    """
+    Sütun bazlı korpusu ikili snapshot dosyasına derler.
+
+    Args:
+        data: Kanonik sütunlardaki soru verisi
+        path: Snapshot dosya yolu
+        aggregates: Önceden hesaplanmış analiz sonuçları (JSON uyumlu)
+        sources: Kaynak dosya -> (mtime, size) imzaları (bayatlık kontrolü için)
+        source: Korpus kaynağı (dosya, dizin veya glob); yeni dosya eklenmesini fark etmek için
+
+    Returns:
+        str: Yazılan dosya yolu
+    """
+    rows = len(data.get('Ticket_ID', []))
+    sections: Dict[str, bytes] = {}
+    typecodes: Dict[str, str] = {}
+    dictionaries: Dict[str, List[str]] = {}
+
+    def add(name: str, payload):
+        if isinstance(payload, array):
+            typecodes[name] = payload.typecode
+            payload = payload.tobytes()
+        else:
+            typecodes[name] = 'B'
+        sections[name] = payload
+
+    for col in CODED_COLUMNS:
+        codes, dictionaries[col] = _encode(data.get(col, []))
+        add(col, codes)
+
+    years = [extract_year(tid) for tid in data.get('Ticket_ID', [])]
+    codes, dictionaries['year'] = _encode(years)
+    add('year', codes)
+
+    keyword_dict = {}
+    kw_offsets = array('Q', [0])
+    kw_codes = array('I')
+    for kw_list in data.get('Keywords', []):
+        for kw in (kw_list if isinstance(kw_list, list) else []):
+            kw_codes.append(keyword_dict.setdefault(kw, len(keyword_dict)))
+        kw_offsets.append(len(kw_codes))
+    dictionaries['Keywords'] = list(keyword_dict)
+    add('Keywords.offsets', kw_offsets)
+    add('Keywords.codes', kw_codes)
+
+    for col in TEXT_COLUMNS:
+        offsets, blob = _text_sections(data.get(col, []))
+        add(f'{col}.offsets', offsets)
+        add(f'{col}.blob', blob)
+
+    # Ters indeks posting listeleri de snapshot'a yazılır
+    index = CorpusIndex()
+    index.build(data)
+    posting_dicts = {
+        'category': dictionaries['Kategori'],
+        'subcategory': dictionaries['Alt Başlık'],
+        'year': dictionaries['year'],
+        'keyword': dictionaries['Keywords']
+    }
+    for field, dictionary in posting_dicts.items():
+        offsets, posting_rows = _posting_sections(index.lookup_all(field), dictionary)
+        add(f'postings.{field}.offsets', offsets)
+        add(f'postings.{field}.rows', posting_rows)
+
+    # Bölüm yerleşimi (veri başlangıcına göre, 8 bayt hizalı)
+    layout = {}
+    position = 0
+    for name, payload in sections.items():
+        position += -position % _ALIGN
+        layout[name] = [position, len(payload), typecodes[name]]
+        position += len(payload)
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'rows': rows,
+        'source': str(Path(source).absolute()) if source else None,
+        'sources': sources or {},
+        'dictionaries': dictionaries,
+        'sections': layout,
+        'aggregates': aggregates or {}
+    }, ensure_ascii=False).encode('utf-8')
+
+    preamble = len(MAGIC) + 8 + len(header)
+    data_start = preamble + (-preamble % _ALIGN)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_start - preamble))
+        for name, payload in sections.items():
+            f.seek(data_start + layout[name][0])
+            f.write(payload)
+
+    tmp_path.replace(path)
+    return str(path)
+
+
+class CorpusSnapshot:
+    """
+    mmap ile açılan derlenmiş korpus.
+    Sütunlar dosyadan tembel okunur; sayfa önbelleği süreçler arasında paylaşılır.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Snapshot dosya yolu
+        """
+        self.path = str(path)
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        if self._view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Geçersiz snapshot dosyası: {path}")
+
+        header_len = struct.unpack_from('<Q', self._mmap, len(MAGIC))[0]
+        header_start = len(MAGIC) + 8
+        header = json.loads(str(self._view[header_start:header_start + header_len], 'utf-8'))
+
+        if header.get('version') != FORMAT_VERSION or header.get('byteorder') != sys.byteorder:
+            self.close()
+            raise ValueError(f"Uyumsuz snapshot sürümü: {path}")
+
+        preamble = header_start + header_len
+        self._data_start = preamble + (-preamble % _ALIGN)
+        self.header = header
+        self.rows: int = header['rows']
+        self.dictionaries: Dict[str, List[str]] = header['dictionaries']
+        self.aggregates: Dict[str, Any] = header['aggregates']
+        self.sources: Dict[str, list] = header['sources']
+
+    def section(self, name: str) -> memoryview:
+        """Bir bölümü tipine göre cast edilmiş memoryview olarak döndürür."""
+        offset, length, typecode = self.header['sections'][name]
+        start = self._data_start + offset
+        view = self._view[start:start + length]
+        return view if typecode == 'B' else view.cast(typecode)
+
+    def columns(self) -> Dict[str, Sequence]:
+        """
+        Kanonik sütunları tembel dizi nesneleri olarak döndürür.
+
+        Returns:
+            Dict: Sütun adı -> Sequence
+        """
+        columns = {
+            col: _TextColumn(self.section(f'{col}.offsets'), self.section(f'{col}.blob'))
+            for col in TEXT_COLUMNS
+        }
+        for col in CODED_COLUMNS:
+            columns[col] = _CodedColumn(self.section(col), self.dictionaries[col])
+        columns['Keywords'] = _KeywordColumn(
+            self.section('Keywords.offsets'),
+            self.section('Keywords.codes'),
+            self.dictionaries['Keywords']
+        )
+        return columns
+
+    def postings(self) -> Dict[str, Dict[str, Sequence]]:
+        """
+        Ters indeks posting listelerini döndürür.
+
+        Returns:
+            Dict: Alan -> {değer -> satır numaraları}
+        """
+        dictionaries = {
+            'category': self.dictionaries['Kategori'],
+            'subcategory': self.dictionaries['Alt Başlık'],
+            'year': self.dictionaries['year'],
+            'keyword': self.dictionaries['Keywords']
+        }
+        result = {}
+        for field, dictionary in dictionaries.items():
+            offsets = self.section(f'postings.{field}.offsets')
+            rows = self.section(f'postings.{field}.rows')
+            result[field] = {
+                value: rows[offsets[code]:offsets[code + 1]]
+                for code, value in enumerate(dictionary)
+            }
+        return result
+
+    def is_stale(self) -> bool:
+        """
+        Kaynak JSON dosyalarından biri snapshot'tan sonra değiştiyse veya
+        kaynağa yeni dosya eklendiyse True döndürür.
+        """
+        spec = self.header.get('source')
+        if spec:
+            current = {str(p.resolve()) for p in CorpusLoader().resolve_sources(spec)}
+            if current != set(self.sources):
+                return True
+
+        for source, signature in self.sources.items():
+            path = Path(source)
+            if not path.exists():
+                return True
+            stat = path.stat()
+            if [stat.st_mtime, stat.st_size] != list(signature):
+                return True
+        return False
+
+    def close(self):
+        """mmap ve dosyayı kapatır."""
+        try:
+            self._view.release()
+            self._mmap.close()
+        except (BufferError, ValueError):
+            # Dışarıda hâlâ açık view'lar varsa mmap süreç sonunda kapanır
+            pass
+        self._file.close()
@@ -3,12 +3,24 @@ LGS Türkçe Soru Tahminleme - Veri Analiz Modülü
 Geçmiş LGS sorularından pattern çıkarma ve istatistiksel analiz
 """
 
-import json
+from collections import Counter
 from pathlib import Path
-from collections import Counter, defaultdict
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+import hashlib
 import re
 
+from .columnar_stats import ColumnarStats
+from .corpus_index import CorpusIndex
+from .corpus_loader import CorpusLoader
+from .corpus_snapshot import CorpusSnapshot, build_snapshot
+from .example_retriever import ExampleRetriever
+from .keyword_frequency import KeywordFrequency
+from .pattern_matcher import PatternMatcher, PatternMatchResult
+from .question_classifier import QuestionClassifier
+from .records import QuestionView
+from .search_index import BM25Index
+from .sampler import StratifiedSampler
+
 
 class DataAnalyzer:
     """
@@ -16,43 +28,263 @@ class DataAnalyzer:
     Pattern çıkarma, kategori dağılımı, keyword analizi yapar.
     """
     
-    def __init__(self, data_path: str = None):
+    # Snapshot'a önceden hesaplanıp yazılan analiz sonuçları
+    SNAPSHOT_AGGREGATES = [
+        'corpus_version', 'category_dist', 'subcategory_dist', 'year_dist',
+        'pattern_analysis', 'pattern_fingerprint'
+    ]
+    
+    def __init__(
+        self,
+        data_path: str = None,
+        snapshot_path: str = None,
+        patterns: Dict[str, List] = None,
+        search_index_path: str = None
+    ):
         """
         Args:
-            data_path: JSON veri dosyasının yolu
+            data_path: JSON veri dosyası, dizin veya glob deseni
+            snapshot_path: Derlenmiş snapshot dosyası (güncelse JSON yerine kullanılır)
+            patterns: Soru kalıbı tanımları (varsayılan: DEFAULT_QUESTION_PATTERNS)
+            search_index_path: BM25 arama indeksinin kalıcı dosyası (opsiyonel)
         """
         self.data_path = data_path
         self.data = None
+        self.loader = None
+        self.snapshot = None
         self.analysis_cache = {}
+        self.index = CorpusIndex()
+        self.stats = ColumnarStats()
+        self.keyword_frequency = None
+        self.sampler = StratifiedSampler()
+        self.pattern_matcher = PatternMatcher(patterns)
+        self.search_index_path = search_index_path
+        self.search_index = None
+        self.example_retriever = None
+        self.question_classifier = None
+        
+        if snapshot_path and Path(snapshot_path).exists() and self.load_snapshot(snapshot_path):
+            return
         
         if data_path:
             self.load_data(data_path)
     
     def load_data(self, data_path: str) -> bool:
         """
-        JSON veri dosyasını yükler.
+        Veri dosyasını/dosyalarını yükler.
+        Tek dosya, dizin veya glob deseni kabul eder; farklı şemalar
+        (Alt_Baslik, Soru_Kokleri, Ticket_Id) kanonik sütunlara çevrilir.
         
         Args:
-            data_path: JSON dosyası yolu
+            data_path: JSON dosyası, dizin veya glob deseni
             
         Returns:
             bool: Başarılı ise True
         """
         try:
-            path = Path(data_path)
-            if not path.exists():
-                raise FileNotFoundError(f"Veri dosyası bulunamadı: {data_path}")
-            
-            with open(path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            loader = CorpusLoader()
+            loader.load(data_path)
             
+            self.loader = loader
+            self.snapshot = None
+            self.data = loader.data
             self.data_path = data_path
             self.analysis_cache = {}  # Cache'i temizle
+            self.index.build(self.data)
+            self.stats.build(self.data)
+            self._reset_derived()
             return True
         except Exception as e:
             print(f"Veri yükleme hatası: {e}")
             return False
     
+    def append_data(self, data_path: str) -> int:
+        """
+        Yeni yıl dosyalarını mevcut verinin sonuna ekler.
+        Önceden yüklenmiş satırlar yeniden işlenmez, sadece yeni satırlar indekslenir.
+        
+        Args:
+            data_path: JSON dosyası, dizin veya glob deseni
+            
+        Returns:
+            int: Eklenen yeni soru sayısı
+        """
+        if self.loader is None:
+            if not self.data:
+                return self.get_total_questions() if self.load_data(data_path) else 0
+            # Snapshot'tan açılmış veri: eklemeden önce listelere kopyalanır
+            self.loader = CorpusLoader()
+            self.loader.extend({col: list(values) for col, values in self.data.items()})
+            self.data = self.loader.data
+            self.snapshot = None
+        
+        try:
+            start = self.get_total_questions()
+            added = self.loader.load(data_path)
+        except Exception as e:
+            print(f"Veri ekleme hatası: {e}")
+            return 0
+        
+        if added:
+            self.index.add_rows(self.data, start)
+            self.stats.append_rows(self.data, start)
+            self.analysis_cache = {}
+            self._extend_derived(start)
+        return added
+    
+    def _reset_derived(self):
+        """Tembel kurulan yapıları (frekans tablosu, arama indeksi, örnek seçici, sınıflandırıcı) sıfırlar."""
+        self.keyword_frequency = None
+        self.search_index = None
+        self.example_retriever = None
+        self.question_classifier = None
+    
+    def _extend_derived(self, start: int):
+        """Kurulmuş tembel yapılara yeni satırları artımlı olarak ekler."""
+        if self.keyword_frequency is not None:
+            self.keyword_frequency.add_rows(self.data, start)
+        if self.search_index is not None:
+            self.search_index.add_rows(self.data, start)
+            self.search_index.fingerprint = self.corpus_version
+            if self.search_index_path:
+                self.search_index.save(self.search_index_path)
+        # IDF ağırlıkları tüm korpusa bağlı; örnek seçici ve sınıflandırıcı ilk kullanımda yeniden kurulur
+        self.example_retriever = None
+        self.question_classifier = None
+    
+    def load_snapshot(self, snapshot_path: str, allow_stale: bool = False) -> bool:
+        """
+        Derlenmiş snapshot dosyasını mmap ile açar.
+        Sütunlar, indeks ve önceden hesaplanmış dağılımlar JSON ayrıştırılmadan hazır olur.
+        
+        Args:
+            snapshot_path: Snapshot dosya yolu
+            allow_stale: False ise kaynak JSON değişmişse snapshot kullanılmaz
+            
+        Returns:
+            bool: Başarılı ise True
+        """
+        try:
+            snapshot = CorpusSnapshot(snapshot_path)
+        except Exception as e:
+            print(f"Snapshot yükleme hatası: {e}")
+            return False
+        
+        if not allow_stale and snapshot.is_stale():
+            print(f"Snapshot güncel değil, JSON'dan yükleniyor: {snapshot_path}")
+            snapshot.close()
+            return False
+        
+        self.snapshot = snapshot
+        self.loader = None
+        self.data = snapshot.columns()
+        self.data_path = snapshot.header.get('source') or self.data_path
+        self.index.load_postings(snapshot.postings(), snapshot.rows)
+        self.stats = ColumnarStats.from_snapshot(snapshot)
+        self.analysis_cache = dict(snapshot.aggregates)
+        self._reset_derived()
+        
+        # Kalıp analizi farklı bir kalıp setiyle hesaplandıysa ilk kullanımda yeniden hesaplanır
+        if self.analysis_cache.get('pattern_fingerprint') != self.pattern_matcher.fingerprint:
+            self.analysis_cache.pop('pattern_analysis', None)
+            self.analysis_cache.pop('pattern_fingerprint', None)
+        
+        # JSON'da tuple'lar listeye dönüşür
+        pattern_analysis = self.analysis_cache.get('pattern_analysis')
+        if pattern_analysis:
+            pattern_analysis['top_keywords'] = [tuple(kw) for kw in pattern_analysis['top_keywords']]
+        return True
+    
+    def save_snapshot(self, snapshot_path: str) -> str:
+        """
+        Yüklü korpusu ve önceden hesaplanmış dağılımları snapshot dosyasına derler.
+        
+        Args:
+            snapshot_path: Snapshot dosya yolu
+            
+        Returns:
+            str: Yazılan dosya yolu
+        """
+        # Toplu analizleri cache'e hesaplat
+        self.corpus_version
+        self.get_pattern_analysis()
+        self.get_subcategory_distribution()
+        
+        aggregates = {
+            key: self.analysis_cache[key]
+            for key in self.SNAPSHOT_AGGREGATES
+            if key in self.analysis_cache
+        }
+        
+        return build_snapshot(
+            self.data,
+            snapshot_path,
+            aggregates=aggregates,
+            sources=self.loader.loaded_files if self.loader else None,
+            source=self.data_path if self.loader else None
+        )
+    
+    @property
+    def corpus_version(self) -> str:
+        """
+        Yüklü korpusun sürüm özeti (Ticket ID'lerin SHA-1 özeti).
+        Veri yüklenince veya eklenince değişir; kalıcı indeks ve cache'lerin geçerliliği için kullanılır.
+        """
+        if 'corpus_version' not in self.analysis_cache:
+            digest = hashlib.sha1()
+            for ticket_id in (self.data or {}).get('Ticket_ID', []):
+                digest.update(ticket_id.encode('utf-8'))
+                digest.update(b'\0')
+            self.analysis_cache['corpus_version'] = digest.hexdigest()[:16]
+        return self.analysis_cache['corpus_version']
+    
+    def _ensure_search_index(self) -> Optional[BM25Index]:
+        """BM25 indeksini kalıcı dosyadan açar veya kurar (ilk kullanımda)."""
+        if self.search_index is not None or not self.data:
+            return self.search_index
+        
+        version = self.corpus_version
+        if self.search_index_path and Path(self.search_index_path).exists():
+            self.search_index = BM25Index.load(self.search_index_path, fingerprint=version)
+        
+        if self.search_index is None:
+            self.search_index = BM25Index()
+            self.search_index.build(self.data, fingerprint=version)
+            if self.search_index_path:
+                self.search_index.save(self.search_index_path)
+        
+        return self.search_index
+    
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        category: str = None,
+        year: str = None
+    ) -> List[Tuple[QuestionView, float]]:
+        """
+        Metin, soru kökü, cevap ve anahtar kelimelerde BM25 ile arama yapar.
+        
+        Args:
+            query: Arama ifadesi (ör. "ana düşünce")
+            top_k: Döndürülecek sonuç sayısı
+            category: Opsiyonel kategori filtresi
+            year: Opsiyonel yıl filtresi
+            
+        Returns:
+            List: (soru görünümü, skor) çiftleri
+        """
+        index = self._ensure_search_index()
+        if index is None:
+            return []
+        
+        rows = None
+        if category is not None or year is not None:
+            rows = self.get_row_ids(category=category, year=year)
+        
+        results = index.search(query, top_k=top_k, rows=rows, texts=self.data)
+        return [(QuestionView(self.data, row), score) for row, score in results]
+    
     def get_total_questions(self) -> int:
         """Toplam soru sayısını döndürür."""
         if not self.data:
@@ -72,8 +304,7 @@ class DataAnalyzer:
         if not self.data:
             return {}
         
-        categories = self.data.get('Kategori', [])
-        distribution = dict(Counter(categories))
+        distribution = self.stats.category_distribution()
         
         self.analysis_cache['category_dist'] = distribution
         return distribution
@@ -91,16 +322,7 @@ class DataAnalyzer:
         if not self.data:
             return {}
         
-        categories = self.data.get('Kategori', [])
-        subcategories = self.data.get('Alt Başlık', [])
-        
-        distribution = defaultdict(lambda: defaultdict(int))
-        
-        for cat, subcat in zip(categories, subcategories):
-            distribution[cat][subcat] += 1
-        
-        # defaultdict'i normal dict'e çevir
-        result = {k: dict(v) for k, v in distribution.items()}
+        result = self.stats.subcategory_distribution()
         
         self.analysis_cache['subcategory_dist'] = result
         return result
@@ -118,28 +340,25 @@ class DataAnalyzer:
         if not self.data:
             return {}
         
-        ticket_ids = self.data.get('Ticket_ID', [])
-        years = []
-        
-        for tid in ticket_ids:
-            # LGS-2018-C-001 veya MEB-C-001 formatı
-            if tid.startswith('LGS-'):
-                year = tid.split('-')[1]
-                years.append(year)
-            else:
-                years.append('MEB')
-        
-        distribution = dict(Counter(years))
+        distribution = self.stats.year_distribution()
         
         self.analysis_cache['year_dist'] = distribution
         return distribution
     
-    def get_keyword_frequency(self, top_n: int = 50) -> List[tuple]:
+    def get_keyword_frequency(
+        self,
+        top_n: int = 50,
+        category: str = None,
+        year: str = None
+    ) -> List[tuple]:
         """
         En sık kullanılan anahtar kelimeleri döndürür.
+        Frekans tablosu bir kez kurulur ve veri eklendikçe artımlı güncellenir.
         
         Args:
             top_n: En sık kaç kelime döndürüleceği
+            category: Opsiyonel kategori filtresi
+            year: Opsiyonel yıl filtresi
             
         Returns:
             List: (kelime, frekans) tuple listesi
@@ -147,41 +366,55 @@ class DataAnalyzer:
         if not self.data:
             return []
         
-        keywords = self.data.get('Keywords', [])
-        all_keywords = []
+        if category is not None and year is not None:
+            # Birleşik filtre: sadece eşleşen satırlar sayılır
+            keywords = self.data.get('Keywords', [])
+            counter = Counter()
+            for row in self.get_row_ids(category=category, year=year):
+                counter.update(keywords[row])
+            return KeywordFrequency.top_of(counter, top_n)
         
-        for kw_list in keywords:
-            if isinstance(kw_list, list):
-                all_keywords.extend(kw_list)
+        if self.keyword_frequency is None:
+            self.keyword_frequency = KeywordFrequency.from_stats(self.stats)
         
-        frequency = Counter(all_keywords)
-        return frequency.most_common(top_n)
+        return self.keyword_frequency.top(top_n, category=category, year=year)
     
-    def get_questions_by_category(self, category: str) -> List[Dict]:
+    def get_crosstab(self, row_field: str = 'category', col_field: str = 'year') -> Dict[str, Dict[str, int]]:
         """
-        Belirli bir kategorideki soruları döndürür.
+        İki alan arasında çapraz dağılım hesaplar (ör. kategori × yıl).
         
         Args:
-            category: Kategori adı
+            row_field: Satır alanı (category, subcategory, year)
+            col_field: Sütun alanı (category, subcategory, year)
             
         Returns:
-            List: Soru dictlerinin listesi
+            Dict: Satır değeri -> {Sütun değeri -> Sayı}
         """
+        cache_key = f'crosstab:{row_field}:{col_field}'
+        if cache_key in self.analysis_cache:
+            return self.analysis_cache[cache_key]
+        
         if not self.data:
-            return []
+            return {}
         
-        questions = []
-        categories = self.data.get('Kategori', [])
+        result = self.stats.crosstab(row_field, col_field)
         
-        for i, cat in enumerate(categories):
-            if cat == category:
-                question = self._get_question_by_index(i)
-                if question:
-                    questions.append(question)
+        self.analysis_cache[cache_key] = result
+        return result
+    
+    def get_questions_by_category(self, category: str) -> List[QuestionView]:
+        """
+        Belirli bir kategorideki soruları döndürür.
         
-        return questions
+        Args:
+            category: Kategori adı
+            
+        Returns:
+            List: Tembel soru görünümleri
+        """
+        return self.get_questions(category=category)
     
-    def get_questions_by_subcategory(self, subcategory: str) -> List[Dict]:
+    def get_questions_by_subcategory(self, subcategory: str) -> List[QuestionView]:
         """
         Belirli bir alt kategorideki soruları döndürür.
         
@@ -189,21 +422,69 @@ class DataAnalyzer:
             subcategory: Alt kategori adı
             
         Returns:
-            List: Soru dictlerinin listesi
+            List: Tembel soru görünümleri
+        """
+        return self.get_questions(subcategory=subcategory)
+    
+    def get_row_ids(
+        self,
+        category: str = None,
+        subcategory: str = None,
+        year: str = None,
+        keyword: str = None
+    ) -> List[int]:
+        """
+        Filtrelere uyan satır numaralarını indeks üzerinden döndürür.
+        
+        Args:
+            category: Kategori filtresi
+            subcategory: Alt kategori filtresi
+            year: Yıl filtresi ('2018', 'MEB' vb.)
+            keyword: Anahtar kelime filtresi
+            
+        Returns:
+            List: Satır numaraları
         """
         if not self.data:
             return []
         
-        questions = []
-        subcategories = self.data.get('Alt Başlık', [])
+        return self.index.query(
+            category=category,
+            subcategory=subcategory,
+            year=year,
+            keyword=keyword
+        )
+    
+    def get_questions(
+        self,
+        category: str = None,
+        subcategory: str = None,
+        year: str = None,
+        keyword: str = None
+    ) -> List[QuestionView]:
+        """
+        Birleşik filtrelere (ör. kategori + yıl) uyan soruları döndürür.
+        Sorular tembel görünüm olarak döner; dict'e çevirme API sınırında yapılır.
         
-        for i, subcat in enumerate(subcategories):
-            if subcat == subcategory:
-                question = self._get_question_by_index(i)
-                if question:
-                    questions.append(question)
+        Returns:
+            List: Tembel soru görünümleri
+        """
+        rows = self.get_row_ids(category, subcategory, year, keyword)
+        return [QuestionView(self.data, i) for i in rows]
+    
+    def get_question(self, index: int) -> Optional[QuestionView]:
+        """
+        Belirli indeksteki sorunun tembel görünümünü döndürür.
         
-        return questions
+        Args:
+            index: Soru indeksi
+            
+        Returns:
+            QuestionView veya None
+        """
+        if not self.data or not 0 <= index < self.get_total_questions():
+            return None
+        return QuestionView(self.data, index)
     
     def _get_question_by_index(self, index: int) -> Optional[Dict]:
         """
@@ -215,19 +496,12 @@ class DataAnalyzer:
         Returns:
             Dict veya None
         """
-        if not self.data:
+        question = self.get_question(index)
+        if question is None:
             return None
         
         try:
-            return {
-                'ticket_id': self.data['Ticket_ID'][index],
-                'kategori': self.data['Kategori'][index],
-                'alt_baslik': self.data['Alt Başlık'][index],
-                'metin': self.data['Metinler'][index],
-                'soru_koku': self.data['Soru Kökleri'][index],
-                'cevap': self.data['Cevaplar'][index],
-                'keywords': self.data['Keywords'][index]
-            }
+            return question.to_dict()
         except (IndexError, KeyError):
             return None
     
@@ -244,45 +518,7 @@ class DataAnalyzer:
         if not self.data:
             return {}
         
-        soru_kokleri = self.data.get('Soru Kökleri', [])
-        
-        # Soru kalıpları
-        patterns = {
-            'hangisi': 0,
-            'aşağıdakilerden': 0,
-            'çıkarılabilir': 0,
-            'çıkarılamaz': 0,
-            'anlam': 0,
-            'düşünce': 0,
-            'yargı': 0,
-            'tamamlama': 0,
-            'sıralama': 0,
-            'boşluk_doldurma': 0
-        }
-        
-        for soru in soru_kokleri:
-            soru_lower = soru.lower()
-            
-            if 'hangisi' in soru_lower:
-                patterns['hangisi'] += 1
-            if 'aşağıdaki' in soru_lower:
-                patterns['aşağıdakilerden'] += 1
-            if 'çıkarılabilir' in soru_lower or 'ulaşılır' in soru_lower:
-                patterns['çıkarılabilir'] += 1
-            if 'çıkarılamaz' in soru_lower or 'ulaşılamaz' in soru_lower:
-                patterns['çıkarılamaz'] += 1
-            if 'anlam' in soru_lower:
-                patterns['anlam'] += 1
-            if 'düşünce' in soru_lower:
-                patterns['düşünce'] += 1
-            if 'yargı' in soru_lower:
-                patterns['yargı'] += 1
-            if 'tamamla' in soru_lower:
-                patterns['tamamlama'] += 1
-            if 'sırala' in soru_lower:
-                patterns['sıralama'] += 1
-            if 'boş' in soru_lower and 'yer' in soru_lower:
-                patterns['boşluk_doldurma'] += 1
+        patterns = self.match_patterns().totals
         
         analysis = {
             'total_questions': self.get_total_questions(),
@@ -293,15 +529,68 @@ class DataAnalyzer:
         }
         
         self.analysis_cache['pattern_analysis'] = analysis
+        self.analysis_cache['pattern_fingerprint'] = self.pattern_matcher.fingerprint
         return analysis
     
-    def get_sample_questions(self, category: str = None, n: int = 5) -> List[Dict]:
+    def match_patterns(self, column: str = 'Soru Kökleri') -> PatternMatchResult:
+        """
+        Bir metin sütununda kalıp eşleştirmesi yapar (sonuç cache'lenir).
+        
+        Args:
+            column: Taranacak sütun (varsayılan: soru kökleri)
+            
+        Returns:
+            PatternMatchResult: Soru bazlı kalıp vektörleri ve toplamlar
+        """
+        cache_key = f'pattern_matches:{column}'
+        if cache_key in self.analysis_cache:
+            return self.analysis_cache[cache_key]
+        
+        texts = self.data.get(column, []) if self.data else []
+        result = self.pattern_matcher.match_all(texts)
+        
+        self.analysis_cache[cache_key] = result
+        return result
+    
+    def get_pattern_trends(self, field: str = 'year') -> Dict[str, Dict[str, int]]:
+        """
+        Soru kalıplarının yıl/kategori bazlı dağılımını hesaplar.
+        
+        Args:
+            field: Gruplama alanı (year, category, subcategory)
+            
+        Returns:
+            Dict: Grup -> {Kalıp -> Sayı}
+        """
+        if not self.data:
+            return {}
+        
+        matches = self.match_patterns()
+        return {
+            value: matches.count_rows(rows)
+            for value, rows in self.index.lookup_all(field).items()
+        }
+    
+    def get_sample_questions(
+        self,
+        category: str = None,
+        n: int = 5,
+        subcategory: str = None,
+        year: str = None,
+        stratify_by: Optional[str] = 'subcategory',
+        seed: int = None
+    ) -> List[QuestionView]:
         """
         Örnek sorular döndürür (few-shot learning için).
+        Satır numaraları üzerinde örnekleme yapılır, sadece seçilen sorular oluşturulur.
         
         Args:
             category: Opsiyonel kategori filtresi
             n: Döndürülecek soru sayısı
+            subcategory: Opsiyonel alt kategori filtresi
+            year: Opsiyonel yıl filtresi
+            stratify_by: Katman alanı (subcategory, category, year veya None)
+            seed: İstek bazlı seed (tekrarlanabilir örnekleme için)
             
         Returns:
             List: Örnek sorular
@@ -309,42 +598,104 @@ class DataAnalyzer:
         if not self.data:
             return []
         
-        if category:
-            questions = self.get_questions_by_category(category)
-        else:
-            questions = [
-                self._get_question_by_index(i) 
-                for i in range(self.get_total_questions())
-            ]
-            questions = [q for q in questions if q]
-        
-        # Her kategoriden dengeli örnekleme yap
-        import random
-        random.seed(42)  # Tekrarlanabilirlik için
-        
-        if len(questions) <= n:
-            return questions
-        
-        return random.sample(questions, n)
+        rows = self.get_row_ids(category=category, subcategory=subcategory, year=year)
+        strata = self.stats.codes(stratify_by) if stratify_by else None
+        selected = self.sampler.sample(rows, n, strata=strata, seed=seed)
+        
+        return [QuestionView(self.data, i) for i in selected]
     
-    def get_prediction_context(self, category: str = None) -> Dict[str, Any]:
+    def get_few_shot_examples(
+        self,
+        category: str = None,
+        subcategory: str = None,
+        difficulty: str = None,
+        n: int = 5
+    ) -> List[QuestionView]:
+        """
+        İstenen alt başlık ve zorluğa en uygun, birbirinden farklı örnek soruları seçer.
+        Seçim korpus üzerinde önceden hesaplanmış TF-IDF vektörleriyle yerelde yapılır.
+        
+        Args:
+            category: Opsiyonel kategori filtresi
+            subcategory: Öne çıkarılacak alt başlık
+            difficulty: Zorluk seviyesi (kolay, orta, zor)
+            n: Döndürülecek soru sayısı
+            
+        Returns:
+            List: Örnek sorular
+        """
+        if not self.data:
+            return []
+        
+        if self.example_retriever is None:
+            self.example_retriever = ExampleRetriever()
+            self.example_retriever.build(self.data)
+        
+        rows = self.get_row_ids(category=category)
+        focus_rows = self.get_row_ids(category=category, subcategory=subcategory) if subcategory else None
+        
+        selected = self.example_retriever.select(
+            rows,
+            n,
+            focus_rows=focus_rows,
+            difficulty=difficulty,
+            pool_key=category
+        )
+        return [QuestionView(self.data, i) for i in selected]
+
+    def classify_question(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Soruyu korpus üzerinde eğitilmiş yerel sınıflandırıcıyla sınıflandırır.
+        Sınıflandırıcı ilk kullanımda kurulur (yüzlerce soruda ~100 ms).
+
+        Args:
+            text: Soru metni
+
+        Returns:
+            Dict: Kategori, alt kategori, zorluk ve güven skorları (korpus boşsa None)
+        """
+        if not self.data:
+            return None
+
+        if self.question_classifier is None:
+            self.question_classifier = QuestionClassifier()
+            self.question_classifier.fit(self.data)
+
+        if not self.question_classifier.fitted:
+            return None
+        return self.question_classifier.classify(text)
+
+    def get_prediction_context(
+        self,
+        category: str = None,
+        seed: int = None,
+        subcategory: str = None,
+        difficulty: str = None,
+        n_examples: int = 5
+    ) -> Dict[str, Any]:
         """
         2026 LGS tahminlemesi için bağlam oluşturur.
+        Örnek sorular benzerlik tabanlı seçilir; seed verilirse rastgele örnekleme yapılır.
         
         Args:
             category: Opsiyonel kategori filtresi
+            seed: Rastgele örnek seçimi için opsiyonel seed
+            subcategory: Örnek seçiminde öne çıkarılacak alt başlık
+            difficulty: Örnek seçiminde hedeflenen zorluk
+            n_examples: Prompt'a girecek örnek soru sayısı
             
         Returns:
             Dict: Tahminleme bağlamı
         """
         pattern_analysis = self.get_pattern_analysis()
+        samples = self.get_context_examples(category, seed, subcategory, difficulty, n_examples)
         
         context = {
             'total_analyzed_questions': pattern_analysis['total_questions'],
             'category_trends': pattern_analysis['category_distribution'],
             'question_patterns': pattern_analysis['question_patterns'],
             'popular_topics': pattern_analysis['top_keywords'][:15],
-            'sample_questions': self.get_sample_questions(category, n=10),
+            'sample_questions': samples,
             'years_covered': list(pattern_analysis['year_distribution'].keys())
         }
         
@@ -352,11 +703,37 @@ class DataAnalyzer:
         if category:
             context['category_specific'] = {
                 'subcategories': self.get_subcategory_distribution().get(category, {}),
-                'sample_count': len(self.get_questions_by_category(category))
+                'sample_count': len(self.get_row_ids(category=category))
             }
         
         return context
     
+    def get_context_examples(
+        self,
+        category: str = None,
+        seed: int = None,
+        subcategory: str = None,
+        difficulty: str = None,
+        n_examples: int = 5
+    ) -> List[QuestionView]:
+        """
+        Tahminleme bağlamının örnek sorularını seçer (get_prediction_context ile aynı kural).
+        Bağlamın geri kalanı paylaşılırken örnekleri isteğe göre yenilemek için kullanılır.
+        
+        Args:
+            category: Opsiyonel kategori filtresi
+            seed: Verilirse rastgele örnekleme yapılır
+            subcategory: Öne çıkarılacak alt başlık
+            difficulty: Hedeflenen zorluk
+            n_examples: Örnek soru sayısı
+            
+        Returns:
+            List: Örnek sorular
+        """
+        if seed is not None:
+            return self.get_sample_questions(category, n=n_examples, subcategory=subcategory, seed=seed)
+        return self.get_few_shot_examples(category, subcategory, difficulty, n=n_examples)
+    
     def export_analysis_report(self) -> Dict[str, Any]:
         """
         Tam analiz raporu oluşturur.
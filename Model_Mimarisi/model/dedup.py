@@ -0,0 +1,169 @@
+"""
+LGS Türkçe Soru Tahminleme - Tekrar Tespit Modülü
+MinHash imzaları ve LSH kovaları ile yakın kopya soru tespiti
+"""
+
+import zlib
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .text_processing import tokenize
+
+
+# MinHash için 2^31 - 1 asal modülü (çarpımlar uint64'e sığar)
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def question_text(question: Dict[str, Any]) -> str:
+    """Üretilmiş bir sorunun karşılaştırılan metni (okuma metni + soru kökü)."""
+    return f"{question.get('metin') or ''} {question.get('soru') or question.get('soru_koku') or ''}"
+
+
+class NearDuplicateIndex:
+    """
+    Sözcük shingle'ları üzerinde MinHash + LSH indeksi.
+    Korpus soruları ve daha önce üretilen sorular eklenir; yeni bir soru
+    sadece aynı LSH kovasına düşen adaylarla karşılaştırılır.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        threshold: float = 0.6,
+        seed: int = 1
+    ):
+        """
+        Args:
+            num_perm: MinHash imza uzunluğu
+            bands: LSH bant sayısı (num_perm'i tam bölmeli)
+            shingle_size: Sözcük shingle uzunluğu
+            threshold: Yakın kopya sayılan tahmini Jaccard benzerliği
+            seed: Hash permütasyonları için seed
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm, bands değerine tam bölünmelidir.")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._signatures: List[np.ndarray] = []
+        self._refs: List[Tuple[str, Any]] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        tokens = tokenize(text, stem=False, stopwords=False)
+        k = self.shingle_size
+        if len(tokens) > k:
+            shingles = (' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1))
+        else:
+            shingles = tokens
+        return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Metnin MinHash imzasını hesaplar.
+
+        Args:
+            text: Metin
+
+        Returns:
+            np.ndarray veya None (boş metin)
+        """
+        hashes = self._shingles(text)
+        if not len(hashes):
+            return None
+        hashes %= _PRIME
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        r = self.rows_per_band
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def add(self, text: str, source: str, ref: Any = None, signature: np.ndarray = None) -> bool:
+        """
+        Metni indekse ekler.
+
+        Args:
+            text: Metin
+            source: Kaynak türü ('corpus' veya 'generated')
+            ref: Kaynaktaki referans (Ticket ID, soru özeti vb.)
+            signature: Önceden hesaplanmış imza (opsiyonel)
+
+        Returns:
+            bool: Eklendiyse True (boş metinler eklenmez)
+        """
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return False
+
+        item = len(self._signatures)
+        self._signatures.append(signature)
+        self._refs.append((source, ref))
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(item)
+        return True
+
+    def add_corpus(self, data: Dict[str, Sequence[Any]], start: int = 0) -> int:
+        """
+        Korpus satırlarını (okuma metni + soru kökü) indekse ekler.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+            start: İlk eklenecek satır
+
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        ticket_ids = data.get('Ticket_ID', [])
+        texts = data.get('Metinler', [])
+        stems = data.get('Soru Kökleri', [])
+        added = 0
+        for row in range(start, len(ticket_ids)):
+            text = f"{texts[row] if row < len(texts) else ''} {stems[row] if row < len(stems) else ''}"
+            added += self.add(text, 'corpus', ticket_ids[row])
+        return added
+
+    def query(self, text: str, signature: np.ndarray = None) -> Optional[Dict[str, Any]]:
+        """
+        Metnin indeksteki en benzer yakın kopyasını bulur.
+
+        Args:
+            text: Metin
+            signature: Önceden hesaplanmış imza (opsiyonel)
+
+        Returns:
+            Dict: {'source', 'ref', 'similarity'} veya eşik altındaysa None
+        """
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return None
+
+        candidates = set()
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(band.get(key, ()))
+
+        best, best_similarity = None, 0.0
+        for item in candidates:
+            similarity = float(np.count_nonzero(self._signatures[item] == signature)) / self.num_perm
+            if similarity > best_similarity:
+                best, best_similarity = item, similarity
+
+        if best is None or best_similarity < self.threshold:
+            return None
+        source, ref = self._refs[best]
+        return {'source': source, 'ref': ref, 'similarity': round(best_similarity, 3)}
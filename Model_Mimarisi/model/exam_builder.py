@@ -0,0 +1,287 @@
+"""
+LGS Türkçe Soru Tahminleme - Deneme Sınavı Modülü
+Hedef kategori dağılımından soru planı çıkarma ve üretilen sorulardan
+numaralı deneme sınavı ile cevap anahtarı oluşturma
+"""
+
+import re
+from typing import Dict, Any, List, Tuple
+
+from .dedup import question_text
+from .text_processing import normalize_text
+
+
+# Varsayılan zorluk karışımı (LGS Türkçe testinde orta sorular ağırlıklıdır)
+DEFAULT_DIFFICULTY_MIX = {'kolay': 0.3, 'orta': 0.4, 'zor': 0.3}
+
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)?')
+
+# Üretim satırı: {'category', 'count', 'difficulties': {zorluk: adet}}
+Slot = Dict[str, Any]
+
+
+def largest_remainder(weights: Dict[str, float], total: int) -> Dict[str, int]:
+    """
+    Toplamı `total` olan tam sayı dağılımı (en büyük kalan / Hamilton yöntemi).
+    Her anahtar önce payının tam kısmını alır; kalan adetler kesirli kısmı en büyük
+    olanlara verilir. Eşitlikte ağırlığı büyük olan önce gelir.
+
+    Args:
+        weights: Anahtar -> negatif olmayan ağırlık
+        total: Dağıtılacak toplam
+
+    Returns:
+        Dict: Anahtar -> adet (sıfır olanlar dahil)
+    """
+    positive = {key: float(weight) for key, weight in weights.items() if weight and weight > 0}
+    weight_sum = sum(positive.values())
+    if total <= 0 or not weight_sum:
+        return {key: 0 for key in weights}
+
+    quotas = {key: total * weight / weight_sum for key, weight in positive.items()}
+    counts = {key: int(quota) for key, quota in quotas.items()}
+    remaining = total - sum(counts.values())
+    order = sorted(quotas, key=lambda key: (-(quotas[key] - counts[key]), -positive[key], key))
+    for key in order[:remaining]:
+        counts[key] += 1
+    return {key: counts.get(key, 0) for key in weights}
+
+
+class ExamBuilder:
+    """
+    Deneme sınavı planlayıcı ve birleştirici.
+    Kategori dağılımı geçmiş sınavların kategori × yıl istatistiklerinden (yakın yıllar daha
+    ağırlıklı) veya trend tahmininden çıkarılır; soru sayıları ve zorluklar en büyük kalan
+    yöntemiyle tam olarak hedef toplama dağıtılır. Plan kategori başına tek satırdır; zorluk
+    karışımı satırın içindedir. Üretim çağıranın işidir; sınıf planı verir ve üretilen soruları
+    sınav içi tekrarları ayıklayarak numaralı sınava çevirir.
+    """
+
+    def __init__(
+        self,
+        total: int = 20,
+        difficulty_mix: Dict[str, float] = None,
+        recency_decay: float = 0.7
+    ):
+        """
+        Args:
+            total: Sınavdaki soru sayısı
+            difficulty_mix: Zorluk -> oran (varsayılan: DEFAULT_DIFFICULTY_MIX)
+            recency_decay: Her eski yılın ağırlık çarpanı (1: tüm yıllar eşit)
+        """
+        self.total = total
+        self.difficulty_mix = dict(difficulty_mix or DEFAULT_DIFFICULTY_MIX)
+        self.recency_decay = recency_decay
+
+    # ==================== HEDEF DAĞILIM ====================
+
+    def distribution_from_crosstab(self, crosstab: Dict[str, Dict[str, int]]) -> Dict[str, float]:
+        """
+        Kategori × yıl dağılımından kategori ağırlıkları.
+        Sadece sınav yılları (sayısal sütunlar) kullanılır; her yılın kategori payları
+        alınıp yakın yıllar daha ağırlıklı olacak şekilde ortalanır. Sınav yılı yoksa
+        tüm sütunların toplamı kullanılır (ör. sadece MEB örnek soruları).
+
+        Args:
+            crosstab: Kategori -> {Yıl -> Sayı}
+
+        Returns:
+            Dict: Kategori -> ağırlık (toplam 1)
+        """
+        years = sorted({year for row in crosstab.values() for year in row if str(year).isdigit()}, key=int)
+        if not years:
+            totals = {category: float(sum(row.values())) for category, row in crosstab.items()}
+            weight_sum = sum(totals.values()) or 1.0
+            return {category: value / weight_sum for category, value in totals.items()}
+
+        weights = {category: 0.0 for category in crosstab}
+        decay_sum = 0.0
+        for age, year in enumerate(reversed(years)):
+            year_total = sum(row.get(year, 0) for row in crosstab.values())
+            if not year_total:
+                continue
+            decay = self.recency_decay ** age
+            decay_sum += decay
+            for category, row in crosstab.items():
+                weights[category] += decay * row.get(year, 0) / year_total
+        return {category: weight / decay_sum for category, weight in weights.items()} if decay_sum else weights
+
+    @staticmethod
+    def distribution_from_trends(trends: Dict[str, Any], categories: List[str]) -> Dict[str, float]:
+        """
+        Trend tahminindeki 'soru_dagilimi_tahmini' alanından kategori ağırlıkları.
+        Değerler "8", "7-8" veya "yaklaşık 8 soru" gibi metinler olabilir; aralıklarda orta nokta alınır.
+
+        Args:
+            trends: get_2026_predictions sonucundaki trend_predictions
+            categories: Geçerli kategoriler
+
+        Returns:
+            Dict: Kategori -> ağırlık (ayrıştırılamazsa boş)
+        """
+        predicted = (trends or {}).get('soru_dagilimi_tahmini') or {}
+        if not isinstance(predicted, dict):
+            return {}
+
+        weights = {}
+        for category, value in predicted.items():
+            if category not in categories:
+                continue
+            numbers = [float(n.replace(',', '.')) for n in _NUMBER_RE.findall(str(value))]
+            if numbers:
+                weights[category] = sum(numbers[:2]) / len(numbers[:2])
+        weight_sum = sum(weights.values())
+        return {category: weight / weight_sum for category, weight in weights.items()} if weight_sum else {}
+
+    # ==================== PLAN ====================
+
+    def plan(self, category_weights: Dict[str, float], max_slots: int = None) -> Dict[str, Any]:
+        """
+        Kategori ağırlıklarından kategori başına bir üretim satırı çıkarır.
+        Zorluk toplamları difficulty_mix'e göre tam dağıtılır; zorluklar kategorilere
+        sırayla serpiştirilerek her kategoriye orana yakın bir karışım düşer. Her satır
+        tek çağrıda karma zorlukla üretilir. max_slots verilirse en ağırlıklı max_slots
+        kategori tutulur, kalanların payı bunlara dağıtılır (çağrı sayısı hız sınırının
+        anlık kapasitesini aşmaz).
+
+        Args:
+            category_weights: Kategori -> ağırlık
+            max_slots: En fazla satır (kategori) sayısı
+
+        Returns:
+            Dict: 'categories' (kategori -> adet), 'difficulties' (zorluk -> adet),
+                  'slots' [{'category', 'count', 'difficulties'}]
+        """
+        weights = {category: weight for category, weight in category_weights.items() if weight and weight > 0}
+        if max_slots and len(weights) > max_slots:
+            kept = sorted(weights, key=lambda category: (-weights[category], category))[:max_slots]
+            weights = {category: weights[category] for category in kept}
+
+        category_counts = largest_remainder(weights, self.total)
+        difficulty_counts = largest_remainder(self.difficulty_mix, self.total)
+
+        # Zorluk dizisi: her adımda hedef oranın en gerisinde kalan zorluk seçilir
+        sequence: List[str] = []
+        used = {difficulty: 0 for difficulty in difficulty_counts}
+        for position in range(1, self.total + 1):
+            difficulty = max(
+                (d for d in difficulty_counts if used[d] < difficulty_counts[d]),
+                key=lambda d: (difficulty_counts[d] * position / self.total - used[d], difficulty_counts[d])
+            )
+            used[difficulty] += 1
+            sequence.append(difficulty)
+
+        slots: List[Slot] = []
+        position = 0
+        for category, count in sorted(category_counts.items(), key=lambda item: -item[1]):
+            if not count:
+                continue
+            mix = {difficulty: 0 for difficulty in difficulty_counts}
+            for difficulty in sequence[position:position + count]:
+                mix[difficulty] += 1
+            position += count
+            slots.append({
+                'category': category,
+                'count': count,
+                'difficulties': {difficulty: n for difficulty, n in mix.items() if n}
+            })
+
+        return {
+            'categories': {category: count for category, count in category_counts.items() if count},
+            'difficulties': difficulty_counts,
+            'slots': slots
+        }
+
+    # ==================== SINAV ====================
+
+    @staticmethod
+    def dedupe(questions: List[Dict]) -> Tuple[List[Dict], int]:
+        """Sınav içinde metni ve kökü aynı olan soruları ayıklar."""
+        seen = set()
+        kept = []
+        for question in questions:
+            key = normalize_text(question_text(question))
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(question)
+        return kept, len(questions) - len(kept)
+
+    def assemble(
+        self,
+        questions_by_category: Dict[str, List[Dict]],
+        category_order: List[str],
+        difficulty_order: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Üretilen soruları kategori sırasıyla, kategori içinde zorluk ('zorluk' alanı)
+        sırasıyla numaralı sınava çevirir.
+        Sınav kitapçığında doğru cevap ve açıklama yer almaz; bunlar cevap anahtarındadır.
+
+        Args:
+            questions_by_category: Kategori -> sorular
+            category_order: Kategorilerin sınavdaki sırası
+            difficulty_order: Kategori içinde zorluk sırası (ör. kolay, orta, zor)
+
+        Returns:
+            Dict: 'questions', 'answer_key', 'duplicates_removed'
+        """
+        def rank(values: List[str], value: Any) -> int:
+            return values.index(value) if value in values else len(values)
+
+        ordered = [
+            question
+            for category in sorted(questions_by_category, key=lambda category: rank(category_order, category))
+            for question in sorted(
+                questions_by_category[category],
+                key=lambda question: rank(difficulty_order, str(question.get('zorluk', '')).lower())
+            )
+        ]
+        ordered, removed = self.dedupe(ordered)
+
+        booklet, answer_key = [], []
+        for number, question in enumerate(ordered[:self.total], 1):
+            booklet.append({
+                "soru_no": number,
+                **{key: value for key, value in question.items() if key not in ("soru_no", "dogru_cevap", "aciklama")}
+            })
+            answer_key.append({
+                "soru_no": number,
+                "dogru_cevap": question.get("dogru_cevap"),
+                "aciklama": question.get("aciklama", "")
+            })
+        return {"questions": booklet, "answer_key": answer_key, "duplicates_removed": removed}
+
+    @staticmethod
+    def shortfall(plan_slots: List[Slot], questions_by_category: Dict[str, List[Dict]]) -> List[Slot]:
+        """
+        Plana göre eksik kalan satırlar.
+        Eksik adet, gelen soruların 'zorluk' alanına göre en geride kalan zorluklara dağıtılır.
+
+        Args:
+            plan_slots: plan()['slots']
+            questions_by_category: Kategori -> o ana kadar tutulan sorular
+
+        Returns:
+            List: Eksik satırlar [{'category', 'count', 'difficulties'}]
+        """
+        missing = []
+        for slot in plan_slots:
+            questions = questions_by_category.get(slot['category'], [])
+            count = slot['count'] - len(questions)
+            if count <= 0:
+                continue
+            have: Dict[str, int] = {}
+            for question in questions:
+                level = str(question.get('zorluk', '')).lower()
+                have[level] = have.get(level, 0) + 1
+            deficits = {level: n - have.get(level, 0) for level, n in slot['difficulties'].items()}
+            mix = largest_remainder(
+                {level: n for level, n in deficits.items() if n > 0} or slot['difficulties'], count
+            )
+            missing.append({
+                'category': slot['category'],
+                'count': count,
+                'difficulties': {level: n for level, n in mix.items() if n}
+            })
+        return missing
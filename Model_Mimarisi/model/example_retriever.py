@@ -0,0 +1,174 @@
+"""
+LGS Türkçe Soru Tahminleme - Örnek Seçim Modülü
+Few-shot örnekleri için TF-IDF benzerliği ve MMR (Maximal Marginal Relevance) ile seçim
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Any, Hashable, Sequence, Tuple
+
+import numpy as np
+
+from .text_vectors import CharNgramVectorizer
+
+
+# Zorluk seviyesi -> hedef uzunluk yüzdeliği (etiket olmadığı için metin uzunluğu vekil ölçüdür)
+DIFFICULTY_TARGETS = {
+    'kolay': 0.2,
+    'orta': 0.5,
+    'zor': 0.8
+}
+
+
+class ExampleRetriever:
+    """
+    Korpus üzerinde önceden hesaplanmış karakter n-gram TF-IDF vektörleriyle
+    istenen alt başlık ve zorluğa en uygun, birbirinden farklı örnekleri seçer.
+    Aday havuzlarının benzerlik matrisleri ilk kullanımda hesaplanıp cache'lenir.
+    """
+
+    # Vektörleştirilen metin uzunluğu (paragrafın başı konu için yeterlidir)
+    TEXT_CHARS = 800
+
+    def __init__(
+        self,
+        vectorizer: CharNgramVectorizer = None,
+        diversity: float = 0.3,
+        focus_bonus: float = 0.2,
+        difficulty_weight: float = 0.15,
+        max_matrix_rows: int = 2000,
+        cache_size: int = 32
+    ):
+        """
+        Args:
+            vectorizer: Metin vektörleştirici (varsayılan: CharNgramVectorizer)
+            diversity: MMR'de çeşitliliğin ağırlığı (0: sadece ilgi, 1: sadece çeşitlilik)
+            focus_bonus: İstenen alt başlıktaki sorulara eklenen ilgi puanı
+            difficulty_weight: Zorluk yakınlığının ilgi puanındaki ağırlığı
+            max_matrix_rows: Benzerlik matrisi kurulacak en büyük aday havuzu
+            cache_size: Cache'lenen havuz matrisi sayısı
+        """
+        self.vectorizer = vectorizer or CharNgramVectorizer()
+        self.diversity = diversity
+        self.focus_bonus = focus_bonus
+        self.difficulty_weight = difficulty_weight
+        self.max_matrix_rows = max_matrix_rows
+        self.cache_size = cache_size
+
+        self.vectors = np.empty((0, self.vectorizer.dim), dtype=np.float32)
+        self.length_rank = np.empty(0, dtype=np.float32)
+        self._pools: 'OrderedDict[Hashable, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        """Vektörleştirilmiş soru sayısı."""
+        return len(self.vectors)
+
+    def build(self, data: Dict[str, Sequence[Any]]):
+        """
+        Korpusun vektörlerini ve uzunluk yüzdeliklerini hesaplar.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+        """
+        texts = data.get('Metinler', [])
+        stems = data.get('Soru Kökleri', [])
+        answers = data.get('Cevaplar', [])
+        total = len(data.get('Ticket_ID', []))
+
+        def column(values, row):
+            return (values[row] or '') if row < len(values) else ''
+
+        self.vectors = self.vectorizer.fit_transform(
+            f"{column(texts, row)[:self.TEXT_CHARS]} {column(stems, row)}" for row in range(total)
+        )
+
+        lengths = np.fromiter(
+            (len(column(texts, row)) + len(column(stems, row)) + len(column(answers, row)) for row in range(total)),
+            dtype=np.int64,
+            count=total
+        )
+        ranks = np.empty(total, dtype=np.float32)
+        ranks[np.argsort(lengths, kind='stable')] = np.arange(total, dtype=np.float32)
+        self.length_rank = ranks / max(total - 1, 1)
+        self._pools.clear()
+
+    def _pool_matrix(self, key: Hashable, rows: np.ndarray) -> np.ndarray:
+        """Aday havuzunun benzerlik matrisini cache'ten döndürür veya hesaplar."""
+        cached = self._pools.get(key)
+        if cached is not None and np.array_equal(cached[0], rows):
+            self._pools.move_to_end(key)
+            return cached[1]
+
+        vectors = self.vectors[rows]
+        matrix = vectors @ vectors.T
+        self._pools[key] = (rows, matrix)
+        if len(self._pools) > self.cache_size:
+            self._pools.popitem(last=False)
+        return matrix
+
+    def select(
+        self,
+        rows: Sequence[int],
+        n: int = 5,
+        focus_rows: Sequence[int] = None,
+        difficulty: str = None,
+        pool_key: Hashable = None
+    ) -> List[int]:
+        """
+        Aday satırlar içinden ilgili ve çeşitli n örnek seçer.
+
+        Args:
+            rows: Aday satırlar (ör. kategorinin soruları)
+            n: Seçilecek örnek sayısı
+            focus_rows: İstenen alt başlığın satırları (sorgu vektörü bunlardan kurulur)
+            difficulty: Zorluk seviyesi (kolay, orta, zor)
+            pool_key: Havuz benzerlik matrisinin cache anahtarı (ör. kategori adı)
+
+        Returns:
+            List: Seçilen satır numaraları (ilgi sırasına göre)
+        """
+        candidates = np.asarray(rows, dtype=np.int64)
+        if n <= 0 or not len(candidates) or not self.size:
+            return []
+
+        focus = np.asarray(focus_rows if focus_rows is not None and len(focus_rows) else candidates, dtype=np.int64)
+        query = self.vectors[focus].mean(axis=0)
+        query /= np.linalg.norm(query) or 1.0
+
+        relevance = self.vectors[candidates] @ query
+        if focus_rows is not None and len(focus_rows):
+            relevance += self.focus_bonus * np.isin(candidates, focus)
+        target = DIFFICULTY_TARGETS.get((difficulty or '').lower())
+        if target is not None:
+            relevance += self.difficulty_weight * (1.0 - np.abs(self.length_rank[candidates] - target))
+
+        if n >= len(candidates):
+            return candidates[np.argsort(-relevance, kind='stable')].tolist()
+
+        # Büyük havuzlarda MMR en ilgili adaylar üzerinde çalışır
+        if len(candidates) > self.max_matrix_rows:
+            keep = np.sort(np.argpartition(-relevance, self.max_matrix_rows - 1)[:self.max_matrix_rows])
+            candidates, relevance = candidates[keep], relevance[keep]
+            pool_key = None
+
+        # Tek seferlik havuzlarda tam matris yerine sadece seçilenlerin satırları hesaplanır
+        matrix = self._pool_matrix(pool_key, candidates) if pool_key is not None else None
+        vectors = self.vectors[candidates]
+
+        selected: List[int] = []
+        max_similarity = np.full(len(candidates), -np.inf, dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+
+        for _ in range(n):
+            if selected:
+                scores = (1.0 - self.diversity) * relevance - self.diversity * max_similarity
+            else:
+                scores = relevance.copy()
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            selected.append(best)
+            available[best] = False
+            similarity = matrix[best] if matrix is not None else vectors @ vectors[best]
+            np.maximum(max_similarity, similarity, out=max_similarity)
+
+        return candidates[selected].tolist()
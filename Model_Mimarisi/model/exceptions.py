@@ -0,0 +1,51 @@
+"""
+LGS Türkçe Soru Tahminleme - Hata Tipleri
+LLM çağrılarında oluşan ve API'nin HTTP durum kodlarına çevirdiği hatalar
+"""
+
+from typing import Optional
+
+
+class LLMError(Exception):
+    """LLM çağrısı hatalarının temel sınıfı."""
+
+    status_code = 502
+    # Aynı çağrının tekrar denenmesi anlamlı mı
+    retryable = False
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMRateLimitError(LLMError):
+    """Kota aşıldı (istemci tarafı limit veya upstream 429)."""
+
+    status_code = 429
+    retryable = True
+
+
+class LLMTimeoutError(LLMError):
+    """Çağrı zaman aşımına uğradı."""
+
+    status_code = 504
+    retryable = True
+
+
+class LLMUnavailableError(LLMError):
+    """Upstream erişilemez veya devre kesici açık."""
+
+    status_code = 503
+    retryable = True
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Devre kesici açık: upstream sağlıklı değil, çağrı yapılmadan hızlıca reddedilir."""
+
+    retryable = False
+
+
+class LLMResponseError(LLMError):
+    """Upstream geçersiz, engellenmiş veya beklenmeyen bir yanıt döndürdü."""
+
+    status_code = 502
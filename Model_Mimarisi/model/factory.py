@@ -0,0 +1,85 @@
+"""
+LGS Türkçe Soru Tahminleme - Tahminleyici Kurulumu
+API ve CLI'nin aynı ayarlarla (config.py) aynı tahminleyiciyi kurması için ortak fabrika
+"""
+
+import config
+from .corpus_loader import CorpusLoader
+from .history_store import HistoryStore
+from .llm_provider import create_llm_provider
+from .question_predictor import QuestionPredictor
+from .resilience import ResilientCaller
+from .response_cache import create_response_cache
+
+PLACEHOLDER_API_KEY = "BURAYA_API_ANAHTARINIZI_GIRIN"
+
+
+def check_settings():
+    """
+    Tahminleyici kurulmadan önce zorunlu ayarları doğrular.
+
+    Raises:
+        ValueError: Gemini sağlayıcısında API anahtarı yoksa veya korpus bulunamazsa
+    """
+    api_key = config.GEMINI_API_KEY
+    if config.LLM_PROVIDER == "gemini" and (not api_key or api_key == PLACEHOLDER_API_KEY):
+        raise ValueError("API anahtarı yapılandırılmamış. .env dosyasında Gemini_API_Key değerini ayarlayın.")
+
+    if not CorpusLoader().resolve_sources(config.CORPUS_SOURCE):
+        raise ValueError(f"Veri dosyası bulunamadı: {config.CORPUS_SOURCE}")
+
+
+def create_predictor() -> QuestionPredictor:
+    """
+    config.py ayarlarından tahminleyici kurar: korpus ve snapshot, arama indeksi, LLM yanıt
+    cache'i, hız sınırı ve yeniden deneme, sağlayıcı (Gemini veya yerel), soru havuzu ve
+    kalıcı geçmiş. Havuz anahtarları ayarlıysa doldurma başlatılır (event loop varsa).
+
+    Returns:
+        QuestionPredictor: Yapılandırılmış tahminleyici
+
+    Raises:
+        ValueError: Zorunlu ayarlar eksikse (bkz. check_settings)
+    """
+    check_settings()
+
+    predictor = QuestionPredictor(
+        data_path=config.CORPUS_SOURCE,
+        api_key=config.GEMINI_API_KEY,
+        snapshot_path=config.SNAPSHOT_FILE,
+        search_index_path=config.SEARCH_INDEX_FILE,
+        cache=create_response_cache(config.LLM_CACHE_BACKEND, config.LLM_CACHE_FILE, config.LLM_CACHE_TTL),
+        resilience=ResilientCaller(
+            rpm=config.GEMINI_RPM,
+            tpm=config.GEMINI_TPM,
+            timeout=config.GEMINI_TIMEOUT,
+            max_attempts=config.GEMINI_MAX_ATTEMPTS
+        ),
+        provider=create_llm_provider(
+            config.LLM_PROVIDER,
+            api_key=config.GEMINI_API_KEY,
+            model_name=config.GEMINI_MODELS[0],
+            fallback_models=config.GEMINI_MODELS[1:],
+            hedge_delay=config.GEMINI_HEDGE_DELAY,
+            attempt_timeout=config.GEMINI_MODEL_TIMEOUT,
+            latency=config.LOCAL_LLM_LATENCY,
+            error_rate=config.LOCAL_LLM_ERROR_RATE,
+            seed=config.LOCAL_LLM_SEED
+        ),
+        pool_settings={
+            "low_water": config.QUESTION_POOL_LOW_WATER,
+            "high_water": config.QUESTION_POOL_HIGH_WATER,
+            "batch_size": config.QUESTION_POOL_BATCH_SIZE,
+            "concurrency": config.QUESTION_POOL_CONCURRENCY
+        } if config.QUESTION_POOL else None,
+        analysis_confidence=config.ANALYSIS_CONFIDENCE,
+        history=HistoryStore(
+            None if config.HISTORY_FILE.lower() == "none" else config.HISTORY_FILE,
+            max_entries=config.HISTORY_SIZE
+        ),
+        max_generated_questions=config.GENERATED_QUESTIONS_SIZE
+    )
+    if predictor.question_pool is not None and config.QUESTION_POOL_KEYS:
+        predictor.question_pool.prefill(config.QUESTION_POOL_KEYS)
+
+    return predictor
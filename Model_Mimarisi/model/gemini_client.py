@@ -4,61 +4,149 @@ Google Gemini API entegrasyonu ve soru üretimi
 """
 
 import json
-import re
-from typing import Dict, List, Any, Optional
-import google.generativeai as genai
+from typing import Dict, List, Any, AsyncIterator, Callable, Optional
+
+from .exceptions import LLMError
+from .llm_provider import LLMProvider, create_llm_provider
+from .resilience import ResilientCaller, estimate_tokens
+from .response_cache import ResponseCache, prompt_digest
+from .response_parser import IncrementalArrayParser, extract_json, parse_questions, validate_question
+from .single_flight import SingleFlight
 
 
 class GeminiClient:
     """
     Google Gemini API ile iletişim kuran sınıf.
     LGS Türkçe soruları üretir ve analiz eder.
+    Prompt oluşturma ve yanıt ayrıştırma burada yapılır; çağrıyı LLMProvider
+    yapar (varsayılan Gemini, çevrimdışı çalışma için yerel yedek sağlayıcı).
     """
     
-    def __init__(self, api_key: str, model_name: str = "models/gemini-1.5-flash"):
+    # Soru analizinde yerel sınıflandırıcının üretemediği, LLM'e bırakılan alanlar
+    NARRATIVE_FIELDS = ("kazanimlar", "ipuclari", "benzer_soru_ozellikleri")
+    
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = None,
+        cache: ResponseCache = None,
+        coalesce: bool = True,
+        resilience: ResilientCaller = None,
+        provider: LLMProvider = None
+    ):
         """
         Args:
-            api_key: Gemini API anahtarı
-            model_name: Kullanılacak model adı
+            api_key: Gemini API anahtarı (provider verildiyse kullanılmaz)
+            model_name: Birincil model adı (provider verildiyse kullanılmaz; varsayılan:
+                        config.GEMINI_MODELS, sıradaki modeller hedge/yedek olarak kullanılır)
+            cache: Opsiyonel yanıt cache'i (aynı prompt için API çağrısı tekrarlanmaz)
+            coalesce: True ise aynı anda gelen aynı (cache'lenebilir) çağrılar birleştirilir
+            resilience: Hız sınırı, yeniden deneme, zaman aşımı ve devre kesici katmanı
+            provider: LLM arka ucu (varsayılan: config.GEMINI_MODELS üzerinde Gemini; ör. yerel yedek sağlayıcı)
         """
         self.api_key = api_key
-        self.model_name = model_name
-        self.model = None
-        self._configure_api()
+        self.provider = provider or create_llm_provider('gemini', api_key=api_key, model_name=model_name)
+        self.model_name = self.provider.model_name
+        self.generation_config = self.provider.generation_config
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.resilience = resilience or ResilientCaller()
+        # İlk deneme resilience.call içinde sayılır; hedge ve yedek model denemeleri sağlayıcıda
+        self.provider.bind_limiter(self.resilience.limiter)
+        self.parse_stats = {'responses': 0, 'questions': 0, 'invalid_questions': 0, 'failed_responses': 0}
+    
+    def _request_text(self, prompt: str) -> str:
+        """Modeli dayanıklılık katmanı üzerinden çağırır ve yanıt metnini döndürür."""
+        return self.resilience.call_sync(
+            lambda: self.provider.generate(prompt, timeout=self.resilience.timeout),
+            estimate_tokens(prompt)
+        )
     
-    def _configure_api(self):
-        """API yapılandırmasını yapar."""
-        genai.configure(api_key=self.api_key)
-        
-        # Model yapılandırması
-        generation_config = {
-            "temperature": 0.7,
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 8192,
-        }
-        
-        # Güvenlik ayarları (eğitim içeriği için uygun)
-        safety_settings = [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-        ]
-        
-        self.model = genai.GenerativeModel(
-            model_name=self.model_name,
-            generation_config=generation_config,
-            safety_settings=safety_settings
+    async def _request_text_async(self, prompt: str) -> str:
+        """_request_text'in asenkron sürümü."""
+        return await self.resilience.call(
+            lambda: self.provider.generate_async(prompt, timeout=self.resilience.timeout),
+            estimate_tokens(prompt)
         )
     
+    def _request_key(self, prompt: str) -> str:
+        """Cache ve istek birleştirme anahtarı (cache yoksa sadece prompt özeti)."""
+        if self.cache is None:
+            return prompt_digest(self.model_name, self.generation_config, prompt)
+        return self.cache.make_key(self.model_name, self.generation_config, prompt)
+    
+    def _generate(
+        self,
+        prompt: str,
+        parse: Callable[[str], Any],
+        use_cache: bool = True,
+        cacheable: bool = True
+    ) -> Any:
+        """
+        Prompt'u modele gönderir ve yanıtı parse eder.
+        Cache varsa yanıt cache'ten okunur; parse edilebilen yanıtlar cache'e yazılır.
+        
+        Args:
+            prompt: Prompt metni
+            parse: Yanıt metnini sonuca çeviren fonksiyon
+            use_cache: False ise cache okunmaz (taze yanıt cache'i günceller)
+            cacheable: False ise cache hiç kullanılmaz
+            
+        Returns:
+            Parse edilmiş sonuç
+        """
+        key = self._request_key(prompt) if cacheable and self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key, bypass=not use_cache)
+            if cached is not None:
+                return parse(cached)
+        
+        text = self._request_text(prompt)
+        result = parse(text)
+        if key is not None and result:
+            self.cache.set(key, text)
+        return result
+    
+    async def _generate_async(
+        self,
+        prompt: str,
+        parse: Callable[[str], Any],
+        use_cache: bool = True,
+        cacheable: bool = True
+    ) -> Any:
+        """
+        _generate'in asenkron sürümü.
+        Cache'lenebilir çağrılarda aynı anahtarla süren bir çağrı varsa ona katılınır.
+        """
+        if not cacheable:
+            return parse(await self._request_text_async(prompt))
+        
+        key = self._request_key(prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key, bypass=not use_cache)
+            if cached is not None:
+                return parse(cached)
+        
+        async def fetch():
+            text = await self._request_text_async(prompt)
+            result = parse(text)
+            if self.cache is not None and result:
+                self.cache.set(key, text)
+            return result
+        
+        if self.single_flight is None:
+            return await fetch()
+        return await self.single_flight.run(key, fetch)
+    
     def generate_questions(
         self, 
         context: Dict[str, Any],
         category: str,
         subcategory: str = None,
         count: int = 5,
-        difficulty: str = "orta"
+        difficulty: str = "orta",
+        use_cache: bool = False,
+        difficulty_mix: Dict[str, int] = None
     ) -> List[Dict]:
         """
         Verilen bağlama göre yeni LGS Türkçe soruları üretir.
@@ -69,32 +157,130 @@ class GeminiClient:
             subcategory: Alt kategori (opsiyonel)
             count: Üretilecek soru sayısı
             difficulty: Zorluk seviyesi (kolay, orta, zor)
+            use_cache: True ise aynı prompt için cache'teki yanıt kullanılır
+                       (varsayılan kapalı: her istekte farklı sorular beklenir)
+            difficulty_mix: Zorluk -> soru sayısı; verilirse tek çağrıda karma zorlukta
+                            sorular istenir ve difficulty yok sayılır
             
         Returns:
             List[Dict]: Üretilen sorular
+            
+        Raises:
+            LLMError: Kota, zaman aşımı, erişilemezlik veya upstream hatası
         """
         prompt = self._build_generation_prompt(
-            context, category, subcategory, count, difficulty
+            context, category, subcategory, count, difficulty, difficulty_mix
+        )
+        
+        try:
+            return self._generate(prompt, self._parse_generated_questions, cacheable=use_cache)
+        except LLMError:
+            raise
+        except Exception as e:
+            print(f"Soru üretme hatası: {e}")
+            return []
+    
+    async def generate_questions_async(
+        self, 
+        context: Dict[str, Any],
+        category: str,
+        subcategory: str = None,
+        count: int = 5,
+        difficulty: str = "orta",
+        use_cache: bool = False,
+        difficulty_mix: Dict[str, int] = None
+    ) -> List[Dict]:
+        """
+        generate_questions'ın asenkron sürümü.
+        SDK'nın async API'si kullanılır; event loop istek süresince bloklanmaz.
+        
+        Returns:
+            List[Dict]: Üretilen sorular
+            
+        Raises:
+            LLMError: Kota, zaman aşımı, erişilemezlik veya upstream hatası
+        """
+        prompt = self._build_generation_prompt(
+            context, category, subcategory, count, difficulty, difficulty_mix
         )
         
         try:
-            response = self.model.generate_content(prompt)
-            questions = self._parse_generated_questions(response.text)
-            return questions
+            return await self._generate_async(prompt, self._parse_generated_questions, cacheable=use_cache)
+        except LLMError:
+            raise
         except Exception as e:
             print(f"Soru üretme hatası: {e}")
             return []
     
+    async def stream_questions_async(
+        self,
+        context: Dict[str, Any],
+        category: str,
+        subcategory: str = None,
+        count: int = 5,
+        difficulty: str = "orta"
+    ) -> AsyncIterator[Dict]:
+        """
+        generate_questions'ın akış sürümü.
+        Yanıt parça parça alınır; her soru JSON nesnesinin kapanış parantezi
+        geldiği anda döndürülür (tüm yanıt beklenmez). Akışlar cache'lenmez.
+        
+        Yields:
+            Dict: Üretilen soru
+            
+        Raises:
+            LLMError: Kota, zaman aşımı, erişilemezlik veya upstream hatası
+        """
+        prompt = self._build_generation_prompt(
+            context, category, subcategory, count, difficulty
+        )
+        parser = IncrementalArrayParser()
+        
+        chunks = self.resilience.stream(
+            lambda: self.provider.stream_async(prompt, timeout=self.resilience.timeout),
+            estimate_tokens(prompt)
+        )
+        async for text in chunks:
+            batch = parser.feed(text)
+            for offset, question in enumerate(batch):
+                errors = validate_question(question)
+                if errors:
+                    index = parser.count - len(batch) + offset
+                    self._report_invalid([{"index": index, "errors": errors}])
+                    continue
+                self.parse_stats['questions'] += 1
+                yield question
+            if parser.finished:
+                break
+        
+        self.parse_stats['responses'] += 1
+        invalid = list(parser.errors)
+        if parser.incomplete:
+            invalid.append({"index": parser.count, "errors": ["Yanıt yarıda kesilmiş; son soru tamamlanmamış"]})
+        self._report_invalid(invalid)
+    
     def _build_generation_prompt(
         self,
         context: Dict[str, Any],
         category: str,
         subcategory: str,
         count: int,
-        difficulty: str
+        difficulty: str,
+        difficulty_mix: Dict[str, int] = None
     ) -> str:
         """Soru üretimi için prompt oluşturur."""
         
+        # Karma zorlukta dağılım prompt'ta verilir; her soru kendi seviyesini belirtir
+        if difficulty_mix:
+            mix = {level: n for level, n in difficulty_mix.items() if n}
+            difficulty_line = "Karma\n**Zorluk Dağılımı:** " + ", ".join(f"{level}: {n}" for level, n in mix.items())
+            difficulty_rule = "Zorluk dağılımına tam uyulmalı; her sorunun \"zorluk\" alanı kendi seviyesini göstermeli"
+            difficulty_field = "/".join(mix)
+        else:
+            difficulty_line = difficulty.capitalize()
+            difficulty_rule = f"Sorular {difficulty} zorluk seviyesine uygun olmalı"
+            difficulty_field = difficulty
+        
         # Örnek soruları formatla
         sample_questions = context.get('sample_questions', [])
         examples_text = self._format_sample_questions(sample_questions[:5])
@@ -123,7 +309,7 @@ class GeminiClient:
 
 **Kategori:** {category}
 **Alt Kategori:** {subcategory if subcategory else "Genel"}
-**Zorluk:** {difficulty.capitalize()}
+**Zorluk:** {difficulty_line}
 **Üretilecek Soru Sayısı:** {count}
 
 2026 LGS sınavında çıkabilecek {count} adet özgün Türkçe sorusu üret.
@@ -131,7 +317,7 @@ class GeminiClient:
 ## KURALLAR
 1. Sorular LGS formatında 4 seçenekli (A, B, C, D) olmalı
 2. Her sorunun TEK bir doğru cevabı olmalı
-3. Sorular {difficulty} zorluk seviyesine uygun olmalı
+3. {difficulty_rule}
 4. Üretilen sorular özgün olmalı, örnek sorulardan KOPYALANMAMALI
 5. Soru metni yeterli uzunlukta ve anlaşılır olmalı
 6. Şıklar mantıklı ve birbirine yakın güçlükte olmalı
@@ -144,7 +330,7 @@ class GeminiClient:
     "soru_no": 1,
     "kategori": "{category}",
     "alt_baslik": "{subcategory if subcategory else category}",
-    "zorluk": "{difficulty}",
+    "zorluk": "{difficulty_field}",
     "metin": "Soru ile ilgili okuma metni veya paragraf (varsa)",
     "soru": "Soru kökü metni",
     "secenekler": {{
@@ -179,29 +365,69 @@ Lütfen SADECE JSON formatında yanıt ver, başka açıklama ekleme.
         return "\n".join(formatted)
     
     def _parse_generated_questions(self, response_text: str) -> List[Dict]:
-        """Gemini yanıtından soruları parse eder."""
-        try:
-            # JSON bloğunu bul
-            json_match = re.search(r'\[[\s\S]*\]', response_text)
-            if json_match:
-                json_text = json_match.group()
-                questions = json.loads(json_text)
-                return questions
-        except json.JSONDecodeError as e:
-            print(f"JSON parse hatası: {e}")
-        
-        return []
+        """
+        Gemini yanıtından soruları ayrıştırır.
+        Bozuk veya şemaya uymayan sorular atlanıp raporlanır; geçerli olanlar korunur.
+        """
+        questions, invalid = parse_questions(response_text)
+        self.parse_stats['responses'] += 1
+        self.parse_stats['questions'] += len(questions)
+        if not questions:
+            self.parse_stats['failed_responses'] += 1
+        self._report_invalid(invalid)
+        return questions
+    
+    def _report_invalid(self, invalid: List[Dict]):
+        """Geçersiz soruları loglar ve sayar."""
+        for entry in invalid:
+            if entry['index'] is None:
+                label = "Yanıt"
+            else:
+                label = f"{entry['index'] + 1}. soru"
+                self.parse_stats['invalid_questions'] += 1
+            print(f"JSON parse hatası: {label}: {'; '.join(entry['errors'])}")
     
-    def predict_2026_trends(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def predict_2026_trends(self, context: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
         """
         2026 LGS için konu ve soru trendlerini tahmin eder.
+        Prompt korpus istatistikleriyle belirlendiği için yanıt cache'lenir.
         
         Args:
             context: Analiz bağlamı
+            use_cache: False ise cache atlanır ve yanıt yenilenir
             
         Returns:
             Dict: Trend tahminleri
+            
+        Raises:
+            LLMError: Kota, zaman aşımı, erişilemezlik veya upstream hatası
         """
+        prompt = self._build_trends_prompt(context)
+        
+        try:
+            return self._generate(prompt, self._parse_json_object, use_cache)
+        except LLMError:
+            raise
+        except Exception as e:
+            print(f"Trend tahmin hatası: {e}")
+        
+        return {}
+    
+    async def predict_2026_trends_async(self, context: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """predict_2026_trends'in asenkron sürümü."""
+        prompt = self._build_trends_prompt(context)
+        
+        try:
+            return await self._generate_async(prompt, self._parse_json_object, use_cache)
+        except LLMError:
+            raise
+        except Exception as e:
+            print(f"Trend tahmin hatası: {e}")
+        
+        return {}
+    
+    def _build_trends_prompt(self, context: Dict[str, Any]) -> str:
+        """Trend tahmini için prompt oluşturur."""
         prompt = f"""Sen bir LGS eğitim uzmanısın. Geçmiş yılların LGS Türkçe soru analizine dayanarak 2026 LGS için tahminlerde bulun.
 
 ## VERİ ANALİZİ
@@ -236,27 +462,133 @@ Lütfen SADECE JSON formatında yanıt ver, başka açıklama ekleme.
 
 Sadece JSON formatında yanıt ver.
 """
+        return prompt
+    
+    def _parse_json_object(self, response_text: str) -> Dict[str, Any]:
+        """Yanıttaki ilk JSON nesnesini parse eder."""
+        value, error = extract_json(response_text, '{')
+        if error:
+            print(f"JSON parse hatası: {error}")
+        return value if isinstance(value, dict) else {}
+    
+    def analyze_question(self, question_text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Verilen bir soruyu analiz eder.
+        
+        Args:
+            question_text: Analiz edilecek soru metni
+            use_cache: False ise cache atlanır ve yanıt yenilenir
+            
+        Returns:
+            Dict: Analiz sonuçları
+            
+        Raises:
+            LLMError: Kota, zaman aşımı, erişilemezlik veya upstream hatası
+        """
+        prompt = self._build_analysis_prompt(question_text)
         
         try:
-            response = self.model.generate_content(prompt)
-            json_match = re.search(r'\{[\s\S]*\}', response.text)
-            if json_match:
-                return json.loads(json_match.group())
+            return self._generate(prompt, self._parse_json_object, use_cache)
+        except LLMError:
+            raise
         except Exception as e:
-            print(f"Trend tahmin hatası: {e}")
+            print(f"Soru analiz hatası: {e}")
+        
+        return {}
+    
+    async def analyze_question_async(self, question_text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """analyze_question'ın asenkron sürümü."""
+        prompt = self._build_analysis_prompt(question_text)
+        
+        try:
+            return await self._generate_async(prompt, self._parse_json_object, use_cache)
+        except LLMError:
+            raise
+        except Exception as e:
+            print(f"Soru analiz hatası: {e}")
         
         return {}
     
-    def analyze_question(self, question_text: str) -> Dict[str, Any]:
+    def analyze_narrative(
+        self,
+        question_text: str,
+        classification: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
-        Verilen bir soruyu analiz eder.
+        Kategorisi yerelde belirlenmiş soru için sadece anlatı alanlarını üretir
+        (kazanımlar, ipuçları, benzer soru özellikleri).
         
         Args:
             question_text: Analiz edilecek soru metni
+            classification: Yerel sınıflandırma (kategori, alt_kategori, zorluk)
+            use_cache: False ise cache atlanır ve yanıt yenilenir
             
         Returns:
-            Dict: Analiz sonuçları
+            Dict: Anlatı alanları
+            
+        Raises:
+            LLMError: Kota, zaman aşımı, erişilemezlik veya upstream hatası
         """
+        prompt = self._build_narrative_prompt(question_text, classification)
+        
+        try:
+            return self._narrative_fields(self._generate(prompt, self._parse_json_object, use_cache))
+        except LLMError:
+            raise
+        except Exception as e:
+            print(f"Soru analiz hatası: {e}")
+        
+        return {}
+    
+    async def analyze_narrative_async(
+        self,
+        question_text: str,
+        classification: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """analyze_narrative'in asenkron sürümü."""
+        prompt = self._build_narrative_prompt(question_text, classification)
+        
+        try:
+            return self._narrative_fields(await self._generate_async(prompt, self._parse_json_object, use_cache))
+        except LLMError:
+            raise
+        except Exception as e:
+            print(f"Soru analiz hatası: {e}")
+        
+        return {}
+    
+    def _narrative_fields(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: analysis[key] for key in self.NARRATIVE_FIELDS if key in analysis}
+    
+    def _build_narrative_prompt(self, question_text: str, classification: Dict[str, Any]) -> str:
+        """Kategorisi bilinen soru için anlatı alanları prompt'u oluşturur."""
+        prompt = f"""Aşağıdaki LGS Türkçe sorusunu analiz et.
+
+**Kategori:** {classification.get('kategori', '')}
+**Alt Kategori:** {classification.get('alt_kategori', '')}
+**Zorluk:** {classification.get('zorluk', '')}
+
+SORU:
+{question_text}
+
+Aşağıdaki formatta JSON yanıt ver:
+
+```json
+{{
+  "kazanimlar": ["Bu sorunun ölçtüğü kazanımlar"],
+  "ipuclari": ["Soruyu çözmek için ipuçları"],
+  "benzer_soru_ozellikleri": "Bu tip sorularda dikkat edilecekler"
+}}
+```
+
+Sadece JSON formatında yanıt ver.
+"""
+        return prompt
+    
+    def _build_analysis_prompt(self, question_text: str) -> str:
+        """Soru analizi için prompt oluşturur."""
         prompt = f"""Aşağıdaki LGS Türkçe sorusunu analiz et:
 
 SORU:
@@ -277,52 +609,4 @@ Aşağıdaki formatta JSON yanıt ver:
 
 Sadece JSON formatında yanıt ver.
 """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            json_match = re.search(r'\{[\s\S]*\}', response.text)
-            if json_match:
-                return json.loads(json_match.group())
-        except Exception as e:
-            print(f"Soru analiz hatası: {e}")
-        
-        return {}
-    
-    def is_turkish_related(self, text: str) -> bool:
-        """
-        Metnin Türkçe dersiyle ilgili olup olmadığını kontrol eder.
-        
-        Args:
-            text: Kontrol edilecek metin
-            
-        Returns:
-            bool: Türkçe ile ilgiliyse True
-        """
-        # Diğer derslerle ilgili anahtar kelimeler
-        other_subjects = [
-            'matematik', 'denklem', 'geometri', 'sayı', 'işlem',
-            'fen', 'fizik', 'kimya', 'biyoloji', 'deney',
-            'sosyal', 'tarih', 'coğrafya', 'harita',
-            'ingilizce', 'english', 'vocabulary',
-            'din kültürü', 'ahlak'
-        ]
-        
-        text_lower = text.lower()
-        for subject in other_subjects:
-            if subject in text_lower:
-                return False
-        
-        # Türkçe ile ilgili anahtar kelimeler
-        turkish_keywords = [
-            'paragraf', 'cümle', 'sözcük', 'anlam', 'dil bilgisi',
-            'yazım', 'noktalama', 'eş anlam', 'zıt anlam', 'mecaz',
-            'deyim', 'atasözü', 'fiil', 'isim', 'sıfat', 'zarf',
-            'anlatım', 'metin', 'okuma', 'yazar', 'şiir'
-        ]
-        
-        for keyword in turkish_keywords:
-            if keyword in text_lower:
-                return True
-        
-        return True  # Varsayılan olarak Türkçe ile ilgili kabul et
-
+        return prompt
@@ -0,0 +1,196 @@
+"""
+LGS Türkçe Soru Tahminleme - Tahmin Geçmişi Modülü
+Sabit boyutlu bellek içi halka tampon ve sadece ekleme yapılan SQLite deposu
+"""
+
+import json
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+
+class HistoryStore:
+    """
+    Tahminleme sonuçlarının geçmişi.
+    Son `max_entries` kayıt bellekte halka tamponda tutulur (uzun çalışan worker'larda
+    bellek sabit kalır); dosya verilirse tüm kayıtlar zaman, kategori ve zorluk indeksli
+    SQLite tablosuna eklenir ve yeniden başlatmada tampon diskteki son kayıtlarla doldurulur.
+    Sayfalama kayıt numarasına dayalı imleçle yapılır (yeni kayıtlar sayfaları kaydırmaz).
+    """
+
+    def __init__(self, path: Union[str, Path] = None, max_entries: int = 200):
+        """
+        Args:
+            path: SQLite dosya yolu (verilmezse geçmiş sadece bellekte tutulur)
+            max_entries: Bellekte tutulan en fazla kayıt
+        """
+        self.max_entries = max(1, max_entries)
+        self._recent: deque = deque(maxlen=self.max_entries)
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._conn = None
+        self.path = Path(path) if path else None
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            with self._conn:
+                self._conn.execute('PRAGMA journal_mode=WAL')
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS predictions ('
+                    'id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, category TEXT, '
+                    'subcategory TEXT, difficulty TEXT, question_count INTEGER NOT NULL, '
+                    'record TEXT NOT NULL)'
+                )
+                for column in ('timestamp', 'category', 'difficulty'):
+                    self._conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS predictions_{column} ON predictions ({column}, id)'
+                    )
+            rows = self._conn.execute(
+                'SELECT id, record FROM predictions ORDER BY id DESC LIMIT ?', (self.max_entries,)
+            ).fetchall()
+            for entry_id, record in reversed(rows):
+                self._recent.append((entry_id, json.loads(record)))
+            if rows:
+                self._next_id = rows[0][0] + 1
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Kaydı geçmişe ekler.
+
+        Args:
+            record: Tahminleme sonucu ('timestamp' ve 'request' alanlarıyla)
+
+        Returns:
+            int: Kayıt numarası (imleç olarak kullanılır)
+        """
+        request = record.get('request', {})
+        with self._lock:
+            entry_id = self._next_id
+            if self._conn is not None:
+                with self._conn:
+                    entry_id = self._conn.execute(
+                        'INSERT INTO predictions (timestamp, category, subcategory, difficulty, '
+                        'question_count, record) VALUES (?, ?, ?, ?, ?, ?)',
+                        (
+                            record.get('timestamp', ''),
+                            request.get('category'),
+                            request.get('subcategory'),
+                            request.get('difficulty'),
+                            len(record.get('generated_questions', [])),
+                            json.dumps(record, ensure_ascii=False)
+                        )
+                    ).lastrowid
+            self._next_id = entry_id + 1
+            self._recent.append((entry_id, record))
+        return entry_id
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Bellekteki kayıtlar (eskiden yeniye)."""
+        with self._lock:
+            return [record for _, record in self._recent]
+
+    def page(
+        self,
+        cursor: int = None,
+        limit: int = 10,
+        category: str = None,
+        difficulty: str = None,
+        since: str = None,
+        until: str = None
+    ) -> Dict[str, Any]:
+        """
+        Geçmişi yeniden eskiye sayfalar.
+
+        Args:
+            cursor: Önceki sayfanın next_cursor değeri (verilmezse en yeni kayıtlardan başlanır)
+            limit: Sayfadaki en fazla kayıt
+            category: Kategori filtresi
+            difficulty: Zorluk filtresi
+            since: Bu zamandan (ISO 8601, dahil) sonraki kayıtlar
+            until: Bu zamandan (ISO 8601, hariç) önceki kayıtlar
+
+        Returns:
+            Dict: 'items' (kayıt numarasıyla), 'next_cursor' (son sayfada None), 'total' (filtreye uyan)
+        """
+        limit = max(1, limit)
+        filters = {'category': category, 'difficulty': difficulty, 'since': since, 'until': until}
+        if self._conn is not None:
+            entries, total = self._page_sqlite(cursor, limit, filters)
+        else:
+            entries, total = self._page_memory(cursor, limit, filters)
+
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        return {
+            'items': [{'id': entry_id, **record} for entry_id, record in entries],
+            'next_cursor': entries[-1][0] if has_more else None,
+            'total': total
+        }
+
+    def _page_sqlite(self, cursor: Optional[int], limit: int, filters: Dict[str, Any]) -> Tuple[List, int]:
+        clauses, params = [], []
+        for column, operator, key in (
+            ('category', '=', 'category'), ('difficulty', '=', 'difficulty'),
+            ('timestamp', '>=', 'since'), ('timestamp', '<', 'until')
+        ):
+            if filters[key] is not None:
+                clauses.append(f'{column} {operator} ?')
+                params.append(filters[key])
+        where = ' AND '.join(clauses) or '1'
+
+        with self._lock:
+            total = self._conn.execute(f'SELECT COUNT(*) FROM predictions WHERE {where}', params).fetchone()[0]
+            if cursor is not None:
+                where += ' AND id < ?'
+                params.append(cursor)
+            rows = self._conn.execute(
+                f'SELECT id, record FROM predictions WHERE {where} ORDER BY id DESC LIMIT ?',
+                params + [limit + 1]
+            ).fetchall()
+        return [(entry_id, json.loads(record)) for entry_id, record in rows], total
+
+    def _page_memory(self, cursor: Optional[int], limit: int, filters: Dict[str, Any]) -> Tuple[List, int]:
+        def matches(record: Dict[str, Any]) -> bool:
+            request = record.get('request', {})
+            timestamp = record.get('timestamp', '')
+            return (
+                (filters['category'] is None or request.get('category') == filters['category'])
+                and (filters['difficulty'] is None or request.get('difficulty') == filters['difficulty'])
+                and (filters['since'] is None or timestamp >= filters['since'])
+                and (filters['until'] is None or timestamp < filters['until'])
+            )
+
+        with self._lock:
+            matching = [(entry_id, record) for entry_id, record in reversed(self._recent) if matches(record)]
+        entries = [entry for entry in matching if cursor is None or entry[0] < cursor]
+        return entries[:limit + 1], len(matching)
+
+    def __len__(self) -> int:
+        if self._conn is not None:
+            with self._lock:
+                return self._conn.execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+        return len(self._recent)
+
+    def clear(self):
+        """Bellekteki ve diskteki tüm kayıtları siler."""
+        with self._lock:
+            self._recent.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute('DELETE FROM predictions')
+
+    def stats(self) -> Dict[str, Any]:
+        """Bellek ve disk kayıt sayıları."""
+        return {
+            'persistent': self.persistent,
+            'in_memory': len(self._recent),
+            'max_in_memory': self.max_entries,
+            'total': len(self)
+        }
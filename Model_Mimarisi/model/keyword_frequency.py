@@ -0,0 +1,116 @@
+"""
+LGS Türkçe Soru Tahminleme - Anahtar Kelime Frekans Modülü
+Artımlı güncellenen frekans tablosu ve heap tabanlı top-N sorguları
+"""
+
+import heapq
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Dict, List, Any
+
+import numpy as np
+
+from .columnar_stats import ColumnarStats
+from .corpus_index import extract_year
+
+
+class KeywordFrequency:
+    """
+    Anahtar kelime frekanslarını toplamda, kategori ve yıl bazında tutar.
+    Bir kez kurulur, yeni satırlar eklendikçe artımlı güncellenir;
+    her top_n sorgusu O(n log k) sürede heap ile cevaplanır.
+    """
+
+    SCOPES = ('category', 'year')
+
+    def __init__(self):
+        self.total: Counter = Counter()
+        self.by_scope: Dict[str, Dict[str, Counter]] = {
+            scope: defaultdict(Counter) for scope in self.SCOPES
+        }
+        self.size = 0
+
+    @classmethod
+    def from_stats(cls, stats: ColumnarStats) -> 'KeywordFrequency':
+        """
+        Sütunsal kodlardan vektörel olarak kurar.
+
+        Args:
+            stats: Yüklü korpusun ColumnarStats nesnesi
+
+        Returns:
+            KeywordFrequency
+        """
+        frequency = cls()
+        counts, keywords = stats.keyword_counts()
+        frequency.total = Counter({
+            keywords[code]: int(counts[code]) for code in np.flatnonzero(counts)
+        })
+
+        for scope in cls.SCOPES:
+            matrix, values, keywords = stats.keyword_crosstab(scope)
+            scope_counters = frequency.by_scope[scope]
+            for row, value in enumerate(values):
+                nonzero = np.flatnonzero(matrix[row])
+                if len(nonzero):
+                    scope_counters[value] = Counter({
+                        keywords[code]: int(matrix[row, code]) for code in nonzero
+                    })
+
+        frequency.size = stats.size
+        return frequency
+
+    def add_rows(self, data: Dict[str, List[Any]], start: int = None):
+        """
+        Yeni satırların anahtar kelimelerini sayaçlara ekler.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+            start: İlk yeni satır (varsayılan: sayılmış son satırdan sonrası)
+        """
+        if start is None:
+            start = self.size
+
+        ticket_ids = data.get('Ticket_ID', [])
+        categories = data.get('Kategori', [])
+        keywords = data.get('Keywords', [])
+
+        for row in range(start, len(ticket_ids)):
+            kw_list = keywords[row] if row < len(keywords) else None
+            if not isinstance(kw_list, list):
+                continue
+            self.total.update(kw_list)
+            self.by_scope['category'][categories[row]].update(kw_list)
+            self.by_scope['year'][extract_year(ticket_ids[row])].update(kw_list)
+
+        self.size = max(self.size, len(ticket_ids))
+
+    def top(self, top_n: int = 50, category: str = None, year: str = None) -> List[tuple]:
+        """
+        En sık anahtar kelimeleri döndürür.
+
+        Args:
+            top_n: Döndürülecek kelime sayısı
+            category: Opsiyonel kategori filtresi
+            year: Opsiyonel yıl filtresi (category ile birlikte verilemez)
+
+        Returns:
+            List: (kelime, frekans) tuple listesi
+        """
+        if category is not None and year is not None:
+            raise ValueError("Kategori ve yıl birlikte verilemez; satır bazlı sayım kullanın")
+
+        if category is not None:
+            counter = self.by_scope['category'].get(category, Counter())
+        elif year is not None:
+            counter = self.by_scope['year'].get(year, Counter())
+        else:
+            counter = self.total
+
+        return self.top_of(counter, top_n)
+
+    @staticmethod
+    def top_of(counter: Counter, top_n: int) -> List[tuple]:
+        """Bir sayaçtaki en büyük top_n değeri heap ile seçer."""
+        # nlargest eşitlikte ilk ekleneni korur (Counter.most_common ile aynı sıra)
+        return heapq.nlargest(top_n, counter.items(), key=itemgetter(1))
@@ -0,0 +1,185 @@
+"""
+LGS Türkçe Soru Tahminleme - LLM Sağlayıcı Arayüzü
+Prompt'u yanıt metnine çeviren arka uçlar (Gemini veya yerel yedek)
+"""
+
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+import config
+
+
+class LLMProvider:
+    """
+    LLM arka ucu arayüzü: prompt -> yanıt metni.
+    Prompt oluşturma, ayrıştırma, cache ve dayanıklılık GeminiClient'ta kalır;
+    sağlayıcı sadece çağrıyı yapar. Hatalar SDK hatası veya tipli LLMError olarak yükselir.
+    """
+
+    name = 'base'
+
+    def __init__(self, model_name: str, generation_config: Dict[str, Any] = None):
+        """
+        Args:
+            model_name: Model adı (cache anahtarına girer)
+            generation_config: Üretim ayarları (cache anahtarına girer)
+        """
+        self.model_name = model_name
+        self.generation_config = generation_config or {}
+
+    def bind_corpus(self, data: Dict[str, List[Any]]):
+        """Korpusa ihtiyaç duyan sağlayıcılar için sütun verisini bağlar (varsayılan: yok sayılır)."""
+
+    def bind_limiter(self, limiter):
+        """
+        Tek çağrıda birden fazla istek gönderen sağlayıcılar (ör. hedge/yedek model) için
+        dayanıklılık katmanının hız sınırlayıcısını bağlar (varsayılan: yok sayılır).
+        """
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """
+        Prompt'u gönderir ve yanıt metnini döndürür.
+
+        Args:
+            prompt: Prompt metni
+            timeout: Çağrı zaman aşımı (saniye)
+
+        Returns:
+            str: Yanıt metni
+        """
+        raise NotImplementedError
+
+    async def generate_async(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """generate'in asenkron sürümü."""
+        raise NotImplementedError
+
+    async def stream_async(self, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Akışı başlatır; yanıt metnini parça parça veren async iterator döndürür.
+        Akışın açılması (ilk yanıt) await edilir, parçalar iterator'dan okunur.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Sağlayıcıya özel istatistikler (varsayılan: yok)."""
+        return {}
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini API arka ucu."""
+
+    name = 'gemini'
+
+    def __init__(self, api_key: str, model_name: str = None):
+        """
+        Args:
+            api_key: Gemini API anahtarı
+            model_name: Kullanılacak model adı (varsayılan: config.GEMINI_MODELS'in ilki)
+        """
+        model_name = model_name or config.GEMINI_MODELS[0]
+        # Yerel sağlayıcıyla çalışırken SDK yüklenmez
+        import google.generativeai as genai
+
+        # Model yapılandırması
+        generation_config = {
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 8192,
+        }
+        super().__init__(model_name, generation_config)
+
+        # Güvenlik ayarları (eğitim içeriği için uygun)
+        safety_settings = [
+            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+            {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+            {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+        ]
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(
+            model_name=model_name,
+            generation_config=generation_config,
+            safety_settings=safety_settings
+        )
+
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Dict[str, Any]:
+        return {"timeout": timeout} if timeout else {}
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        return self.model.generate_content(
+            prompt, request_options=self._request_options(timeout)
+        ).text
+
+    async def generate_async(self, prompt: str, timeout: Optional[float] = None) -> str:
+        response = await self.model.generate_content_async(
+            prompt, request_options=self._request_options(timeout)
+        )
+        return response.text
+
+    async def stream_async(self, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(
+            prompt, stream=True, request_options=self._request_options(timeout)
+        )
+        return self._texts(response)
+
+    @staticmethod
+    async def _texts(response) -> AsyncIterator[str]:
+        async for chunk in response:
+            try:
+                yield chunk.text
+            except ValueError:
+                # Metin içermeyen parça (ör. sadece bitiş bilgisi)
+                continue
+
+
+def create_llm_provider(
+    provider: str = 'gemini',
+    api_key: str = None,
+    model_name: str = None,
+    latency: float = 0.2,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    fallback_models: List[str] = None,
+    hedge_delay: float = 2.0,
+    attempt_timeout: float = 20.0
+) -> LLMProvider:
+    """
+    Ayar değerlerinden LLM sağlayıcısı oluşturur.
+
+    Args:
+        provider: 'gemini' veya 'local'
+        api_key: Gemini API anahtarı (gemini için)
+        model_name: Birincil Gemini modeli (varsayılan: config.GEMINI_MODELS'in ilki)
+        latency: Yerel sağlayıcının ortalama simüle gecikmesi (saniye)
+        error_rate: Yerel sağlayıcının simüle hata oranı (0-1)
+        seed: Yerel sağlayıcının seed'i
+        fallback_models: Birincil modelden sonra sırayla denenecek Gemini modelleri
+                         (varsayılan: config.GEMINI_MODELS'in kalanı; [] ile tek model)
+        hedge_delay: Hedged istek için başlangıç bekleme süresi (saniye)
+        attempt_timeout: Yedek modele geçmeden önce tek model için zaman aşımı (saniye)
+
+    Returns:
+        LLMProvider: Sağlayıcı (birden fazla model verildiyse ModelRouter)
+    """
+    provider = (provider or 'gemini').lower()
+    if provider == 'gemini':
+        if not api_key:
+            raise ValueError("Gemini sağlayıcısı için API anahtarı gerekli.")
+        model_name = model_name or config.GEMINI_MODELS[0]
+        if fallback_models is None:
+            fallback_models = config.GEMINI_MODELS[1:]
+        models = [model_name] + [m for m in fallback_models if m != model_name]
+        if len(models) == 1:
+            return GeminiProvider(api_key, model_name)
+        from .model_router import ModelRouter
+        return ModelRouter(
+            [GeminiProvider(api_key, model) for model in models],
+            hedge_delay=hedge_delay,
+            attempt_timeout=attempt_timeout
+        )
+    if provider == 'local':
+        from .local_provider import LocalStandInProvider
+        return LocalStandInProvider(latency=latency, error_rate=error_rate, seed=seed)
+    raise ValueError(f"Bilinmeyen LLM sağlayıcısı: {provider}")
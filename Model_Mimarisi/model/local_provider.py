@@ -0,0 +1,287 @@
+"""
+LGS Türkçe Soru Tahminleme - Yerel Yedek LLM Sağlayıcısı
+Ağ ve kota gerektirmeden korpus şablonlarından iyi biçimli yanıtlar üreten sağlayıcı
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from .exceptions import LLMRateLimitError, LLMResponseError, LLMUnavailableError
+from .llm_provider import LLMProvider
+
+
+# GeminiClient prompt'larındaki alanlar
+_COUNT_RE = re.compile(r'\*\*Üretilecek Soru Sayısı:\*\* (\d+)')
+_CATEGORY_RE = re.compile(r'\*\*Kategori:\*\* (.+)')
+_SUBCATEGORY_RE = re.compile(r'\*\*Alt Kategori:\*\* (.+)')
+_DIFFICULTY_RE = re.compile(r'\*\*Zorluk:\*\* (\w+)')
+_DIFFICULTY_MIX_RE = re.compile(r'\*\*Zorluk Dağılımı:\*\* (.+)')
+_MIX_ITEM_RE = re.compile(r'(\w+): (\d+)')
+_ANALYSIS_RE = re.compile(r'SORU:\n([\s\S]*?)\n\nAşağıdaki formatta')
+_SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+')
+_WORD_RE = re.compile(r'\w+')
+
+DEFAULT_STEM = "Bu metinden aşağıdaki yargıların hangisine ulaşılabilir?"
+
+
+class LocalStandInProvider(LLMProvider):
+    """
+    Yerel yedek sağlayıcı.
+    Korpustaki metin cümleleri, soru kökleri ve cevap kalıplarından soru, trend ve
+    analiz yanıtları üretir; gecikme ve hata oranı simüle edilir. Aynı seed ve aynı
+    çağrı sırasıyla aynı yanıtlar döner. Yük testi, benchmark ve API'yi çevrimdışı
+    (CI) çalıştırmak içindir; üretilen sorular içerik olarak anlamlı değildir.
+    """
+
+    name = 'local'
+
+    # Zorluğa göre metindeki cümle sayısı
+    DIFFICULTY_SENTENCES = {'kolay': 2, 'orta': 3, 'zor': 4}
+
+    def __init__(
+        self,
+        corpus: Dict[str, List[Any]] = None,
+        latency: float = 0.2,
+        jitter: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        stream_chunk_size: int = 120,
+        seed: int = 0
+    ):
+        """
+        Args:
+            corpus: Korpus sütunları (verilmezse bind_corpus ile bağlanır)
+            latency: Ortalama yanıt süresi (saniye)
+            jitter: Gecikmenin ± oransal sapması (0.5 -> latency * [0.5, 1.5])
+            error_rate: Simüle 503 hatası oranı (0-1)
+            rate_limit_rate: Simüle 429 hatası oranı (0-1)
+            stream_chunk_size: Akışta parça başına karakter
+            seed: Yanıt, gecikme ve hata üretimi için seed
+        """
+        super().__init__('local-stand-in', {'seed': seed})
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.stream_chunk_size = max(1, stream_chunk_size)
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._prompt_calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'simulated_errors': 0}
+        self._data: Dict[str, List[Any]] = {}
+        self._rows: Dict[str, List[int]] = {}
+        self._sentences: Dict[int, List[str]] = {}
+        if corpus is not None:
+            self.bind_corpus(corpus)
+
+    def bind_corpus(self, data: Dict[str, List[Any]]):
+        """Kategori -> satır ve satır -> cümle tablolarını kurar."""
+        self._data = data or {}
+        self._rows = {}
+        self._sentences = {}
+        categories = self._data.get('Kategori', [])
+        texts = self._data.get('Metinler', [])
+
+        for row, category in enumerate(categories):
+            self._rows.setdefault(category or '', []).append(row)
+            text = texts[row] if row < len(texts) else None
+            sentences = [
+                sentence.strip() for sentence in _SENTENCE_RE.split(text or '')
+                if 5 <= len(sentence.split()) <= 40
+            ]
+            if sentences:
+                self._sentences[row] = sentences
+
+    # ==================== SİMÜLASYON ====================
+
+    def _draw(self) -> tuple:
+        """Bu çağrının gecikmesini ve simüle hatasını belirler."""
+        with self._lock:
+            self._stats['calls'] += 1
+            delay = max(0.0, self.latency * (1 + self.jitter * (2 * self._rng.random() - 1)))
+            roll = self._rng.random()
+
+        error = None
+        if roll < self.error_rate:
+            error = LLMUnavailableError("Yerel sağlayıcı: simüle edilmiş upstream hatası.")
+        elif roll < self.error_rate + self.rate_limit_rate:
+            error = LLMRateLimitError("Yerel sağlayıcı: simüle edilmiş kota aşımı.", retry_after=1.0)
+        if error is not None:
+            self._stats['simulated_errors'] += 1
+        return delay, error
+
+    def _prompt_rng(self, prompt: str) -> random.Random:
+        """Prompt'a ve aynı prompt'un kaçıncı kez istendiğine bağlı deterministik RNG."""
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+        with self._lock:
+            occurrence = self._prompt_calls[digest]
+            self._prompt_calls[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        delay, error = self._draw()
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return self._respond(prompt)
+
+    async def generate_async(self, prompt: str, timeout: Optional[float] = None) -> str:
+        delay, error = self._draw()
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return self._respond(prompt)
+
+    async def stream_async(self, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        delay, error = self._draw()
+        # İlk parçaya kadar geçen süre toplam gecikmenin bir kısmıdır
+        await asyncio.sleep(delay * 0.3)
+        if error is not None:
+            raise error
+        return self._chunks(self._respond(prompt), delay * 0.7)
+
+    async def _chunks(self, text: str, duration: float) -> AsyncIterator[str]:
+        size = self.stream_chunk_size
+        parts = [text[i:i + size] for i in range(0, len(text), size)]
+        for part in parts:
+            await asyncio.sleep(duration / len(parts))
+            yield part
+
+    def stats(self) -> Dict[str, Any]:
+        """Çağrı ve simüle hata sayıları."""
+        return dict(self._stats)
+
+    # ==================== YANIT ÜRETİMİ ====================
+
+    def _respond(self, prompt: str) -> str:
+        """Prompt tipine göre (soru üretimi, trend, analiz) JSON yanıtı üretir."""
+        rng = self._prompt_rng(prompt)
+
+        count = _COUNT_RE.search(prompt)
+        if count:
+            category = self._field(_CATEGORY_RE, prompt)
+            subcategory = self._field(_SUBCATEGORY_RE, prompt)
+            difficulty = (self._field(_DIFFICULTY_RE, prompt) or 'orta').lower()
+            # Karma zorlukta her soru dağılımdaki sırasıyla kendi seviyesini alır
+            mix = self._field(_DIFFICULTY_MIX_RE, prompt)
+            difficulties = [
+                level for level, n in _MIX_ITEM_RE.findall(mix or '') for _ in range(int(n))
+            ] or [difficulty]
+            n = int(count.group(1))
+            questions = self._questions(
+                rng, category, None if subcategory == 'Genel' else subcategory,
+                [difficulties[i % len(difficulties)] for i in range(n)]
+            )
+            return "```json\n" + json.dumps(questions, ensure_ascii=False, indent=2) + "\n```"
+
+        if '"oncelikli_konular"' in prompt:
+            return json.dumps(self._trends(), ensure_ascii=False, indent=2)
+
+        question = _ANALYSIS_RE.search(prompt)
+        if question:
+            return json.dumps(self._analysis(question.group(1)), ensure_ascii=False, indent=2)
+
+        return "{}"
+
+    @staticmethod
+    def _field(pattern: re.Pattern, prompt: str) -> Optional[str]:
+        match = pattern.search(prompt)
+        return match.group(1).strip() if match else None
+
+    def _column(self, name: str, row: int) -> str:
+        values = self._data.get(name, [])
+        return (values[row] if row < len(values) else None) or ''
+
+    def _questions(
+        self,
+        rng: random.Random,
+        category: Optional[str],
+        subcategory: Optional[str],
+        difficulties: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Korpus cümlelerini karıştırarak A-D seçenekli sorular üretir (soru başına bir zorluk)."""
+        all_rows = sorted(self._sentences)
+        if len(all_rows) < 4:
+            raise LLMResponseError("Yerel sağlayıcıya yeterli korpus bağlanmamış.")
+
+        rows = [row for row in self._rows.get(category or '', []) if row in self._sentences] or all_rows
+        questions = []
+
+        for number, difficulty in enumerate(difficulties, 1):
+            n_sentences = self.DIFFICULTY_SENTENCES.get(difficulty, 3)
+            # Metin farklı sorulardan cümlelerle kurulur: hiçbir korpus sorusunun kopyası olmaz
+            sources = rng.sample(rows, min(n_sentences, len(rows)))
+            sentences = [rng.choice(self._sentences[row]) for row in sources]
+            stem_row = rng.choice(rows)
+
+            answer = rng.choice('ABCD')
+            others = rng.sample([row for row in all_rows if row not in sources], 3)
+            distractors = iter(rng.choice(self._sentences[row]) for row in others)
+            options = {
+                letter: rng.choice(sentences) if letter == answer else next(distractors)
+                for letter in 'ABCD'
+            }
+
+            questions.append({
+                "soru_no": number,
+                "kategori": category or self._column('Kategori', stem_row),
+                "alt_baslik": subcategory or self._column('Alt Başlık', stem_row),
+                "zorluk": difficulty,
+                "metin": " ".join(sentences),
+                "soru": self._column('Soru Kökleri', stem_row).strip() or DEFAULT_STEM,
+                "secenekler": options,
+                "dogru_cevap": answer,
+                "aciklama": f"Doğru cevap {answer} şıkkıdır. Bu yargı metinde doğrudan yer almaktadır; "
+                            f"diğer seçenekler metinle ilgili değildir."
+            })
+
+        return questions
+
+    def _trends(self) -> Dict[str, Any]:
+        """Korpus dağılımından trend tahmini üretir."""
+        categories = Counter(c for c in self._data.get('Kategori', []) if c)
+        subcategories = Counter(s for s in self._data.get('Alt Başlık', []) if s)
+        keywords = Counter(
+            keyword for row in self._data.get('Keywords', []) or [] for keyword in (row or [])
+        )
+        total = sum(categories.values()) or 1
+
+        return {
+            "oncelikli_konular": [name for name, _ in subcategories.most_common(5)],
+            "soru_dagilimi_tahmini": {
+                name: str(round(20 * n / total)) for name, n in categories.most_common()
+            },
+            "dikkat_edilmesi_gerekenler": [
+                f"'{keyword}' içeren sorular sık çıkıyor" for keyword, _ in keywords.most_common(3)
+            ],
+            "yeni_trend_tahminleri": ["Görsel ve grafik destekli paragraf soruları"],
+            "onerilen_calisma_stratejisi": "En sık çıkan konulardan başlayarak geçmiş soruları çözün."
+        }
+
+    def _analysis(self, question_text: str) -> Dict[str, Any]:
+        """Sözcük örtüşmesi en yüksek korpus sorusunun kategorisini döndürür."""
+        words = set(_WORD_RE.findall(question_text.lower()))
+        best_row, best_score = None, -1
+        for row in range(len(self._data.get('Kategori', []))):
+            reference = f"{self._column('Soru Kökleri', row)} {' '.join(self._column('Keywords', row) or [])}"
+            score = len(words & set(_WORD_RE.findall(reference.lower())))
+            if score > best_score:
+                best_row, best_score = row, score
+
+        length = len(question_text)
+        return {
+            "kategori": self._column('Kategori', best_row) if best_row is not None else "Paragrafta Anlam",
+            "alt_kategori": self._column('Alt Başlık', best_row) if best_row is not None else "",
+            "zorluk": "kolay" if length < 300 else "orta" if length < 700 else "zor",
+            "kazanimlar": ["Okuduğunu anlama ve yorumlama"],
+            "ipuclari": ["Soru kökündeki olumsuzluk ifadelerine dikkat edin"],
+            "benzer_soru_ozellikleri": "Metindeki ana düşünceyi ve yardımcı düşünceleri ayırt edin."
+        }
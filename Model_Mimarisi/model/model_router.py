@@ -0,0 +1,280 @@
+"""
+LGS Türkçe Soru Tahminleme - Model Yönlendirme Modülü
+Sıralı model listesi üzerinde hedged istek, yedek modele geçiş ve model bazlı gecikme takibi
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
+
+from .exceptions import LLMResponseError
+from .llm_provider import LLMProvider
+from .resilience import RateLimiter, estimate_tokens
+from .response_parser import array_start, extract_json
+
+
+def has_json(text: str) -> bool:
+    """Yanıtta ayrıştırılabilir bir JSON nesnesi veya nesne dizisi var mı (varsayılan doğrulayıcı)."""
+    if not text:
+        return False
+    starts = [(i, opener) for i, opener in ((array_start(text), '['), (text.find('{'), '{')) if i != -1]
+    if not starts:
+        return False
+    return extract_json(text, min(starts)[1])[0] is not None
+
+
+class LatencyTracker:
+    """
+    Son çağrıların sürelerinden yüzdelik hesaplayan kayan pencere.
+    İptal edilen veya zaman aşımına uğrayan denemeler geçen süreyle (alt sınır) kaydedilir.
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window: Tutulan en fazla ölçüm
+        """
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Args:
+            q: Yüzdelik (0-1)
+
+        Returns:
+            float veya None (ölçüm yoksa)
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ModelRouter(LLMProvider):
+    """
+    Sıralı model listesine yönlendiren sağlayıcı.
+    İlk model yanıtı gecikirse (model bazlı yüzdelik gecikmeye uyarlanan süre sonra)
+    ikinci bir istek gönderilir ve ilk geçerli yanıt alınır (hedged request).
+    Hata, zaman aşımı veya geçersiz yanıtta sıradaki (daha ucuz/hızlı) modele geçilir.
+    İlk deneme dışındaki her deneme hız sınırlayıcıdan ayrıca kota alır; hedge için kota
+    hemen uygun değilse hedge atlanır.
+    """
+
+    name = 'router'
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedge_delay: float = 2.0,
+        hedge_percentile: float = 0.95,
+        min_hedge_delay: float = 0.2,
+        max_hedge_delay: float = 10.0,
+        attempt_timeout: float = 20.0,
+        min_samples: int = 20,
+        validator: Callable[[str], bool] = has_json
+    ):
+        """
+        Args:
+            providers: Öncelik sırasıyla model sağlayıcıları (ilki birincil model)
+            hedge_delay: Yeterli ölçüm yokken ikinci istekten önce beklenen süre (saniye)
+            hedge_percentile: Bekleme süresinin uyarlandığı gecikme yüzdeliği
+            min_hedge_delay: Uyarlanan bekleme alt sınırı (saniye)
+            max_hedge_delay: Uyarlanan bekleme üst sınırı (saniye)
+            attempt_timeout: Tek model çağrısı zaman aşımı; aşılınca sıradaki modele geçilir
+            min_samples: Bekleme süresini uyarlamak için gereken en az ölçüm
+            validator: Yanıtın kabul edilip edilmeyeceğine karar veren fonksiyon
+        """
+        if not providers:
+            raise ValueError("En az bir model sağlayıcısı gerekli.")
+        primary = providers[0]
+        # Cache anahtarı yanıtı hangi modelin verdiğinden bağımsızdır
+        super().__init__(primary.model_name, primary.generation_config)
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.attempt_timeout = attempt_timeout
+        self.min_samples = min_samples
+        self.validator = validator
+        self.latency = [LatencyTracker() for _ in providers]
+        self._model_stats = [
+            {'requests': 0, 'successes': 0, 'errors': 0, 'invalid': 0, 'wins': 0} for _ in providers
+        ]
+        self._stats = {'calls': 0, 'hedges': 0, 'hedge_wins': 0, 'hedges_skipped': 0, 'fallbacks': 0}
+        self.limiter: Optional[RateLimiter] = None
+
+    def bind_limiter(self, limiter: RateLimiter):
+        self.limiter = limiter
+
+    def bind_corpus(self, data: Dict[str, List[Any]]):
+        for provider in self.providers:
+            provider.bind_corpus(data)
+
+    def current_hedge_delay(self, index: int = 0) -> float:
+        """Modelin gözlenen gecikme yüzdeliğine göre hedge bekleme süresi."""
+        tracker = self.latency[index]
+        if len(tracker) < self.min_samples:
+            return self.hedge_delay
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, tracker.percentile(self.hedge_percentile)))
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return min(timeout, self.attempt_timeout) if timeout else self.attempt_timeout
+
+    async def _attempt(self, index: int, prompt: str, timeout: float) -> str:
+        """Tek modeli çağırır; süreyi ve sonucu model istatistiklerine işler."""
+        stats = self._model_stats[index]
+        stats['requests'] += 1
+        started = time.monotonic()
+        try:
+            text = await asyncio.wait_for(
+                self.providers[index].generate_async(prompt, timeout=timeout), timeout
+            )
+        except asyncio.CancelledError:
+            # Hedge yarışını kaybeden deneme en az bu kadar sürdü; alt sınır olarak kaydedilir
+            # (yoksa yavaş denemeler yüzdeliğe girmez ve hedge süresi giderek kısalır)
+            self.latency[index].record(time.monotonic() - started)
+            raise
+        except asyncio.TimeoutError:
+            self.latency[index].record(time.monotonic() - started)
+            stats['errors'] += 1
+            raise
+        except Exception:
+            stats['errors'] += 1
+            raise
+        self.latency[index].record(time.monotonic() - started)
+        if not self.validator(text):
+            stats['invalid'] += 1
+            raise LLMResponseError(f"{self.providers[index].model_name} geçersiz yanıt döndürdü.")
+        stats['successes'] += 1
+        return text
+
+    def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Senkron çağrı: hedge yapılmaz, hata veya geçersiz yanıtta sıradaki modele geçilir."""
+        self._stats['calls'] += 1
+        last_error: Optional[BaseException] = None
+        for index, provider in enumerate(self.providers):
+            if index:
+                self._stats['fallbacks'] += 1
+                if self.limiter is not None:
+                    self.limiter.acquire_sync(estimate_tokens(prompt))
+            stats = self._model_stats[index]
+            stats['requests'] += 1
+            started = time.monotonic()
+            try:
+                text = provider.generate(prompt, timeout=self._timeout(timeout))
+            except Exception as e:
+                stats['errors'] += 1
+                last_error = e
+                continue
+            self.latency[index].record(time.monotonic() - started)
+            if self.validator(text):
+                stats['successes'] += 1
+                stats['wins'] += 1
+                return text
+            stats['invalid'] += 1
+            last_error = LLMResponseError(f"{provider.model_name} geçersiz yanıt döndürdü.")
+        raise last_error
+
+    async def generate_async(self, prompt: str, timeout: Optional[float] = None) -> str:
+        self._stats['calls'] += 1
+        timeout = self._timeout(timeout)
+        tokens = estimate_tokens(prompt)
+        untried = list(range(len(self.providers)))
+        tasks: Dict[asyncio.Future, int] = {}
+        hedge = None
+        can_hedge = True
+        last_error: Optional[BaseException] = None
+
+        def launch(index: int) -> asyncio.Future:
+            task = asyncio.ensure_future(self._attempt(index, prompt, timeout))
+            tasks[task] = index
+            return task
+
+        current = untried.pop(0)
+        launch(current)
+        try:
+            while tasks:
+                # Tek istek süredeyken hedge zamanlayıcısı çalışır (istek başına bir hedge)
+                delay = self.current_hedge_delay(current) if can_hedge and len(tasks) == 1 else None
+                done, _ = await asyncio.wait(tasks, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    can_hedge = False
+                    if self.limiter is not None and not self.limiter.try_acquire(tokens):
+                        # Hedge kotayı beklemeye değmez; ilk deneme sürer
+                        self._stats['hedges_skipped'] += 1
+                        continue
+                    self._stats['hedges'] += 1
+                    # Hedge sıradaki modele gider; model kalmadıysa aynı model tekrar çağrılır
+                    hedge = launch(untried.pop(0) if untried else current)
+                    continue
+
+                for task in done:
+                    index = tasks.pop(task)
+                    try:
+                        text = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    self._model_stats[index]['wins'] += 1
+                    if task is hedge:
+                        self._stats['hedge_wins'] += 1
+                    return text
+
+                # Süren istek kalmadıysa sıradaki modele geçilir
+                if not tasks and untried:
+                    self._stats['fallbacks'] += 1
+                    if self.limiter is not None:
+                        await self.limiter.acquire(tokens)
+                    current = untried.pop(0)
+                    launch(current)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        raise last_error
+
+    async def stream_async(self, prompt: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Akış açılışında hata veya zaman aşımı olursa sıradaki modele geçilir (hedge yapılmaz)."""
+        self._stats['calls'] += 1
+        timeout = self._timeout(timeout)
+        last_error: Optional[BaseException] = None
+        for index, provider in enumerate(self.providers):
+            if index:
+                self._stats['fallbacks'] += 1
+                if self.limiter is not None:
+                    await self.limiter.acquire(estimate_tokens(prompt))
+            stats = self._model_stats[index]
+            stats['requests'] += 1
+            try:
+                stream = await asyncio.wait_for(provider.stream_async(prompt, timeout=timeout), timeout)
+            except Exception as e:
+                stats['errors'] += 1
+                last_error = e
+                continue
+            stats['successes'] += 1
+            stats['wins'] += 1
+            return stream
+        raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        """Yönlendirme istatistikleri ve model bazlı gecikme yüzdelikleri."""
+        models = {}
+        for index, provider in enumerate(self.providers):
+            tracker = self.latency[index]
+            p50, p95 = tracker.percentile(0.5), tracker.percentile(0.95)
+            models[provider.model_name] = {
+                **self._model_stats[index],
+                'p50_seconds': round(p50, 3) if p50 is not None else None,
+                'p95_seconds': round(p95, 3) if p95 is not None else None,
+                'hedge_delay_seconds': round(self.current_hedge_delay(index), 3)
+            }
+        return {**self._stats, 'models': models}
@@ -0,0 +1,161 @@
+"""
+LGS Türkçe Soru Tahminleme - Soru Kalıbı Eşleştirme Modülü
+Derlenmiş tek regex ile tek geçişte çoklu kalıp arama
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Iterable, Union
+
+
+# Varsayılan soru kökü kalıpları
+# Kalıp adı -> alternatifler; bir alternatif tek terim veya birlikte geçmesi gereken terimler (tuple)
+DEFAULT_QUESTION_PATTERNS = {
+    'hangisi': ['hangisi'],
+    'aşağıdakilerden': ['aşağıdaki'],
+    'çıkarılabilir': ['çıkarılabilir', 'ulaşılır'],
+    'çıkarılamaz': ['çıkarılamaz', 'ulaşılamaz'],
+    'anlam': ['anlam'],
+    'düşünce': ['düşünce'],
+    'yargı': ['yargı'],
+    'tamamlama': ['tamamla'],
+    'sıralama': ['sırala'],
+    'boşluk_doldurma': [('boş', 'yer')]
+}
+
+
+class PatternMatchResult:
+    """
+    Kalıp eşleştirme sonucu.
+    Her satır için bir bit vektörü (bit i = names[i] kalıbı) ve toplamlar tutulur.
+    """
+
+    def __init__(self, names: List[str], vectors: List[int]):
+        self.names = names
+        self.vectors = vectors
+        self.totals = self.count_rows(range(len(vectors)))
+
+    def count_rows(self, rows: Iterable[int]) -> Dict[str, int]:
+        """
+        Verilen satırlarda her kalıbın kaç kez geçtiğini sayar.
+
+        Args:
+            rows: Satır numaraları (ör. indeksten bir yıl/kategori listesi)
+
+        Returns:
+            Dict: Kalıp adı -> satır sayısı
+        """
+        counts = [0] * len(self.names)
+        for row in rows:
+            mask = self.vectors[row]
+            bit = 0
+            while mask:
+                if mask & 1:
+                    counts[bit] += 1
+                mask >>= 1
+                bit += 1
+        return dict(zip(self.names, counts))
+
+    def rows_with(self, name: str) -> List[int]:
+        """Belirli bir kalıbı içeren satırları döndürür."""
+        bit = 1 << self.names.index(name)
+        return [row for row, mask in enumerate(self.vectors) if mask & bit]
+
+    def patterns_of(self, row: int) -> List[str]:
+        """Bir satırda geçen kalıp adlarını döndürür."""
+        mask = self.vectors[row]
+        return [name for i, name in enumerate(self.names) if mask >> i & 1]
+
+
+class PatternMatcher:
+    """
+    Yapılandırılabilir kalıp seti için tek seferde derlenen eşleştirici.
+    Tüm terimler tek bir alternation regex'inde birleştirilir ve her metin tek geçişte taranır.
+    """
+
+    def __init__(self, patterns: Dict[str, List[Union[str, tuple]]] = None):
+        """
+        Args:
+            patterns: Kalıp adı -> alternatif listesi (varsayılan: DEFAULT_QUESTION_PATTERNS)
+        """
+        patterns = patterns or DEFAULT_QUESTION_PATTERNS
+        self.names = list(patterns)
+        # Kalıp setinin özeti (önceden hesaplanmış kalıp analizinin geçerliliği için)
+        canonical = [[name, [list(self._terms(alt)) for alt in patterns[name]]] for name in self.names]
+        self.fingerprint = hashlib.sha1(
+            json.dumps(canonical, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()[:16]
+
+        terms = []
+        for alternatives in patterns.values():
+            for alternative in alternatives:
+                for term in self._terms(alternative):
+                    if term not in terms:
+                        terms.append(term)
+
+        self._term_bits = {term: 1 << i for i, term in enumerate(terms)}
+
+        # Aynı konumda başlayan terimlerden regex en uzununu yakalar;
+        # ondan kısa olup ön eki olan terimler de bulunmuş sayılır
+        self._implied = {
+            term: self._mask(t for t in terms if term.startswith(t))
+            for term in terms
+        }
+
+        # Kalıp -> her alternatif için gereken terim maskeleri
+        self._requirements = [
+            [self._mask(self._terms(alt)) for alt in patterns[name]]
+            for name in self.names
+        ]
+
+        alternation = '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+        # Lookahead ile çakışan eşleşmeler dahil her konum denenir
+        self._regex = re.compile(f'(?=({alternation}))') if terms else None
+
+    @staticmethod
+    def _terms(alternative: Union[str, tuple]) -> tuple:
+        return (alternative,) if isinstance(alternative, str) else tuple(alternative)
+
+    def _mask(self, terms: Iterable[str]) -> int:
+        mask = 0
+        for term in terms:
+            mask |= self._term_bits[term]
+        return mask
+
+    def match(self, text: str) -> int:
+        """
+        Bir metindeki kalıpları bulur.
+
+        Args:
+            text: Soru kökü veya metin
+
+        Returns:
+            int: Kalıp bit vektörü (bit i = names[i])
+        """
+        if not text or self._regex is None:
+            return 0
+
+        found = 0
+        for term in set(self._regex.findall(text.lower())):
+            found |= self._implied[term]
+
+        vector = 0
+        for i, alternatives in enumerate(self._requirements):
+            for required in alternatives:
+                if found & required == required:
+                    vector |= 1 << i
+                    break
+        return vector
+
+    def match_all(self, texts: Iterable[str]) -> PatternMatchResult:
+        """
+        Metin listesindeki tüm kalıpları tek geçişte bulur.
+
+        Args:
+            texts: Metinler (ör. 'Soru Kökleri' sütunu)
+
+        Returns:
+            PatternMatchResult: Satır bazlı vektörler ve toplamlar
+        """
+        return PatternMatchResult(self.names, [self.match(text) for text in texts])
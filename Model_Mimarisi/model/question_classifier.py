@@ -0,0 +1,328 @@
+"""
+LGS Türkçe Soru Tahminleme - Soru Sınıflandırma Modülü
+Korpus üzerinde yükleme anında eğitilen, güven skoru kalibre edilmiş yerel
+kategori / alt başlık / zorluk sınıflandırıcısı ve ders dışı soru filtresi
+"""
+
+import re
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .text_processing import tokenize
+from .text_vectors import CharNgramVectorizer
+
+
+# Diğer derslere özgü sözcük başları (paragraf metinlerinde nadiren geçenler)
+OTHER_SUBJECT_TERMS = (
+    'denklem', 'karekök', 'üslü', 'olasılı', 'eşitsizlik', 'polinom', 'türev', 'integral', 'çarpan',
+    'kromozom', 'genotip', 'fenotip', 'mitoz', 'mayoz', 'nükleotit', 'elektron', 'proton', 'nötron',
+    'periyodik', 'asit', 'ingilizce', 'english', 'vocabulary', 'grammar', 'abdest', 'namaz',
+    'zekat', 'zekât', 'coğrafya', 'meridyen', 'enlem', 'boylam'
+)
+
+# Türkçe dersi soru köklerinde geçen sözcük başları
+TURKISH_LESSON_CUES = (
+    'paragraf', 'parça', 'cümle', 'sözcü', 'kelime', 'anlam', 'metin', 'metni', 'metne', 'yazar',
+    'şiir', 'dize', 'deyim', 'atasöz', 'yazım', 'noktalama', 'anlatı', 'düşünce', 'çizili',
+    'numaralanmış', 'boşluğ', 'getirilme', 'ulaşıl', 'çıkarıl', 'değinil', 'yargı'
+)
+
+_ENGLISH_STOPWORDS = frozenset([
+    'the', 'is', 'are', 'of', 'and', 'to', 'which', 'what', 'in', 'an', 'following',
+    'sentence', 'text', 'this', 'that', 'with', 'for', 'it'
+])
+
+# Sayısal işlem içeren ifadeler (ör. "3x + 5 = 20", "2^3", "√16")
+# ('-' tarih ve sayı aralıklarında da geçtiği için dikkate alınmaz)
+_MATH_RE = re.compile(r'\d\s*[+*/^×÷]\s*\(?\s*\d|\d\s*[a-zA-Z]?\s*=\s*-?\d|[√π∑∫]')
+
+# Soru kökünü paragraftan ayırmak için cümle sonları
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?…:\n])\s+')
+
+# Soru kökünde olumsuzluk: çeldiricileri ayırt etmek gerekir, soru zorlaşır
+_NEGATION_RE = re.compile(r'(değildir|yoktur|ulaşılamaz|çıkarılamaz|söylenemez|yapılmamıştır|kullanılmamıştır)')
+
+DIFFICULTIES = ('kolay', 'orta', 'zor')
+
+# Sıcaklık ızgarası: logit = benzerlik / sıcaklık
+_TEMPERATURES = np.geomspace(0.005, 1.0, 60)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class _CentroidLevel:
+    """Tek etiket seviyesi için en yakın merkez (nearest centroid) modeli ve sıcaklık kalibrasyonu."""
+
+    def __init__(self, vectors: np.ndarray, labels: Sequence[str]):
+        self.labels, inverse = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+        n_labels = len(self.labels)
+
+        sums = np.zeros((n_labels, vectors.shape[1]), dtype=np.float64)
+        np.add.at(sums, inverse, vectors)
+        self.counts = np.bincount(inverse, minlength=n_labels)
+        self.centroids = self._normalize(sums).astype(np.float32)
+
+        # Birini-dışarıda-bırak: her satırın kendi sınıf merkezi o satır çıkarılarak yeniden hesaplanır
+        similarities = vectors @ self.centroids.T
+        own = sums[inverse] - vectors
+        own_norm = np.linalg.norm(own, axis=1)
+        own_similarity = np.where(
+            own_norm > 0, (vectors * own).sum(axis=1) / np.where(own_norm > 0, own_norm, 1.0), -1.0
+        )
+        similarities[np.arange(len(vectors)), inverse] = own_similarity
+
+        self.loo_accuracy = float(np.mean(similarities.argmax(axis=1) == inverse)) if len(vectors) else 0.0
+        self.temperature = self._calibrate(similarities, inverse)
+        self.calibration_error = self._calibration_error(similarities, inverse)
+        # Korpus sorularının en yakın merkeze benzerliği (ders dışı eşiği için)
+        self.max_similarities = np.sort(similarities.max(axis=1)) if len(vectors) else np.zeros(1)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    @staticmethod
+    def _calibrate(similarities: np.ndarray, inverse: np.ndarray) -> float:
+        """Birini-dışarıda-bırak tahminlerinde negatif log-olabilirliği en aza indiren sıcaklık."""
+        if len(similarities) < 2 or similarities.shape[1] < 2:
+            return 1.0
+        rows = np.arange(len(similarities))
+        losses = [
+            -np.log(_softmax(similarities / t)[rows, inverse] + 1e-12).mean() for t in _TEMPERATURES
+        ]
+        return float(_TEMPERATURES[int(np.argmin(losses))])
+
+    def _calibration_error(self, similarities: np.ndarray, inverse: np.ndarray, bins: int = 10) -> float:
+        """Birini-dışarıda-bırak tahminlerinde beklenen kalibrasyon hatası (ECE)."""
+        if not len(similarities):
+            return 0.0
+        probabilities = _softmax(similarities / self.temperature)
+        confidence = probabilities.max(axis=1)
+        correct = probabilities.argmax(axis=1) == inverse
+        bucket = np.minimum((confidence * bins).astype(np.int64), bins - 1)
+        error = 0.0
+        for b in np.unique(bucket):
+            members = bucket == b
+            error += members.mean() * abs(confidence[members].mean() - correct[members].mean())
+        return float(error)
+
+    def predict(self, vector: np.ndarray, mask: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            vector: Sorgu vektörü
+            mask: Dikkate alınacak etiketler (opsiyonel)
+
+        Returns:
+            Tuple: (etiket indeksleri olasılığa göre azalan, olasılıklar)
+        """
+        indices = np.flatnonzero(mask) if mask is not None else np.arange(len(self.labels))
+        probabilities = _softmax((self.centroids[indices] @ vector) / self.temperature)
+        order = np.argsort(-probabilities, kind='stable')
+        return indices[order], probabilities[order]
+
+
+class QuestionClassifier:
+    """
+    Soru metninden kategori, alt başlık ve zorluk tahmin eden yerel sınıflandırıcı.
+    Paragraf ve soru kökü ayrı karakter n-gram TF-IDF uzaylarında vektörleştirilip
+    birleştirilir (kategoriyi en çok soru kökü belirler); en yakın sınıf merkezi kullanılır.
+    Olasılıklar birini-dışarıda-bırak tahminleriyle kalibre edilen softmax sıcaklığından gelir.
+    Korpusta zorluk etiketi olmadığı için zorluk metin uzunluğu yüzdeliği ve soru kökündeki
+    olumsuzluktan tahmin edilir. Diğer derslere ait sorular ayrıca işaretlenir.
+    """
+
+    # Vektörleştirilen paragraf uzunluğu (ExampleRetriever ile aynı)
+    TEXT_CHARS = 800
+
+    def __init__(self, stem_weight: float = 0.6, off_topic_percentile: float = 0.02):
+        """
+        Args:
+            stem_weight: Birleşik vektörde soru kökünün ağırlığı (0-1; kalanı paragrafın)
+            off_topic_percentile: Korpus sorularının bu yüzdeliğinden daha az benzer metinler
+                                  Türkçe dersi ipucu içermiyorsa ders dışı sayılır
+        """
+        self.text_vectorizer = CharNgramVectorizer()
+        self.stem_vectorizer = CharNgramVectorizer()
+        self.stem_weight = stem_weight
+        self.off_topic_percentile = off_topic_percentile
+        self.categories: Optional[_CentroidLevel] = None
+        self.subcategories: Optional[_CentroidLevel] = None
+        self._parents = np.empty(0, dtype=object)
+        self._names = np.empty(0, dtype=object)
+        self._lengths = np.empty(0, dtype=np.int64)
+        self.similarity_floor = 0.0
+
+    @property
+    def fitted(self) -> bool:
+        return self.categories is not None
+
+    def _combine(self, text_vectors: np.ndarray, stem_vectors: np.ndarray) -> np.ndarray:
+        combined = np.hstack([text_vectors * (1.0 - self.stem_weight), stem_vectors * self.stem_weight])
+        return _CentroidLevel._normalize(combined).astype(np.float32)
+
+    @staticmethod
+    def split_question(text: str) -> Tuple[str, str]:
+        """
+        Tek parça soru metnini paragraf ve soru köküne ayırır.
+        Soru kökü son soru cümlesidir ('?' ile biten; yoksa son cümle).
+
+        Returns:
+            Tuple: (paragraf, soru kökü)
+        """
+        text = (text or '').strip()
+        end = text.rfind('?')
+        end = end + 1 if end != -1 else len(text)
+        sentences = _SENTENCE_END_RE.split(text[:end])
+        stem = sentences[-1] if sentences else ''
+        paragraph = (text[:end - len(stem)] + ' ' + text[end:]).strip()
+        return paragraph, stem.strip()
+
+    def fit(self, data: Dict[str, Sequence[Any]]):
+        """
+        Korpus etiketleri üzerinde sınıf merkezlerini kurar ve güven skorlarını kalibre eder.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+        """
+        texts = data.get('Metinler', [])
+        stems = data.get('Soru Kökleri', [])
+        categories = data.get('Kategori', [])
+        subcategories = data.get('Alt Başlık', [])
+        total = len(data.get('Ticket_ID', []))
+
+        def column(values, row):
+            return (values[row] or '') if row < len(values) else ''
+
+        rows = [row for row in range(total) if column(categories, row)]
+        if not rows:
+            self.categories = self.subcategories = None
+            return
+
+        vectors = self._combine(
+            self.text_vectorizer.fit_transform(column(texts, row)[:self.TEXT_CHARS] for row in rows),
+            self.stem_vectorizer.fit_transform(column(stems, row) for row in rows)
+        )
+        category_labels = [column(categories, row) for row in rows]
+        pair_labels = [f"{column(categories, row)}|{column(subcategories, row).strip()}" for row in rows]
+
+        self.categories = _CentroidLevel(vectors, category_labels)
+        self.subcategories = _CentroidLevel(vectors, pair_labels)
+        split = [label.split('|', 1) for label in self.subcategories.labels]
+        self._parents = np.array([parent for parent, _ in split], dtype=object)
+        self._names = np.array([name for _, name in split], dtype=object)
+
+        self._lengths = np.sort(np.fromiter(
+            (len(column(texts, row)) + len(column(stems, row)) for row in rows), dtype=np.int64, count=len(rows)
+        ))
+        self.similarity_floor = float(np.quantile(self.categories.max_similarities, self.off_topic_percentile))
+
+    def off_topic_reason(self, text: str, similarity: float = None) -> Optional[str]:
+        """
+        Metin başka bir derse aitse nedenini döndürür.
+
+        Args:
+            text: Soru metni
+            similarity: Metnin en yakın kategori merkezine benzerliği (opsiyonel)
+
+        Returns:
+            str veya None (Türkçe dersiyle ilgiliyse)
+        """
+        words = tokenize(text, stem=False, stopwords=False)
+        if not words:
+            return "metin boş"
+
+        english = sum(word in _ENGLISH_STOPWORDS for word in words) / len(words)
+        if english >= 0.2:
+            return "metin İngilizce görünüyor"
+
+        if any(word.startswith(TURKISH_LESSON_CUES) for word in words):
+            return None
+
+        subject_terms = sorted({word for word in words if word.startswith(OTHER_SUBJECT_TERMS)})
+        if subject_terms or _MATH_RE.search(text):
+            found = ', '.join(subject_terms[:3]) if subject_terms else 'sayısal işlem'
+            return f"başka derse ait ifadeler içeriyor: {found}"
+        if similarity is not None and similarity < self.similarity_floor:
+            return "korpustaki Türkçe sorularına benzemiyor"
+        return None
+
+    def _difficulty(self, text: str, stem: str) -> Tuple[str, float]:
+        """Uzunluk yüzdeliği ve olumsuz soru kökünden zorluk seviyesi."""
+        percentile = float(np.searchsorted(self._lengths, len(text)) / max(len(self._lengths), 1))
+        level = min(int(percentile * len(DIFFICULTIES)), len(DIFFICULTIES) - 1)
+        if _NEGATION_RE.search(stem.lower()):
+            level = min(level + 1, len(DIFFICULTIES) - 1)
+        return DIFFICULTIES[level], round(percentile, 3)
+
+    def classify(self, text: str, top_k: int = 3) -> Dict[str, Any]:
+        """
+        Soruyu sınıflandırır.
+
+        Args:
+            text: Soru metni (paragraf ve soru kökü)
+            top_k: Döndürülecek alternatif kategori sayısı
+
+        Returns:
+            Dict: kategori, alt_kategori, zorluk, kalibre güven skorları, alternatifler
+                  ve ders dışı bilgisi
+
+        Raises:
+            ValueError: Sınıflandırıcı eğitilmemişse
+        """
+        if not self.fitted:
+            raise ValueError("Sınıflandırıcı eğitilmedi (korpus boş).")
+
+        paragraph, stem = self.split_question(text)
+        vector = self._combine(
+            self.text_vectorizer.transform([paragraph[:self.TEXT_CHARS]]),
+            self.stem_vectorizer.transform([stem])
+        )[0]
+        similarity = float((self.categories.centroids @ vector).max())
+        reason = self.off_topic_reason(text, similarity)
+
+        category_ids, category_probs = self.categories.predict(vector)
+        category = self.categories.labels[category_ids[0]]
+        sub_ids, sub_probs = self.subcategories.predict(vector, mask=self._parents == category)
+        difficulty, length_percentile = self._difficulty(text, stem)
+
+        return {
+            "kategori": category,
+            "alt_kategori": self._names[sub_ids[0]],
+            "zorluk": difficulty,
+            "guven": {
+                "kategori": round(float(category_probs[0]), 3),
+                "alt_kategori": round(float(sub_probs[0]), 3)
+            },
+            "alternatifler": [
+                {"kategori": self.categories.labels[i], "olasilik": round(float(p), 3)}
+                for i, p in zip(category_ids[1:top_k], category_probs[1:top_k])
+            ],
+            "uzunluk_yuzdeligi": length_percentile,
+            "benzerlik": round(similarity, 3),
+            "ders_disi": reason is not None,
+            "ders_disi_nedeni": reason
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Birini-dışarıda-bırak doğruluğu, kalibrasyon sıcaklıkları ve kalibrasyon hatası."""
+        if not self.fitted:
+            return {"fitted": False}
+        return {
+            "fitted": True,
+            "categories": len(self.categories.labels),
+            "subcategories": len(self.subcategories.labels),
+            "category_loo_accuracy": round(self.categories.loo_accuracy, 3),
+            "subcategory_loo_accuracy": round(self.subcategories.loo_accuracy, 3),
+            "category_temperature": round(self.categories.temperature, 4),
+            "subcategory_temperature": round(self.subcategories.temperature, 4),
+            "category_calibration_error": round(self.categories.calibration_error, 3),
+            "subcategory_calibration_error": round(self.subcategories.calibration_error, 3),
+            "similarity_floor": round(self.similarity_floor, 3)
+        }
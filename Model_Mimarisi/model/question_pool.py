@@ -0,0 +1,176 @@
+"""
+LGS Türkçe Soru Tahminleme - Soru Havuzu Modülü
+(kategori, zorluk) başına önceden üretilmiş soru stoku ve arka planda yeniden doldurma
+"""
+
+import asyncio
+from collections import deque
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from .exceptions import LLMError
+
+
+PoolKey = Tuple[str, str]
+
+
+class QuestionPool:
+    """
+    (kategori, zorluk) anahtarı başına doğrulanmış ve tekrar kontrolünden geçmiş
+    soru stoku tutar. İstekler stoktan anında karşılanır; stok alt eşiğin altına
+    inince anahtar, eşzamanlılık bütçesi içinde arka planda üst eşiğe kadar doldurulur.
+    """
+
+    def __init__(
+        self,
+        produce: Callable[[str, str, int], Awaitable[List[Dict]]],
+        low_water: int = 5,
+        high_water: int = 15,
+        batch_size: int = 5,
+        concurrency: int = 1,
+        marks: Dict[PoolKey, Tuple[int, int]] = None
+    ):
+        """
+        Args:
+            produce: (kategori, zorluk, adet) için soru üreten fonksiyon
+                     (sorular doğrulanmış ve tekrar kontrolünden geçmiş olmalı)
+            low_water: Stok bunun altına inince doldurma başlar
+            high_water: Doldurma bu stoka ulaşınca durur
+            batch_size: Tek üretim çağrısında istenen soru sayısı
+            concurrency: Aynı anda çalışan en fazla doldurma çağrısı
+            marks: Anahtar bazlı (alt, üst) eşikler
+        """
+        self.produce = produce
+        self.low_water = low_water
+        self.high_water = max(high_water, low_water)
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.marks: Dict[PoolKey, Tuple[int, int]] = dict(marks or {})
+        self._stock: Dict[PoolKey, deque] = {}
+        self._stats: Dict[PoolKey, Dict[str, int]] = {}
+        self._refills: Dict[PoolKey, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _key_stats(self, key: PoolKey) -> Dict[str, int]:
+        if key not in self._stats:
+            self._stats[key] = {
+                'requests': 0, 'served': 0, 'shortfall': 0,
+                'refills': 0, 'generated': 0, 'failed_refills': 0
+            }
+        return self._stats[key]
+
+    def _marks(self, key: PoolKey) -> Tuple[int, int]:
+        return self.marks.get(key, (self.low_water, self.high_water))
+
+    def set_marks(self, category: str, difficulty: str, low_water: int, high_water: int):
+        """Bir anahtarın alt ve üst eşiklerini ayarlar."""
+        self.marks[(category, difficulty)] = (low_water, max(high_water, low_water))
+
+    def available(self, category: str, difficulty: str) -> int:
+        """Anahtarın stoktaki soru sayısı."""
+        return len(self._stock.get((category, difficulty), ()))
+
+    def take(self, category: str, difficulty: str, count: int) -> List[Dict]:
+        """
+        Stoktan en fazla `count` soru alır; gerekirse arka planda doldurmayı başlatır.
+
+        Args:
+            category: Kategori
+            difficulty: Zorluk
+            count: İstenen soru sayısı
+
+        Returns:
+            List[Dict]: Stoktan verilen sorular (stok yetmezse daha az)
+        """
+        key = (category, difficulty)
+        stock = self._stock.setdefault(key, deque())
+        stats = self._key_stats(key)
+
+        taken = [stock.popleft() for _ in range(min(count, len(stock)))]
+        stats['requests'] += 1
+        stats['served'] += len(taken)
+        stats['shortfall'] += count - len(taken)
+
+        self.schedule_refill(category, difficulty)
+        return taken
+
+    def schedule_refill(self, category: str, difficulty: str) -> bool:
+        """
+        Stok alt eşiğin altındaysa ve süren doldurma yoksa arka plan doldurmayı başlatır.
+        Çalışan bir event loop yoksa (senkron kullanım) doldurma yapılmaz.
+
+        Returns:
+            bool: Doldurma başlatıldıysa True
+        """
+        key = (category, difficulty)
+        low_water, _ = self._marks(key)
+        if key in self._refills or self.available(category, difficulty) >= max(low_water, 1):
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+        task = loop.create_task(self._refill(key))
+        self._refills[key] = task
+        task.add_done_callback(lambda done, key=key: self._refills.pop(key, None))
+        return True
+
+    def prefill(self, keys: Iterable[PoolKey]) -> int:
+        """Verilen anahtarlar için doldurmayı başlatır (ör. uygulama açılışında)."""
+        return sum(self.schedule_refill(category, difficulty) for category, difficulty in keys)
+
+    async def _refill(self, key: PoolKey):
+        """Anahtarı üst eşiğe kadar parti parti doldurur."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        stock = self._stock.setdefault(key, deque())
+        stats = self._key_stats(key)
+        _, high_water = self._marks(key)
+
+        while len(stock) < high_water:
+            async with self._semaphore:
+                try:
+                    batch = await self.produce(key[0], key[1], min(self.batch_size, high_water - len(stock)))
+                except LLMError as e:
+                    print(f"Soru havuzu doldurma hatası ({key[0]}, {key[1]}): {e}")
+                    batch = []
+            stats['refills'] += 1
+            if not batch:
+                # Upstream sorunluyken havuz istekleri beklemeden sonraki tüketimde tekrar denenir
+                stats['failed_refills'] += 1
+                return
+            stock.extend(batch)
+            stats['generated'] += len(batch)
+
+    async def wait_idle(self):
+        """Süren doldurmaların bitmesini bekler."""
+        while self._refills:
+            await asyncio.gather(*list(self._refills.values()), return_exceptions=True)
+
+    def clear(self):
+        """Stoku boşaltır ve süren doldurmaları iptal eder."""
+        for task in list(self._refills.values()):
+            task.cancel()
+        self._refills.clear()
+        self._stock.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Anahtar bazlı stok ve tüketim istatistikleri."""
+        keys = {}
+        for key in sorted(set(self._stock) | set(self._stats)):
+            low_water, high_water = self._marks(key)
+            stats = self._key_stats(key)
+            keys[f"{key[0]}|{key[1]}"] = {
+                'stock': self.available(*key),
+                'low_water': low_water,
+                'high_water': high_water,
+                'refilling': key in self._refills,
+                **stats,
+                'hit_rate': round(stats['served'] / (stats['served'] + stats['shortfall']), 3)
+                if stats['served'] + stats['shortfall'] else 0.0
+            }
+        return {
+            'concurrency': self.concurrency,
+            'active_refills': len(self._refills),
+            'keys': keys
+        }
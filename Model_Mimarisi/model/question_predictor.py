@@ -3,13 +3,24 @@ LGS Türkçe Soru Tahminleme - Hibrit Tahminleme Modülü
 Veri analizi + Gemini API birleşik sistem
 """
 
+import asyncio
 import json
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
 
 from .data_analyzer import DataAnalyzer
+from .dedup import NearDuplicateIndex, question_text
+from .exam_builder import ExamBuilder
+from .exceptions import LLMError
 from .gemini_client import GeminiClient
+from .history_store import HistoryStore
+from .llm_provider import LLMProvider
+from .question_pool import QuestionPool
+from .records import QuestionView
+from .resilience import ResilientCaller
+from .response_cache import ResponseCache
 
 
 class QuestionPredictor:
@@ -30,17 +41,81 @@ class QuestionPredictor:
     
     DIFFICULTY_LEVELS = ["kolay", "orta", "zor"]
     
-    def __init__(self, data_path: str, api_key: str, model_name: str = "models/gemini-1.5-flash"):
+    # Yakın kopya sorular için davranış: çıkar veya işaretle
+    DUPLICATE_POLICIES = ["reject", "flag"]
+    
+    # Büyük istekler parçalara bölünür (parça başına soru, eşzamanlı parça, yeniden deneme)
+    MAX_QUESTION_COUNT = 50
+    FAN_OUT_CHUNK_SIZE = 5
+    FAN_OUT_CONCURRENCY = 4
+    FAN_OUT_RETRIES = 1
+    
+    # Toplu istekteki en fazla istek
+    MAX_BATCH_SIZE = 20
+    
+    # Deneme sınavı: kategori dağılımı kaynakları ve eksik kalan sorular için ek üretim turu
+    EXAM_SOURCES = ["stats", "trends"]
+    EXAM_TOP_UP_ROUNDS = 1
+    
+    def __init__(
+        self,
+        data_path: str,
+        api_key: str,
+        model_name: str = None,
+        snapshot_path: str = None,
+        search_index_path: str = None,
+        cache: ResponseCache = None,
+        resilience: ResilientCaller = None,
+        provider: LLMProvider = None,
+        pool_settings: Dict[str, Any] = None,
+        analysis_confidence: float = 0.6,
+        history: HistoryStore = None,
+        max_generated_questions: int = 1000
+    ):
         """
         Args:
-            data_path: Eğitim verisi JSON dosyasının yolu
+            data_path: Eğitim verisi JSON dosyası, dizin veya glob deseni
             api_key: Gemini API anahtarı
-            model_name: Kullanılacak Gemini modeli
+            model_name: Birincil Gemini modeli (varsayılan: config.GEMINI_MODELS'in ilki)
+            snapshot_path: Derlenmiş korpus snapshot'ı (opsiyonel, hızlı açılış)
+            search_index_path: Kalıcı BM25 arama indeksi dosyası (opsiyonel)
+            cache: LLM yanıt cache'i (opsiyonel; korpus sürümüne göre ayrıştırılır)
+            resilience: Gemini çağrıları için hız sınırı/yeniden deneme/devre kesici ayarları
+            provider: LLM arka ucu (varsayılan: Gemini; ör. LocalStandInProvider ile API anahtarsız)
+            pool_settings: Verilirse önceden üretilmiş soru havuzu açılır
+                           (QuestionPool argümanları: low_water, high_water, batch_size, concurrency, marks)
+            analysis_confidence: Soru analizinde yerel kategori tahmininin kabul edildiği en düşük
+                                 kalibre güven; altında Gemini'ye sorulur (alt kategori sadece işaretlenir)
+            history: Tahmin geçmişi (varsayılan: sadece bellekte, son 200 kayıt)
+            max_generated_questions: Bellekte tutulan (tekrar kontrolü ve dışa aktarma için)
+                                     en fazla üretilmiş soru
         """
-        self.data_analyzer = DataAnalyzer(data_path)
-        self.gemini_client = GeminiClient(api_key, model_name)
-        self.generated_questions = []
-        self.prediction_history = []
+        self.data_analyzer = DataAnalyzer(
+            data_path,
+            snapshot_path=snapshot_path,
+            search_index_path=search_index_path
+        )
+        if cache is not None and not cache.namespace:
+            # Korpus değişince (ör. yeni yıl eklenince) cache'lenmiş yanıtlar geçersiz olur
+            cache.namespace = lambda: self.data_analyzer.corpus_version
+        if provider is not None:
+            provider.bind_corpus(self.data_analyzer.data)
+        self.gemini_client = GeminiClient(
+            api_key, model_name, cache=cache, resilience=resilience, provider=provider
+        )
+        self.history = history if history is not None else HistoryStore()
+        # Yeniden başlatmada diskteki son üretimler tekrar kontrolüne dahil edilir
+        self.generated_questions = deque(
+            (question for record in self.history.recent() for question in record.get("generated_questions", [])),
+            maxlen=max_generated_questions
+        )
+        self.duplicate_index = None
+        self._duplicate_corpus_rows = 0
+        self.question_pool = (
+            QuestionPool(self._generate_for_pool, **pool_settings) if pool_settings is not None else None
+        )
+        self.analysis_confidence = analysis_confidence
+        self.analysis_stats = {'local': 0, 'local_with_narrative': 0, 'llm': 0, 'off_topic': 0}
     
     def get_model_status(self) -> Dict[str, Any]:
         """
@@ -55,6 +130,23 @@ class QuestionPredictor:
             "supported_categories": self.SUPPORTED_CATEGORIES,
             "difficulty_levels": self.DIFFICULTY_LEVELS,
             "generated_questions_count": len(self.generated_questions),
+            "history": self.history.stats(),
+            "llm_provider": {
+                "name": self.gemini_client.provider.name,
+                "model": self.gemini_client.model_name,
+                **self.gemini_client.provider.stats()
+            },
+            "response_cache": self.gemini_client.cache.stats() if self.gemini_client.cache else None,
+            "request_coalescing": self.gemini_client.single_flight.stats() if self.gemini_client.single_flight else None,
+            "resilience": self.gemini_client.resilience.stats(),
+            "question_pool": self.question_pool.stats() if self.question_pool else None,
+            "response_parsing": self.gemini_client.parse_stats,
+            "question_analysis": {
+                **self.analysis_stats,
+                "confidence_threshold": self.analysis_confidence,
+                "classifier": self.data_analyzer.question_classifier.stats()
+                if self.data_analyzer.question_classifier else None
+            },
             "data_analysis": self.data_analyzer.get_pattern_analysis()
         }
     
@@ -63,7 +155,10 @@ class QuestionPredictor:
         category: str = None,
         subcategory: str = None,
         count: int = 5,
-        difficulty: str = "orta"
+        difficulty: str = "orta",
+        seed: int = None,
+        duplicates: str = "reject",
+        chunk_size: int = None
     ) -> Dict[str, Any]:
         """
         2026 LGS için soru tahminlemesi yapar.
@@ -71,19 +166,550 @@ class QuestionPredictor:
         Args:
             category: Ana kategori (None ise rastgele)
             subcategory: Alt kategori (opsiyonel)
-            count: Üretilecek soru sayısı (1-10)
+            count: Üretilecek soru sayısı (1-50)
             difficulty: Zorluk seviyesi
+            seed: Verilirse örnekler benzerlik yerine seed'li rastgele örneklemeyle seçilir
+            duplicates: Geçmiş sorulara veya önceki üretimlere yakın kopyalar için
+                        'reject' (çıkar) veya 'flag' (duplicate_of alanıyla işaretle)
+            chunk_size: Tek prompt'ta istenen en fazla soru (varsayılan: FAN_OUT_CHUNK_SIZE)
+            
+        Returns:
+            Dict: Tahminleme sonuçları
+            
+        Raises:
+            LLMError: Hiçbir soru üretilemediyse Gemini çağrısının hatası
+        """
+        prepared = self._prepare_prediction(category, subcategory, count, difficulty, seed, duplicates, chunk_size)
+        if "error" in prepared:
+            return prepared
+        
+        category, context, chunks = prepared["category"], prepared["context"], prepared["chunks"]
+        
+        errors: List[LLMError] = []
+        
+        # Gemini ile soru üret (büyük istekler parçalar halinde sırayla)
+        def run(index: int) -> List[Dict]:
+            try:
+                return self.gemini_client.generate_questions(
+                    context=self._chunk_context(context, index, len(chunks)),
+                    category=category,
+                    subcategory=subcategory,
+                    count=chunks[index],
+                    difficulty=difficulty
+                )
+            except LLMError as e:
+                errors.append(e)
+                return []
+        
+        results = [run(i) for i in range(len(chunks))]
+        retried = 0
+        for _ in range(self.FAN_OUT_RETRIES):
+            failed = [i for i, result in enumerate(results) if not result]
+            for i in failed:
+                results[i] = run(i)
+            retried += len(failed)
+        
+        # Hiçbir parça üretilemediyse hata çağırana tipli olarak iletilir
+        if errors and not any(results):
+            raise errors[-1]
+        
+        return self._record_prediction(
+            category, subcategory, count, difficulty, duplicates, context, results, retried
+        )
+    
+    async def predict_questions_async(
+        self,
+        category: str = None,
+        subcategory: str = None,
+        count: int = 5,
+        difficulty: str = "orta",
+        seed: int = None,
+        duplicates: str = "reject",
+        chunk_size: int = None,
+        concurrency: int = None,
+        fresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        predict_questions'ın asenkron sürümü.
+        Büyük istekler küçük parçalara bölünüp eşzamanlı üretilir; süre tek
+        küçük çağrıya yakın kalır ve bozuk bir yanıt sadece kendi parçasını etkiler.
+        Soru havuzu açıksa istek önce havuzdan karşılanır; Gemini sadece eksik kalan
+        sorular için çağrılır (alt kategori veya seed verilen istekler havuzu kullanmaz).
+        
+        Args:
+            chunk_size: Tek prompt'ta istenen en fazla soru (varsayılan: FAN_OUT_CHUNK_SIZE)
+            concurrency: Aynı anda çalışan en fazla parça (varsayılan: FAN_OUT_CONCURRENCY)
+            fresh: True ise havuz atlanır ve tüm sorular canlı üretilir
             
         Returns:
             Dict: Tahminleme sonuçları
         """
+        return await self._predict_async(
+            category, subcategory, count, difficulty, seed, duplicates, chunk_size,
+            asyncio.Semaphore(max(1, concurrency or self.FAN_OUT_CONCURRENCY)), fresh
+        )
+    
+    async def _predict_async(
+        self,
+        category: Optional[str],
+        subcategory: Optional[str],
+        count: int,
+        difficulty: str,
+        seed: Optional[int],
+        duplicates: str,
+        chunk_size: Optional[int],
+        semaphore: asyncio.Semaphore,
+        fresh: bool = False,
+        contexts: Dict[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Tek tahminleme isteğini yürütür.
+        Parça çağrıları verilen semaphore ile sınırlanır (toplu isteklerde tüm istekler arasında
+        paylaşılır); contexts verilirse bağlamın ortak kısmı kategori başına bir kez kurulur.
+        """
+        prepared = self._prepare_prediction(
+            category, subcategory, count, difficulty, seed, duplicates, chunk_size, contexts
+        )
+        if "error" in prepared:
+            return prepared
+        
+        category, context, chunks = prepared["category"], prepared["context"], prepared["chunks"]
+        
+        pooled = None
+        if self.question_pool is not None and not fresh and subcategory is None and seed is None:
+            pooled = self.question_pool.take(category, difficulty.lower(), count)
+            if len(pooled) == count:
+                return self._record_prediction(
+                    category, subcategory, count, difficulty, duplicates, context, [], pooled=pooled
+                )
+            chunks = self._plan_chunks(count - len(pooled), chunk_size or self.FAN_OUT_CHUNK_SIZE)
+        
+        errors: List[LLMError] = []
+        
+        async def run(index: int) -> List[Dict]:
+            async with semaphore:
+                try:
+                    return await self.gemini_client.generate_questions_async(
+                        context=self._chunk_context(context, index, len(chunks)),
+                        category=category,
+                        subcategory=subcategory,
+                        count=chunks[index],
+                        difficulty=difficulty
+                    )
+                except LLMError as e:
+                    errors.append(e)
+                    return []
+        
+        results = list(await asyncio.gather(*(run(i) for i in range(len(chunks)))))
+        retried = 0
+        # Sadece boş dönen (hatalı/bozuk JSON) parçalar yeniden denenir
+        for _ in range(self.FAN_OUT_RETRIES):
+            failed = [i for i, result in enumerate(results) if not result]
+            if not failed:
+                break
+            for i, result in zip(failed, await asyncio.gather(*(run(i) for i in failed))):
+                results[i] = result
+            retried += len(failed)
+        
+        # Hiçbir parça üretilemediyse hata çağırana tipli olarak iletilir
+        if errors and not any(results) and not pooled:
+            raise errors[-1]
+        
+        return self._record_prediction(
+            category, subcategory, count, difficulty, duplicates, context, results, retried, pooled
+        )
+    
+    async def predict_batch(
+        self,
+        specs: List[Dict[str, Any]],
+        concurrency: int = None,
+        duplicates: str = "reject",
+        fresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Birden fazla tahminleme isteğini (ör. bir çalışma kağıdının kategori/zorluk satırları)
+        tek çağrıda eşzamanlı yürütür.
+        Tüm isteklerin parça çağrıları tek bir eşzamanlılık sınırını paylaşır; tahminleme
+        bağlamının ortak kısmı her kategori için bir kez kurulur, örnek sorular her isteğin
+        zorluk ve alt başlığına göre ayrıca seçilir. Bir isteğin hatası
+        diğerlerini etkilemez; sonuçlar istek sırasıyla ve istek bazında döner.
+        
+        Args:
+            specs: İstekler [{'category', 'subcategory', 'count', 'difficulty', 'seed'}]
+            concurrency: Tüm istekler için aynı anda çalışan en fazla Gemini çağrısı
+                         (varsayılan: FAN_OUT_CONCURRENCY)
+            duplicates: Yakın kopya politikası (istekler arası tekrarlar da yakalanır)
+            fresh: True ise soru havuzu atlanır
+            
+        Returns:
+            Dict: 'results' (istek başına sonuç veya hata) ve 'summary'
+        """
+        if not specs:
+            return {"error": "En az bir istek gerekli."}
+        if len(specs) > self.MAX_BATCH_SIZE:
+            return {"error": f"Toplu istekte en fazla {self.MAX_BATCH_SIZE} istek olabilir."}
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.FAN_OUT_CONCURRENCY))
+        contexts: Dict[str, Dict[str, Any]] = {}
+        
+        async def run(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                result = await self._predict_async(
+                    spec.get("category"),
+                    spec.get("subcategory"),
+                    spec.get("count", 5),
+                    spec.get("difficulty", "orta"),
+                    spec.get("seed"),
+                    duplicates,
+                    spec.get("chunk_size"),
+                    semaphore,
+                    fresh,
+                    contexts
+                )
+            except LLMError as e:
+                return {"index": index, "success": False, "error": str(e), "status_code": e.status_code}
+            except Exception as e:
+                print(f"Toplu tahmin hatası ({index}. istek): {e}")
+                return {"index": index, "success": False, "error": str(e), "status_code": 500}
+            
+            if "error" in result:
+                return {"index": index, "success": False, "error": result["error"], "status_code": 400}
+            return {"index": index, **result}
+        
+        results = await asyncio.gather(*(run(i, spec) for i, spec in enumerate(specs)))
+        
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "results": results,
+            "summary": {
+                "requests": len(specs),
+                "succeeded": sum(1 for result in results if result["success"]),
+                "failed": sum(1 for result in results if not result["success"]),
+                "question_count": sum(len(result.get("generated_questions", [])) for result in results),
+                "contexts_built": len(contexts)
+            }
+        }
+    
+    async def build_exam(
+        self,
+        total: int = 20,
+        source: str = "stats",
+        distribution: Dict[str, float] = None,
+        difficulty_mix: Dict[str, float] = None,
+        concurrency: int = None,
+        fresh: bool = False,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Tahmin edilen 2026 dağılımına uygun, numaralı deneme sınavı ve cevap anahtarı üretir.
+        Plandaki her kategori tek çağrıda, zorluk dağılımı prompt'ta verilerek karma zorlukla
+        üretilir; çağrılar eşzamanlıdır ve sayısı hız sınırının anlık kapasitesini aşmaz.
+        Sınav içi ve önceki üretimlerle tekrarlar ayıklanır, eksik kalan kategoriler bir tur
+        daha üretilir. Sınav geçmişe tek kayıt olarak yazılır.
+        
+        Args:
+            total: Sınavdaki soru sayısı
+            source: Kategori dağılımı kaynağı: stats (kategori × yıl istatistikleri) veya
+                    trends (Gemini trend tahmini; ayrıştırılamazsa stats kullanılır)
+            distribution: Kategori -> ağırlık veya soru sayısı (verilirse source yok sayılır)
+            difficulty_mix: Zorluk -> oran (varsayılan: %30 kolay, %40 orta, %30 zor)
+            concurrency: Aynı anda çalışan en fazla Gemini çağrısı (varsayılan: plandaki tüm kategoriler)
+            fresh: True ise soru havuzu atlanır
+            use_cache: False ise trend tahmini cache'ten okunmaz
+            
+        Returns:
+            Dict: Sınav, cevap anahtarı, plan ve özet (veya {'error'})
+        """
+        if total < 1 or total > self.MAX_QUESTION_COUNT:
+            return {"error": f"Soru sayısı 1-{self.MAX_QUESTION_COUNT} arasında olmalıdır."}
+        if source not in self.EXAM_SOURCES:
+            return {"error": f"Geçersiz dağılım kaynağı. Seçenekler: {self.EXAM_SOURCES}"}
+        if difficulty_mix and any(level not in self.DIFFICULTY_LEVELS for level in difficulty_mix):
+            return {"error": f"Geçersiz zorluk seviyesi. Seçenekler: {self.DIFFICULTY_LEVELS}"}
+        
+        builder = ExamBuilder(total=total, difficulty_mix=difficulty_mix)
+        
+        if distribution:
+            unknown = [category for category in distribution if category not in self.SUPPORTED_CATEGORIES]
+            if unknown:
+                return {
+                    "error": f"Geçersiz kategori: {', '.join(unknown)}. Desteklenen kategoriler: {self.SUPPORTED_CATEGORIES}"
+                }
+            weights, source = dict(distribution), "custom"
+        else:
+            weights = {}
+            if source == "trends":
+                trends = await self.get_2026_predictions_async(use_cache=use_cache)
+                weights = builder.distribution_from_trends(trends["trend_predictions"], self.SUPPORTED_CATEGORIES)
+                if not weights:
+                    print("Trend tahmininde soru dağılımı bulunamadı; kategori × yıl istatistikleri kullanılıyor")
+                    source = "stats"
+            if not weights:
+                crosstab = self.data_analyzer.get_crosstab('category', 'year')
+                weights = builder.distribution_from_crosstab(
+                    {category: row for category, row in crosstab.items() if category in self.SUPPORTED_CATEGORIES}
+                )
+        
+        # Kategori başına bir çağrı; anlık kapasiteyi aşan çağrılar 429 ile döneceği için
+        # satır sayısı kova kapasitesiyle sınırlanır
+        burst = int(self.gemini_client.resilience.limiter.requests.capacity)
+        plan = builder.plan(weights, max_slots=max(1, burst))
+        if not plan["slots"]:
+            return {"error": "Kategori dağılımı boş; sınav planlanamadı."}
+        
+        questions_by_category: Dict[str, List[Dict]] = {}
+        if self.question_pool is not None and not fresh:
+            for slot in plan["slots"]:
+                for difficulty, count in slot["difficulties"].items():
+                    questions_by_category.setdefault(slot["category"], []).extend(
+                        self.question_pool.take(slot["category"], difficulty, count)
+                    )
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency or len(plan["slots"])))
+        contexts: Dict[str, Dict[str, Any]] = {}
+        errors: List[Dict[str, Any]] = []
+        duplicates_removed = 0
+        top_up_rounds = 0
+        calls = 0
+        
+        async def generate(slot: Dict[str, Any]) -> List[Dict]:
+            category = slot["category"]
+            if category not in contexts:
+                contexts[category] = self.data_analyzer.get_prediction_context(category)
+            async with semaphore:
+                return await self.gemini_client.generate_questions_async(
+                    context=contexts[category],
+                    category=category,
+                    count=slot["count"],
+                    difficulty_mix=slot["difficulties"]
+                )
+        
+        missing = builder.shortfall(plan["slots"], questions_by_category)
+        for round_number in range(1 + self.EXAM_TOP_UP_ROUNDS):
+            if not missing:
+                break
+            top_up_rounds = round_number
+            calls += len(missing)
+            results = await asyncio.gather(*(generate(slot) for slot in missing), return_exceptions=True)
+            for slot, result in zip(missing, results):
+                if isinstance(result, BaseException):
+                    if not isinstance(result, Exception):
+                        raise result
+                    print(f"Deneme sınavı üretim hatası ({slot['category']}): {result}")
+                    errors.append({
+                        "category": slot["category"],
+                        "error": str(result),
+                        "status_code": result.status_code if isinstance(result, LLMError) else 500
+                    })
+                    continue
+                # Tüm soruları tekrar çıkan kategori hata değil, eksik olarak kalır
+                kept, matches = self._check_duplicates(result, "reject")
+                duplicates_removed += len(matches)
+                questions_by_category.setdefault(slot["category"], []).extend(kept[:slot["count"]])
+            missing = builder.shortfall(plan["slots"], questions_by_category)
+        
+        exam = builder.assemble(
+            questions_by_category,
+            category_order=[category for category in self.SUPPORTED_CATEGORIES if category in plan["categories"]],
+            difficulty_order=self.DIFFICULTY_LEVELS
+        )
+        if not exam["questions"]:
+            return {"error": f"Sınav için soru üretilemedi: {errors[-1]['error'] if errors else 'boş yanıt'}"}
+        
+        result = {
+            "timestamp": datetime.now().isoformat(),
+            "blueprint": {
+                "source": source,
+                "category_weights": {category: round(weight, 3) for category, weight in weights.items()},
+                "categories": plan["categories"],
+                "difficulties": plan["difficulties"]
+            },
+            "exam": {
+                "question_count": len(exam["questions"]),
+                "questions": exam["questions"]
+            },
+            "answer_key": exam["answer_key"],
+            "summary": {
+                "requested": total,
+                "generated": len(exam["questions"]),
+                "calls": calls,
+                "duplicates_removed": duplicates_removed + exam["duplicates_removed"],
+                "top_up_rounds": top_up_rounds,
+                "shortfall": {slot["category"]: slot["count"] for slot in missing},
+                "errors": errors
+            }
+        }
+        self._store_exam(result)
+        return result
+    
+    def _store_exam(self, exam_result: Dict[str, Any]):
+        """Deneme sınavını geçmişe tek kayıt olarak yazar (sorular cevaplarıyla birlikte)."""
+        questions = [
+            dict(question, dogru_cevap=key["dogru_cevap"], aciklama=key["aciklama"])
+            for question, key in zip(exam_result["exam"]["questions"], exam_result["answer_key"])
+        ]
+        record = {
+            "timestamp": exam_result["timestamp"],
+            "request": {
+                "type": "exam",
+                "category": None,
+                "subcategory": None,
+                "count": exam_result["summary"]["requested"],
+                "difficulty": None,
+                "blueprint": exam_result["blueprint"]
+            },
+            "generated_questions": questions,
+            "success": True,
+            "summary": exam_result["summary"]
+        }
+        self.generated_questions.extend(questions)
+        self.history.append(record)
+    
+    async def _generate_for_pool(self, category: str, difficulty: str, count: int) -> List[Dict]:
+        """Havuz için soru üretir; yakın kopyalar çıkarılır, kalanlar tekrar indeksine eklenir."""
+        context = self.data_analyzer.get_prediction_context(category, difficulty=difficulty)
+        questions = await self.gemini_client.generate_questions_async(
+            context=context,
+            category=category,
+            count=count,
+            difficulty=difficulty
+        )
+        kept, _ = self._check_duplicates(questions, "reject")
+        return kept
+    
+    async def stream_questions(
+        self,
+        category: str = None,
+        subcategory: str = None,
+        count: int = 5,
+        difficulty: str = "orta",
+        seed: int = None,
+        duplicates: str = "reject",
+        chunk_size: int = None,
+        concurrency: int = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        predict_questions_async'in akış sürümü.
+        Her soru, model yanıtında JSON nesnesi tamamlandığı anda tekrar kontrolünden
+        geçirilip numaralanarak döndürülür; parçalar eşzamanlı akar. Akış bitince
+        sonuç geçmişe kaydedilir.
+        
+        Yields:
+            Dict: {'event': 'question' | 'duplicate' | 'error' | 'done', 'data': ...}
+        """
+        prepared = self._prepare_prediction(category, subcategory, count, difficulty, seed, duplicates, chunk_size)
+        if "error" in prepared:
+            yield {"event": "error", "data": {"error": prepared["error"], "status_code": 400}}
+            return
+        
+        category, context, chunks = prepared["category"], prepared["context"], prepared["chunks"]
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.FAN_OUT_CONCURRENCY))
+        queue: asyncio.Queue = asyncio.Queue()
+        errors: List[LLMError] = []
+        failed, retried = [0], [0]
+        
+        async def produce(index: int):
+            async with semaphore:
+                # Hiç soru vermeyen parça bir kez daha denenir
+                for attempt in range(1 + self.FAN_OUT_RETRIES):
+                    produced = 0
+                    retried[0] += 1 if attempt else 0
+                    try:
+                        async for question in self.gemini_client.stream_questions_async(
+                            context=self._chunk_context(context, index, len(chunks)),
+                            category=category,
+                            subcategory=subcategory,
+                            count=chunks[index],
+                            difficulty=difficulty
+                        ):
+                            produced += 1
+                            await queue.put(question)
+                    except LLMError as e:
+                        errors.append(e)
+                    if produced:
+                        return
+                failed[0] += 1
+        
+        async def produce_all():
+            try:
+                await asyncio.gather(*(produce(i) for i in range(len(chunks))))
+            finally:
+                await queue.put(None)
+        
+        producer = asyncio.ensure_future(produce_all())
+        questions: List[Dict] = []
+        duplicate_matches: List[Dict] = []
+        
+        try:
+            while True:
+                question = await queue.get()
+                if question is None:
+                    break
+                kept, matches = self._check_duplicates([question], duplicates)
+                for match in matches:
+                    duplicate_matches.append(match)
+                    yield {"event": "duplicate", "data": match}
+                for question in kept:
+                    question["soru_no"] = len(questions) + 1
+                    questions.append(question)
+                    yield {"event": "question", "data": question}
+        finally:
+            # İstemci akışı yarıda bırakırsa süren çağrılar iptal edilir
+            if not producer.done():
+                producer.cancel()
+        
+        if errors and not questions:
+            error = errors[-1]
+            yield {
+                "event": "error",
+                "data": {"error": str(error), "status_code": error.status_code, "retry_after": error.retry_after}
+            }
+            return
+        
+        fan_out = None
+        if len(chunks) > 1 or retried[0]:
+            fan_out = {"chunks": len(chunks), "failed_chunks": failed[0], "retried_chunks": retried[0]}
+        
+        result = self._store_prediction(
+            category, subcategory, count, difficulty, context, questions, duplicate_matches, fan_out
+        )
+        summary = {key: value for key, value in result.items() if key != "generated_questions"}
+        summary["question_count"] = len(questions)
+        yield {"event": "done", "data": summary}
+    
+    def _prepare_prediction(
+        self,
+        category: Optional[str],
+        subcategory: Optional[str],
+        count: int,
+        difficulty: str,
+        seed: Optional[int],
+        duplicates: str,
+        chunk_size: Optional[int] = None,
+        contexts: Dict[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        İsteği doğrular, kategoriyi belirler, parçaları planlar ve tahminleme bağlamını oluşturur.
+        contexts verilirse bağlamın ortak kısmı kategori başına bir kez kurulup paylaşılır;
+        örnek sorular her istek için ayrıca seçilir.
+        
+        Returns:
+            Dict: {'category', 'context', 'chunks'} veya {'error'}
+        """
         # Validasyon
-        if count < 1 or count > 10:
-            return {"error": "Soru sayısı 1-10 arasında olmalıdır."}
+        if count < 1 or count > self.MAX_QUESTION_COUNT:
+            return {"error": f"Soru sayısı 1-{self.MAX_QUESTION_COUNT} arasında olmalıdır."}
+        
+        chunk_size = chunk_size or self.FAN_OUT_CHUNK_SIZE
+        if chunk_size < 1 or chunk_size > 10:
+            return {"error": "Parça büyüklüğü 1-10 arasında olmalıdır."}
         
         if difficulty.lower() not in self.DIFFICULTY_LEVELS:
             return {"error": f"Geçersiz zorluk seviyesi. Seçenekler: {self.DIFFICULTY_LEVELS}"}
         
+        if duplicates not in self.DUPLICATE_POLICIES:
+            return {"error": f"Geçersiz tekrar politikası. Seçenekler: {self.DUPLICATE_POLICIES}"}
+        
         if category and category not in self.SUPPORTED_CATEGORIES:
             return {
                 "error": f"Geçersiz kategori. Desteklenen kategoriler: {self.SUPPORTED_CATEGORIES}"
@@ -94,19 +720,96 @@ class QuestionPredictor:
             cat_dist = self.data_analyzer.get_category_distribution()
             category = max(cat_dist, key=cat_dist.get) if cat_dist else "Paragrafta Anlam"
         
-        # Tahminleme bağlamını oluştur
-        context = self.data_analyzer.get_prediction_context(category)
+        chunks = self._plan_chunks(count, chunk_size)
+        # Çok parçada her parçaya farklı örnekler düşer
+        n_examples = min(5 + 2 * (len(chunks) - 1), 15)
         
-        # Gemini ile soru üret
-        questions = self.gemini_client.generate_questions(
-            context=context,
-            category=category,
+        if contexts is not None:
+            # Bağlamın ortak kısmı (kalıp analizi, kategori istatistikleri) kategori başına bir kez
+            # kurulur; örnekler her isteğin kendi zorluk ve alt başlığına göre seçilir
+            if category not in contexts:
+                contexts[category] = self.data_analyzer.get_prediction_context(category, n_examples=0)
+            samples = self.data_analyzer.get_context_examples(category, seed, subcategory, difficulty, n_examples)
+            context = dict(contexts[category], sample_questions=samples)
+            return {"category": category, "context": context, "chunks": chunks}
+        
+        context = self.data_analyzer.get_prediction_context(
+            category,
+            seed=seed,
             subcategory=subcategory,
-            count=count,
-            difficulty=difficulty
+            difficulty=difficulty,
+            n_examples=n_examples
         )
         
-        # Sonuçları kaydet
+        return {"category": category, "context": context, "chunks": chunks}
+    
+    @staticmethod
+    def _plan_chunks(count: int, chunk_size: int) -> List[int]:
+        """İstenen sayıyı eşit büyüklükte parçalara böler (ör. 12 -> 4, 4, 4)."""
+        parts = -(-count // chunk_size)
+        return [count // parts + (1 if i < count % parts else 0) for i in range(parts)]
+    
+    @staticmethod
+    def _chunk_context(context: Dict[str, Any], index: int, parts: int) -> Dict[str, Any]:
+        """Parçaya özel bağlam: örnek sorulardan kayan 5'li bir pencere seçilir."""
+        examples = context.get('sample_questions', [])
+        if parts == 1 or len(examples) <= 5:
+            return context
+        start = (2 * index) % len(examples)
+        window = [examples[(start + i) % len(examples)] for i in range(5)]
+        return dict(context, sample_questions=window)
+    
+    def _record_prediction(
+        self,
+        category: str,
+        subcategory: Optional[str],
+        count: int,
+        difficulty: str,
+        duplicates: str,
+        context: Dict[str, Any],
+        chunk_results: List[List[Dict]],
+        retried: int = 0,
+        pooled: List[Dict] = None
+    ) -> Dict[str, Any]:
+        """
+        Parça sonuçlarını birleştirir, tekrar kontrolünden geçirir, numaralar ve geçmişe kaydeder.
+        Havuzdan gelen sorular (pooled) zaten kontrol edildiği için başa eklenir.
+        """
+        questions = [q for result in chunk_results for q in result]
+        
+        # Korpus, önceki üretimler ve parçalar arası yakın kopya kontrolü
+        questions, duplicate_matches = self._check_duplicates(questions, duplicates)
+        if pooled is not None:
+            questions = pooled + questions
+        for number, question in enumerate(questions, 1):
+            question["soru_no"] = number
+        
+        fan_out = None
+        if len(chunk_results) > 1 or retried:
+            fan_out = {
+                "chunks": len(chunk_results),
+                "failed_chunks": sum(1 for result in chunk_results if not result),
+                "retried_chunks": retried
+            }
+        
+        pool = {"served": len(pooled), "generated": len(questions) - len(pooled)} if pooled is not None else None
+        return self._store_prediction(
+            category, subcategory, count, difficulty, context, questions, duplicate_matches, fan_out, pool
+        )
+    
+    def _store_prediction(
+        self,
+        category: str,
+        subcategory: Optional[str],
+        count: int,
+        difficulty: str,
+        context: Dict[str, Any],
+        questions: List[Dict],
+        duplicate_matches: List[Dict],
+        fan_out: Optional[Dict[str, int]] = None,
+        pool: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Tahminleme sonucunu oluşturur ve geçmişe kaydeder."""
         prediction_result = {
             "timestamp": datetime.now().isoformat(),
             "request": {
@@ -116,6 +819,7 @@ class QuestionPredictor:
                 "difficulty": difficulty
             },
             "generated_questions": questions,
+            "duplicates": duplicate_matches,
             "success": len(questions) > 0,
             "analysis_context": {
                 "total_training_data": context.get('total_analyzed_questions', 0),
@@ -124,21 +828,91 @@ class QuestionPredictor:
             }
         }
         
+        if fan_out:
+            prediction_result["fan_out"] = fan_out
+        if pool is not None:
+            prediction_result["pool"] = pool
+        
         self.generated_questions.extend(questions)
-        self.prediction_history.append(prediction_result)
+        self.history.append(prediction_result)
         
         return prediction_result
     
-    def get_2026_predictions(self) -> Dict[str, Any]:
+    def _ensure_duplicate_index(self) -> NearDuplicateIndex:
+        """Yakın kopya indeksini kurar; korpusa eklenen yeni satırları indeksler."""
+        if self.duplicate_index is None:
+            self.duplicate_index = NearDuplicateIndex()
+            self._duplicate_corpus_rows = 0
+            for question in self.generated_questions:
+                if isinstance(question, dict):
+                    self.duplicate_index.add(question_text(question), 'generated', (question.get('soru') or '')[:80])
+        
+        total = self.data_analyzer.get_total_questions()
+        if self._duplicate_corpus_rows < total:
+            self.duplicate_index.add_corpus(self.data_analyzer.data, start=self._duplicate_corpus_rows)
+            self._duplicate_corpus_rows = total
+        
+        return self.duplicate_index
+    
+    def _check_duplicates(self, questions: List[Dict], policy: str = "reject") -> Tuple[List[Dict], List[Dict]]:
+        """
+        Üretilen soruları geçmiş LGS soruları ve önceki üretimlerle karşılaştırır.
+        Aynı yanıt içindeki tekrarlar da yakalanır.
+        
+        Args:
+            questions: Üretilen sorular
+            policy: 'reject' (yakın kopyaları çıkar) veya 'flag' (işaretle)
+            
+        Returns:
+            Tuple: (tutulan sorular, yakın kopya eşleşmeleri)
+        """
+        index = self._ensure_duplicate_index()
+        kept, matches = [], []
+        
+        for question in questions:
+            if not isinstance(question, dict):
+                continue
+            
+            text = question_text(question)
+            signature = index.signature(text)
+            match = index.query(text, signature=signature)
+            
+            if match:
+                matches.append({"soru_no": question.get("soru_no"), "duplicate_of": match})
+                if policy == "reject":
+                    continue
+                question["duplicate_of"] = match
+            else:
+                index.add(text, 'generated', (question.get('soru') or '')[:80], signature=signature)
+            kept.append(question)
+        
+        return kept, matches
+    
+    def get_2026_predictions(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         2026 LGS için genel trend tahminleri döndürür.
         
+        Args:
+            use_cache: False ise cache'teki yanıt kullanılmaz ve tahmin yenilenir
+            
         Returns:
             Dict: Trend tahminleri ve öneriler
         """
-        context = self.data_analyzer.get_prediction_context()
-        trends = self.gemini_client.predict_2026_trends(context)
+        # Trend prompt'u örnek soru kullanmaz
+        context = self.data_analyzer.get_prediction_context(n_examples=0)
+        trends = self.gemini_client.predict_2026_trends(context, use_cache=use_cache)
+        
+        return self._trend_result(context, trends)
+    
+    async def get_2026_predictions_async(self, use_cache: bool = True) -> Dict[str, Any]:
+        """get_2026_predictions'ın asenkron sürümü."""
+        context = self.data_analyzer.get_prediction_context(n_examples=0)
+        trends = await self.gemini_client.predict_2026_trends_async(context, use_cache=use_cache)
         
+        return self._trend_result(context, trends)
+    
+    def _trend_result(self, context: Dict[str, Any], trends: Dict[str, Any]) -> Dict[str, Any]:
+        """Trend tahminini analiz özetiyle birleştirir."""
         return {
             "timestamp": datetime.now().isoformat(),
             "data_analysis_summary": self.data_analyzer.export_analysis_report()['summary'],
@@ -147,25 +921,119 @@ class QuestionPredictor:
             "question_patterns": context.get('question_patterns', {})
         }
     
-    def analyze_question(self, question_text: str) -> Dict[str, Any]:
+    def analyze_question(self, question_text: str, use_cache: bool = True, narrative: bool = True) -> Dict[str, Any]:
         """
         Bir soruyu analiz eder.
+        Kategori, alt kategori ve zorluk yerel sınıflandırıcıyla bulunur. Kategori güveni
+        düşükse analizin tamamı Gemini'den alınır; alt kategori yol gösterici olarak döner ve
+        güveni düşükse işaretlenir. Aksi halde Gemini'ye sadece anlatı alanları (kazanımlar,
+        ipuçları) için gidilir. narrative=False ise Gemini hiç çağrılmaz; kategori güveni
+        düşük olsa da yerel sonuç 'dusuk_guven' işaretiyle döner.
         
         Args:
             question_text: Analiz edilecek soru
+            use_cache: False ise cache'teki yanıt kullanılmaz
+            narrative: False ise kazanımlar ve ipuçları üretilmez ve Gemini çağrılmaz
+                       (sadece yerel sınıflandırma)
             
         Returns:
             Dict: Analiz sonuçları
         """
-        # Türkçe dersi kontrolü
-        if not self.gemini_client.is_turkish_related(question_text):
-            return {
-                "error": "Bu soru Türkçe dersiyle ilgili görünmüyor.",
-                "message": "Bu sistem sadece LGS Türkçe soruları için tasarlanmıştır."
-            }
+        local, error = self._classify_for_analysis(question_text, narrative)
+        if error:
+            return error
+        
+        if narrative and not self._is_confident(local):
+            self.analysis_stats['llm'] += 1
+            analysis = self.gemini_client.analyze_question(question_text, use_cache=use_cache)
+            return self._analysis_result(question_text, self._llm_analysis(analysis, local))
+        
+        narrative_fields = (
+            self.gemini_client.analyze_narrative(question_text, local, use_cache=use_cache) if narrative else None
+        )
+        return self._analysis_result(question_text, self._local_analysis(local, narrative_fields))
+    
+    async def analyze_question_async(
+        self,
+        question_text: str,
+        use_cache: bool = True,
+        narrative: bool = True
+    ) -> Dict[str, Any]:
+        """analyze_question'ın asenkron sürümü."""
+        local, error = self._classify_for_analysis(question_text, narrative)
+        if error:
+            return error
         
-        analysis = self.gemini_client.analyze_question(question_text)
+        if narrative and not self._is_confident(local):
+            self.analysis_stats['llm'] += 1
+            analysis = await self.gemini_client.analyze_question_async(question_text, use_cache=use_cache)
+            return self._analysis_result(question_text, self._llm_analysis(analysis, local))
         
+        narrative_fields = (
+            await self.gemini_client.analyze_narrative_async(question_text, local, use_cache=use_cache)
+            if narrative else None
+        )
+        return self._analysis_result(question_text, self._local_analysis(local, narrative_fields))
+    
+    def _classify_for_analysis(
+        self,
+        question_text: str,
+        narrative: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+        """
+        Yerel sınıflandırma; ders dışı sorular için hata sözlüğü döner.
+        narrative=False iken sınıflandırıcı kullanılamıyorsa da hata döner (Gemini'ye gidilmez).
+        """
+        local = self.data_analyzer.classify_question(question_text)
+        if local is not None and local["ders_disi"]:
+            self.analysis_stats['off_topic'] += 1
+            return local, self._off_topic_error(local["ders_disi_nedeni"])
+        if local is None and not narrative:
+            return None, {"error": "Yerel sınıflandırıcı kullanılamıyor; analiz için narrative=True gönderin."}
+        return local, None
+    
+    def _is_confident(self, local: Optional[Dict[str, Any]]) -> bool:
+        """Yerel kategori tahmini güven eşiğini geçiyor mu (alt kategori sadece yol göstericidir)."""
+        return local is not None and local["guven"]["kategori"] >= self.analysis_confidence
+    
+    def _local_analysis(self, local: Dict[str, Any], narrative_fields: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Yerel sınıflandırmayı (ve istendiyse Gemini'nin anlatı alanlarını) analiz sonucuna çevirir."""
+        self.analysis_stats['local_with_narrative' if narrative_fields is not None else 'local'] += 1
+        result = {
+            "kategori": local["kategori"],
+            "alt_kategori": local["alt_kategori"],
+            "zorluk": local["zorluk"],
+            **(narrative_fields or {}),
+            "guven": local["guven"],
+            "alt_kategori_dusuk_guven": local["guven"]["alt_kategori"] < self.analysis_confidence,
+            "kaynak": "yerel+gemini" if narrative_fields is not None else "yerel"
+        }
+        if not self._is_confident(local):
+            # Sadece narrative=False iken: kategori de yol göstericidir
+            result["dusuk_guven"] = True
+            result["alternatifler"] = local["alternatifler"]
+        return result
+    
+    @staticmethod
+    def _llm_analysis(analysis: Dict[str, Any], local: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Gemini analizine düşük güvenli yerel tahmini ekler."""
+        result = {**analysis, "kaynak": "gemini"}
+        if local is not None:
+            result["yerel_tahmin"] = {
+                key: local[key] for key in ("kategori", "alt_kategori", "zorluk", "guven", "alternatifler")
+            }
+        return result
+    
+    @staticmethod
+    def _off_topic_error(reason: str = None) -> Dict[str, str]:
+        return {
+            "error": f"Bu soru Türkçe dersiyle ilgili görünmüyor: {reason}." if reason
+            else "Bu soru Türkçe dersiyle ilgili görünmüyor.",
+            "message": "Bu sistem sadece LGS Türkçe soruları için tasarlanmıştır."
+        }
+    
+    @staticmethod
+    def _analysis_result(question_text: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "timestamp": datetime.now().isoformat(),
             "question": question_text[:500] + "..." if len(question_text) > 500 else question_text,
@@ -186,25 +1054,71 @@ class QuestionPredictor:
             "top_keywords": self.data_analyzer.get_keyword_frequency(30)
         }
     
+    def get_top_keywords(
+        self,
+        top_n: int = 30,
+        category: str = None,
+        year: str = None
+    ) -> List[tuple]:
+        """
+        En sık anahtar kelimeleri döndürür (kategori/yıl filtreli).
+        
+        Args:
+            top_n: Döndürülecek kelime sayısı
+            category: Opsiyonel kategori filtresi
+            year: Opsiyonel yıl filtresi
+            
+        Returns:
+            List: (kelime, frekans) tuple listesi
+        """
+        return self.data_analyzer.get_keyword_frequency(top_n, category=category, year=year)
+    
+    def search_questions(
+        self,
+        query: str,
+        top_k: int = 10,
+        category: str = None,
+        year: str = None
+    ) -> List[Dict]:
+        """
+        Geçmiş LGS sorularında tam metin arama yapar.
+        
+        Args:
+            query: Arama ifadesi
+            top_k: Döndürülecek sonuç sayısı
+            category: Opsiyonel kategori filtresi
+            year: Opsiyonel yıl filtresi
+            
+        Returns:
+            List: {'score', 'question'} sonuçları (skora göre azalan)
+        """
+        results = self.data_analyzer.search(query, top_k=top_k, category=category, year=year)
+        return [
+            {"score": round(score, 4), "question": question}
+            for question, score in results
+        ]
+    
     def get_sample_questions_by_category(
         self, 
         category: str, 
-        count: int = 5
-    ) -> List[Dict]:
+        count: int = 5,
+        seed: int = None
+    ) -> List[QuestionView]:
         """
         Belirli bir kategoriden örnek sorular döndürür.
         
         Args:
             category: Kategori adı
             count: Döndürülecek soru sayısı
+            seed: Opsiyonel seed (tekrarlanabilir örnekleme)
             
         Returns:
-            List: Örnek sorular
+            List: Örnek soru görünümleri (API'de to_dict ile serileştirilir)
         """
         if category not in self.SUPPORTED_CATEGORIES:
             return []
         
-        return self.data_analyzer.get_sample_questions(category, count)
+        return self.data_analyzer.get_sample_questions(category, count, seed=seed)
     
     def export_generated_questions(self, file_path: str = None) -> str:
         """
@@ -222,7 +1136,7 @@ class QuestionPredictor:
         export_data = {
             "export_timestamp": datetime.now().isoformat(),
             "total_questions": len(self.generated_questions),
-            "questions": self.generated_questions
+            "questions": list(self.generated_questions)
         }
         
         with open(file_path, 'w', encoding='utf-8') as f:
@@ -232,17 +1146,48 @@ class QuestionPredictor:
     
     def get_prediction_history(self) -> List[Dict]:
         """
-        Tahminleme geçmişini döndürür.
+        Bellekteki son tahminleme kayıtlarını döndürür.
         
         Returns:
-            List: Tahminleme geçmişi
+            List: Tahminleme geçmişi (eskiden yeniye)
+        """
+        return self.history.recent()
+    
+    def get_history_page(
+        self,
+        cursor: int = None,
+        limit: int = 10,
+        category: str = None,
+        difficulty: str = None,
+        since: str = None,
+        until: str = None
+    ) -> Dict[str, Any]:
         """
-        return self.prediction_history
+        Tahminleme geçmişini yeniden eskiye, imleçle sayfalar.
+        
+        Args:
+            cursor: Önceki sayfanın next_cursor değeri
+            limit: Sayfadaki en fazla kayıt
+            category: Kategori filtresi
+            difficulty: Zorluk filtresi
+            since: Bu zamandan (ISO 8601) sonraki kayıtlar
+            until: Bu zamandan (ISO 8601) önceki kayıtlar
+            
+        Returns:
+            Dict: items, next_cursor ve total
+        """
+        return self.history.page(
+            cursor=cursor, limit=limit, category=category, difficulty=difficulty, since=since, until=until
+        )
     
     def clear_generated_questions(self):
-        """Üretilen soruları temizler."""
-        self.generated_questions = []
-        self.prediction_history = []
+        """Üretilen soruları ve tahmin geçmişini temizler."""
+        self.generated_questions.clear()
+        self.history.clear()
+        self.duplicate_index = None
+        if self.question_pool is not None:
+            # Havuzdaki sorular sıfırlanan tekrar indeksinde yer almaz
+            self.question_pool.clear()
     
     def get_subcategories(self, category: str) -> List[str]:
         """
@@ -0,0 +1,109 @@
+"""
+LGS Türkçe Soru Tahminleme - Soru Kayıt Modülü
+Kompakt soru kaydı ve sütunlar üzerinde tembel satır görünümü
+"""
+
+from collections.abc import Mapping
+from typing import Dict, List, Any, Iterator
+
+
+# Soru alanı -> veri sütunu (API'nin döndürdüğü dict şekli)
+QUESTION_FIELDS = (
+    ('ticket_id', 'Ticket_ID'),
+    ('kategori', 'Kategori'),
+    ('alt_baslik', 'Alt Başlık'),
+    ('metin', 'Metinler'),
+    ('soru_koku', 'Soru Kökleri'),
+    ('cevap', 'Cevaplar'),
+    ('keywords', 'Keywords')
+)
+
+_FIELD_NAMES = tuple(name for name, _ in QUESTION_FIELDS)
+_FIELD_COLUMNS = dict(QUESTION_FIELDS)
+
+
+class Question(Mapping):
+    """
+    __slots__ ile tutulan kompakt soru kaydı.
+    Mapping arayüzü sayesinde mevcut dict kullanan kodla (q.get(...)) uyumludur.
+    """
+
+    __slots__ = _FIELD_NAMES
+
+    def __init__(self, ticket_id, kategori, alt_baslik, metin, soru_koku, cevap, keywords):
+        self.ticket_id = ticket_id
+        self.kategori = kategori
+        self.alt_baslik = alt_baslik
+        self.metin = metin
+        self.soru_koku = soru_koku
+        self.cevap = cevap
+        self.keywords = keywords
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELD_NAMES)
+
+    def __len__(self) -> int:
+        return len(_FIELD_NAMES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API yanıtı için dict'e çevirir."""
+        return {name: getattr(self, name) for name in _FIELD_NAMES}
+
+    def __repr__(self) -> str:
+        return f"Question({self.ticket_id!r})"
+
+
+class QuestionView(Mapping):
+    """
+    Sütun bazlı veride tek bir satırın tembel görünümü.
+    Alan değerleri sadece erişildiğinde ilgili sütundan okunur.
+    """
+
+    __slots__ = ('_data', '_row')
+
+    def __init__(self, data: Dict[str, List[Any]], row: int):
+        self._data = data
+        self._row = row
+
+    @property
+    def row(self) -> int:
+        """Korpustaki satır numarası."""
+        return self._row
+
+    def __getitem__(self, key: str) -> Any:
+        column = _FIELD_COLUMNS.get(key)
+        if column is None:
+            raise KeyError(key)
+        return self._data[column][self._row]
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _FIELD_COLUMNS:
+            return self[name]
+        raise AttributeError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELD_NAMES)
+
+    def __len__(self) -> int:
+        return len(_FIELD_NAMES)
+
+    def materialize(self) -> Question:
+        """Görünümü sütunlardan bağımsız kompakt bir kayda kopyalar."""
+        return Question(*(self[name] for name in _FIELD_NAMES))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API yanıtı için dict'e çevirir."""
+        return {name: self[name] for name in _FIELD_NAMES}
+
+    def __repr__(self) -> str:
+        return f"QuestionView(row={self._row})"
+
+
+def to_dicts(questions: List[Mapping]) -> List[Dict[str, Any]]:
+    """Soru kayıtlarını/görünümlerini API sınırında dict listesine çevirir."""
+    return [q.to_dict() if hasattr(q, 'to_dict') else dict(q) for q in questions]
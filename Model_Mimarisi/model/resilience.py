@@ -0,0 +1,373 @@
+"""
+LGS Türkçe Soru Tahminleme - Dayanıklılık Modülü
+LLM çağrıları için token bucket hız sınırı, jitter'lı yeniden deneme,
+zaman aşımı ve devre kesici
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from .exceptions import (
+    LLMError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+    LLMResponseError,
+    CircuitOpenError
+)
+
+
+T = TypeVar('T')
+
+
+def estimate_tokens(text: str) -> int:
+    """Prompt'un yaklaşık token sayısı (Türkçe için ~4 karakter/token)."""
+    return max(1, len(text) // 4)
+
+
+def classify_error(exc: BaseException) -> LLMError:
+    """
+    SDK/ağ hatasını tipli LLM hatasına çevirir.
+    google.api_core hataları HTTP kodunu `code` özelliğinde taşır.
+
+    Args:
+        exc: Yakalanan hata
+
+    Returns:
+        LLMError: Tipli hata
+    """
+    if isinstance(exc, LLMError):
+        return exc
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return LLMTimeoutError(f"Gemini çağrısı zaman aşımına uğradı: {exc}")
+
+    code = getattr(exc, 'code', None)
+    code = getattr(code, 'value', code)
+    if code == 429:
+        return LLMRateLimitError(f"Gemini kotası aşıldı: {exc}")
+    if code == 504:
+        return LLMTimeoutError(f"Gemini zaman aşımı: {exc}")
+    if code in (500, 502, 503):
+        return LLMUnavailableError(f"Gemini geçici olarak erişilemez: {exc}")
+    if isinstance(exc, (ConnectionError, OSError)):
+        return LLMUnavailableError(f"Gemini bağlantı hatası: {exc}")
+    return LLMResponseError(f"Gemini hatası: {exc}")
+
+
+class TokenBucket:
+    """
+    Dakikalık kota için token bucket.
+    Rezervasyon yapılır: bakiye eksiye düşebilir, bekleyenler sırayla hizmet alır.
+    """
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        """
+        Args:
+            per_minute: Dakikada dolan token
+            capacity: Kova kapasitesi (varsayılan: dakikalık kota)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Token ayırır.
+
+        Args:
+            amount: İstenen token
+
+        Returns:
+            float: Token'lar hazır olana kadar beklenecek süre (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Kullanılmayan rezervasyonu geri verir."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+
+class RateLimiter:
+    """İstek/dakika ve token/dakika kotalarını birlikte uygulayan istemci tarafı limit."""
+
+    def __init__(self, rpm: float = 15, tpm: float = 1_000_000, max_wait: float = 30.0):
+        """
+        Args:
+            rpm: Dakikalık istek kotası
+            tpm: Dakikalık token kotası
+            max_wait: Bundan uzun beklenecekse LLMRateLimitError fırlatılır
+        """
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_wait = max_wait
+        self.waited = 0.0
+        self.rejected = 0
+
+    def _reserve(self, tokens: int) -> float:
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if wait > self.max_wait:
+            self.requests.refund(1)
+            self.tokens.refund(tokens)
+            self.rejected += 1
+            raise LLMRateLimitError(
+                f"İstemci tarafı kota doldu, {wait:.1f} sn sonra tekrar deneyin.",
+                retry_after=wait
+            )
+        self.waited += wait
+        return wait
+
+    async def acquire(self, tokens: int = 1):
+        """Kota uygunsa hemen, değilse gereken süre bekleyerek izin alır."""
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: int = 1):
+        """acquire'ın senkron sürümü."""
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Kota hemen uygunsa izin alır; beklemek gerekecekse rezervasyonu geri verip False döner."""
+        if self.requests.reserve(1) or self.tokens.reserve(tokens):
+            self.requests.refund(1)
+            self.tokens.refund(tokens)
+            return False
+        return True
+
+
+class CircuitBreaker:
+    """
+    Ardışık hatalarda devreyi açar ve upstream'e gitmeden hızlıca reddeder.
+    Bekleme süresi dolunca tek bir deneme çağrısına izin verir (half-open).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0):
+        """
+        Args:
+            failure_threshold: Devreyi açan ardışık hata sayısı
+            recovery_time: Açık devrenin deneme çağrısına izin vermeden önce beklediği süre
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Çağrıdan önce kontrol; devre açıksa CircuitOpenError fırlatır.
+
+        Returns:
+            bool: Çağrı half-open deneme çağrısıysa True
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            remaining = self.opened_at + self.recovery_time - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                # Tek deneme çağrısı
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+            raise CircuitOpenError(
+                "Gemini servisi şu an sağlıklı değil, istek gönderilmedi.",
+                retry_after=max(remaining, 1.0)
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def abandon(self, trial: bool):
+        """
+        Sonuçsuz kalan çağrıyı (iptal, kota reddi) kapatır.
+        Deneme çağrısı sonuçlanmadıysa devre tekrar açılır; bekleme süresi zaten
+        dolduğundan sıradaki çağrı yeni deneme çağrısı olur.
+        """
+        with self._lock:
+            if trial and self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+
+class ResilientCaller:
+    """
+    LLM çağrılarını hız sınırı, zaman aşımı, jitter'lı üstel geri çekilmeyle
+    yeniden deneme ve devre kesici ile sarar. Hatalar tipli LLMError olarak yükselir.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 15,
+        tpm: float = 1_000_000,
+        timeout: float = 60.0,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        max_wait: float = 30.0
+    ):
+        """
+        Args:
+            rpm: Dakikalık istek kotası
+            tpm: Dakikalık token kotası
+            timeout: Tek çağrı zaman aşımı (saniye)
+            max_attempts: Toplam deneme sayısı
+            base_delay: İlk yeniden deneme için üst sınır (saniye)
+            max_delay: Yeniden deneme beklemesi üst sınırı (saniye)
+            failure_threshold: Devre kesiciyi açan ardışık hata sayısı
+            recovery_time: Devre kesicinin açık kalma süresi (saniye)
+            max_wait: Kota için en fazla bekleme (saniye)
+        """
+        self.limiter = RateLimiter(rpm, tpm, max_wait)
+        self.breaker = CircuitBreaker(failure_threshold, recovery_time)
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._stats = {'calls': 0, 'retries': 0, 'failures': 0}
+
+    def backoff(self, attempt: int, error: LLMError = None) -> float:
+        """Full-jitter üstel geri çekilme süresi (upstream retry_after verdiyse en az o kadar)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if error is not None and error.retry_after:
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        return delay
+
+    def _on_error(self, exc: BaseException, attempt: int) -> LLMError:
+        """Hatayı sınıflandırır; tekrar denenemiyorsa fırlatır."""
+        error = classify_error(exc)
+        if isinstance(error, CircuitOpenError):
+            raise error
+        if error.retryable:
+            # Sadece upstream sağlığıyla ilgili hatalar devre kesiciyi açar
+            self.breaker.record_failure()
+        else:
+            # Upstream yanıt verdi (ör. geçersiz istek): servis sağlıklı sayılır
+            self.breaker.record_success()
+        if not error.retryable or attempt + 1 >= self.max_attempts:
+            self._stats['failures'] += 1
+            raise error from exc
+        self._stats['retries'] += 1
+        return error
+
+    async def call(self, fn: Callable[[], Awaitable[T]], tokens: int = 1) -> T:
+        """
+        Asenkron çağrıyı dayanıklılık katmanından geçirir.
+
+        Args:
+            fn: Çağrıyı başlatan fonksiyon (her denemede yeniden çağrılır)
+            tokens: Tahmini prompt token sayısı
+
+        Returns:
+            Çağrının sonucu
+        """
+        self._stats['calls'] += 1
+        for attempt in range(self.max_attempts):
+            trial = self.breaker.before_call()
+            settled = False
+            try:
+                await self.limiter.acquire(tokens)
+                try:
+                    result = await asyncio.wait_for(fn(), self.timeout)
+                except Exception as exc:
+                    settled = True
+                    error = self._on_error(exc, attempt)
+                else:
+                    settled = True
+                    self.breaker.record_success()
+                    return result
+            finally:
+                # İptal (istemci bağlantıyı kesti, toplu istek iptal edildi) veya kota reddi
+                if not settled:
+                    self.breaker.abandon(trial)
+            await asyncio.sleep(self.backoff(attempt, error))
+
+    def call_sync(self, fn: Callable[[], T], tokens: int = 1) -> T:
+        """
+        Senkron çağrıyı dayanıklılık katmanından geçirir.
+        Zaman aşımı çağrının kendisine (SDK request_options) verilmelidir.
+        """
+        self._stats['calls'] += 1
+        for attempt in range(self.max_attempts):
+            trial = self.breaker.before_call()
+            settled = False
+            try:
+                self.limiter.acquire_sync(tokens)
+                try:
+                    result = fn()
+                except Exception as exc:
+                    settled = True
+                    error = self._on_error(exc, attempt)
+                else:
+                    settled = True
+                    self.breaker.record_success()
+                    return result
+            finally:
+                if not settled:
+                    self.breaker.abandon(trial)
+            time.sleep(self.backoff(attempt, error))
+
+    async def stream(self, fn: Callable[[], Awaitable[Any]], tokens: int = 1) -> AsyncIterator[Any]:
+        """
+        Akışlı çağrıyı dayanıklılık katmanından geçirir.
+        Akışın açılması call() ile yapılır (kota, devre kesici, yeniden deneme);
+        parçalar gelmeye başladıktan sonra kısmi yanıt tekrarlanamayacağından
+        hata yeniden denenmeden yükselir. Zaman aşımı her parça için ayrı uygulanır.
+
+        Args:
+            fn: Akışı başlatan fonksiyon (async iterable yanıt döndürür)
+            tokens: Tahmini prompt token sayısı
+
+        Yields:
+            Akışın parçaları
+        """
+        response = await self.call(fn, tokens)
+        iterator = response.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), self.timeout)
+            except StopAsyncIteration:
+                return
+            except Exception as exc:
+                error = classify_error(exc)
+                if error.retryable:
+                    self.breaker.record_failure()
+                self._stats['failures'] += 1
+                raise error from exc
+            yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        """Dayanıklılık istatistikleri (devre durumu, yeniden denemeler, kota beklemeleri)."""
+        return {
+            **self._stats,
+            'circuit_state': self.breaker.state,
+            'circuit_rejected': self.breaker.rejected,
+            'rate_limited': self.limiter.rejected,
+            'rate_wait_seconds': round(self.limiter.waited, 2)
+        }
@@ -0,0 +1,279 @@
+"""
+LGS Türkçe Soru Tahminleme - LLM Yanıt Cache Modülü
+Normalize edilmiş prompt özetine göre yanıt cache'i (bellek LRU veya SQLite)
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional, Union
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Boşluk farklarının ayrı cache girdisi oluşturmaması için prompt'u sadeleştirir."""
+    return _WHITESPACE_RE.sub(' ', prompt).strip()
+
+
+def prompt_digest(model_name: str, generation_config: Dict[str, Any], prompt: str) -> str:
+    """
+    (model, üretim ayarları, normalize prompt) üçlüsünün SHA-256 özeti.
+
+    Args:
+        model_name: Model adı
+        generation_config: Üretim ayarları
+        prompt: Prompt metni
+
+    Returns:
+        str: Hex özet
+    """
+    payload = json.dumps(
+        [model_name, generation_config or {}, normalize_prompt(prompt)],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CacheBackend:
+    """Cache saklama arayüzü: anahtar -> yanıt metni, süre aşımıyla."""
+
+    name = 'base'
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str):
+        raise NotImplementedError
+
+    def purge(self, prefix: str = None):
+        """Önekle başlamayan (prefix verilmezse tüm) girdileri siler."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Süre aşımlı LRU bellek cache'i (süreç ömrü boyunca)."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600):
+        """
+        Args:
+            max_entries: En fazla girdi sayısı (aşılınca en eski kullanılan silinir)
+            ttl: Girdi ömrü (saniye)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def purge(self, prefix: str = None):
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if not k.startswith(prefix)]:
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Disk üzerinde SQLite cache'i (yeniden başlatmalarda ve worker'lar arasında korunur)."""
+
+    name = 'sqlite'
+
+    def __init__(self, path: Union[str, Path], ttl: float = 86400):
+        """
+        Args:
+            path: SQLite dosya yolu
+            ttl: Girdi ömrü (saniye)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)'
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                with self._conn:
+                    self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            return row[0]
+
+    def set(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, value, expires) VALUES (?, ?, ?)',
+                (key, value, time.time() + self.ttl)
+            )
+
+    def purge(self, prefix: str = None):
+        with self._lock, self._conn:
+            if prefix is None:
+                self._conn.execute('DELETE FROM responses')
+            else:
+                self._conn.execute(
+                    'DELETE FROM responses WHERE substr(key, 1, ?) != ? OR expires < ?',
+                    (len(prefix), prefix, time.time())
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class ResponseCache:
+    """
+    LLM yanıt cache'i.
+    Anahtar (model, üretim ayarları, normalize prompt) üçlüsünün SHA-256 özetidir ve
+    korpus sürümüyle ön eklenir; korpus değişince eski girdiler kendiliğinden geçersiz olur.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend = None,
+        namespace: Union[str, Callable[[], str]] = ''
+    ):
+        """
+        Args:
+            backend: Saklama katmanı (varsayılan: MemoryCacheBackend)
+            namespace: Anahtar öneki veya onu döndüren fonksiyon (ör. korpus sürümü)
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.namespace = namespace
+        self._active_namespace = None
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'bypassed': 0}
+
+    def _current_namespace(self) -> str:
+        namespace = self.namespace() if callable(self.namespace) else self.namespace
+        if namespace != self._active_namespace:
+            # Korpus sürümü değişti: diğer sürümlerin girdileri temizlenir
+            self.backend.purge(f"{namespace}:")
+            self._active_namespace = namespace
+        return namespace
+
+    def make_key(self, model_name: str, generation_config: Dict[str, Any], prompt: str) -> str:
+        """
+        Cache anahtarını üretir.
+
+        Args:
+            model_name: Model adı
+            generation_config: Üretim ayarları
+            prompt: Prompt metni
+
+        Returns:
+            str: '<korpus sürümü>:<sha256>' biçiminde anahtar
+        """
+        digest = prompt_digest(model_name, generation_config, prompt)
+        return f"{self._current_namespace()}:{digest}"
+
+    def get(self, key: str, bypass: bool = False) -> Optional[str]:
+        """
+        Cache'teki yanıtı döndürür.
+
+        Args:
+            key: make_key ile üretilmiş anahtar
+            bypass: True ise cache okunmaz (yanıt yine de yazılabilir)
+
+        Returns:
+            str veya None
+        """
+        if bypass:
+            self._stats['bypassed'] += 1
+            return None
+        value = self.backend.get(key)
+        self._stats['hits' if value is not None else 'misses'] += 1
+        return value
+
+    def set(self, key: str, value: str):
+        """Yanıtı cache'e yazar."""
+        self.backend.set(key, value)
+        self._stats['writes'] += 1
+
+    def clear(self):
+        """Tüm girdileri siler."""
+        self.backend.purge()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache istatistikleri (isabet oranı, boyut, arka uç)."""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            'backend': self.backend.name,
+            'entries': len(self.backend),
+            **self._stats,
+            'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0.0
+        }
+
+
+def create_response_cache(
+    backend: str = 'memory',
+    path: Union[str, Path] = None,
+    ttl: float = 3600,
+    namespace: Union[str, Callable[[], str]] = ''
+) -> Optional[ResponseCache]:
+    """
+    Ayar değerlerinden yanıt cache'i oluşturur.
+
+    Args:
+        backend: 'memory', 'sqlite' veya 'none'
+        path: SQLite dosya yolu (sqlite için)
+        ttl: Girdi ömrü (saniye)
+        namespace: Anahtar öneki veya onu döndüren fonksiyon
+
+    Returns:
+        ResponseCache veya None (cache kapalı)
+    """
+    backend = (backend or 'none').lower()
+    if backend == 'memory':
+        return ResponseCache(MemoryCacheBackend(ttl=ttl), namespace)
+    if backend == 'sqlite':
+        if not path:
+            raise ValueError("SQLite cache için dosya yolu gerekli.")
+        return ResponseCache(SQLiteCacheBackend(path, ttl=ttl), namespace)
+    if backend == 'none':
+        return None
+    raise ValueError(f"Bilinmeyen cache türü: {backend}")
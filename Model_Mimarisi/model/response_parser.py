@@ -0,0 +1,316 @@
+"""
+LGS Türkçe Soru Tahminleme - Yanıt Ayrıştırma Modülü
+LLM yanıtındaki JSON'u tek geçişte çıkarır, soruları şemaya göre doğrular ve
+parça parça gelen metinden artımlı olarak ayrıştırır
+"""
+
+import json
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+
+OPTION_KEYS = ('A', 'B', 'C', 'D')
+_CLOSERS = {'[': ']', '{': '}'}
+# Tarama sadece yapısal karakterlerde durur; aradaki metin atlanır
+_TOKEN_RE = re.compile(r'["\\{}\[\]]')
+# Nesne dizisinin (veya boş dizinin) başlangıcı; açıklamadaki "[2]" gibi parantezler atlanır
+_ARRAY_START_RE = re.compile(r'\[\s*[{\]]')
+_DECODER = json.JSONDecoder()
+
+
+class IncrementalArrayParser:
+    """
+    Akış halinde gelen metinde ilk JSON dizisinin elemanı olan nesneleri,
+    kapanış parantezi gelir gelmez döndürür.
+    Metin tek geçişte taranır; sadece tamamlanmamış nesnenin metni bellekte tutulur.
+    Dizi öncesindeki açıklama ve kod bloğu işaretleri (```json) atlanır; nesne içermeden
+    kapanan dizi (ör. açıklamadaki "[2]") yok sayılır ve sıradaki diziye geçilir.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._pending: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Yeni gelen metin parçasını işler.
+
+        Args:
+            text: Yanıtın sıradaki parçası
+
+        Returns:
+            List: Bu parçayla tamamlanan dizi elemanları (nesneler)
+        """
+        items = []
+        if self.finished or not text:
+            return items
+
+        i, n = 0, len(text)
+        start = 0 if self._depth else None  # Parça içinde süren nesnenin başlangıcı
+
+        if self._escape:
+            # Önceki parça kaçış karakteriyle bitti
+            self._escape = False
+            i = 1
+
+        while i < n:
+            if not self.started:
+                i = text.find('[', i)
+                if i == -1:
+                    break
+                self.started = True
+                i += 1
+                continue
+
+            match = _TOKEN_RE.search(text, i)
+            if match is None:
+                break
+            i = match.start()
+            c = text[i]
+
+            if self._in_string:
+                if c == '\\':
+                    if i + 1 == n:
+                        self._escape = True
+                    i += 2
+                    continue
+                if c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif self._depth == 0:
+                # Dizi seviyesi: nesne başlangıcı veya dizi sonu beklenir
+                if c == '{':
+                    self._depth = 1
+                    start = i
+                elif c == ']':
+                    if not self.count:
+                        self.started = False
+                        i += 1
+                        continue
+                    self.finished = True
+                    break
+            elif c in '{[':
+                self._depth += 1
+            elif c in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pending.append(text[start:i + 1])
+                    self._emit(''.join(self._pending), items)
+                    self._pending = []
+                    start = None
+            i += 1
+
+        if start is not None and self._depth:
+            self._pending.append(text[start:])
+        return items
+
+    @property
+    def incomplete(self) -> bool:
+        """Metin bir nesnenin ortasında bittiyse True (yanıt yarıda kesilmiş)."""
+        return self._depth > 0
+
+    def _emit(self, raw: str, items: List[Any]):
+        index = self.count
+        self.count += 1
+        try:
+            items.append(json.loads(raw))
+        except json.JSONDecodeError as e:
+            self.errors.append({
+                "index": index,
+                "errors": [f"Nesne ayrıştırılamadı: {e.msg} ({raw[:80]}...)"]
+            })
+
+
+def _content_start(text: str) -> int:
+    """Kod bloğu (```json) varsa içeriğinin başladığı konum, yoksa 0."""
+    fence = text.find('```')
+    if fence == -1:
+        return 0
+    newline = text.find('\n', fence)
+    return newline + 1 if newline != -1 else fence + 3
+
+
+def array_start(text: str, pos: int = 0) -> int:
+    """Metinde `pos`tan itibaren ilk nesne dizisinin (veya boş dizinin) konumu, yoksa -1."""
+    match = _ARRAY_START_RE.search(text, pos)
+    return match.start() if match else -1
+
+
+def _loads(raw: str) -> Tuple[Optional[Any], Optional[str]]:
+    try:
+        return json.loads(raw), None
+    except json.JSONDecodeError as e:
+        return None, f"{e.msg} (konum {e.pos})"
+
+
+def extract_json(text: str, opener: str = '{') -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Metindeki ilk JSON nesnesini (veya dizisini) tek geçişte çıkarır.
+    Kod bloğu işaretleri atlanır ve eşleşen kapanış parantezinde durulur; sondaki
+    açıklamalar dikkate alınmaz. Yanıt yarıda kesildiyse açık kalan string ve
+    parantezler kapatılarak ayrıştırma denenir.
+
+    Args:
+        text: LLM yanıtı
+        opener: '{' (nesne) veya '[' (nesne dizisi)
+
+    Returns:
+        Tuple: (ayrıştırılan değer veya None, hata mesajı veya None)
+    """
+    def find(pos: int) -> int:
+        return array_start(text, pos) if opener == '[' else text.find(opener, pos)
+
+    start = find(_content_start(text))
+    if start == -1:
+        start = find(0)
+    if start == -1:
+        return None, "Yanıtta JSON bulunamadı"
+
+    # Hızlı yol: iyi biçimli yanıt C ayrıştırıcısıyla tek seferde okunur, sondaki metin yok sayılır
+    try:
+        return _DECODER.raw_decode(text, start)[0], None
+    except json.JSONDecodeError:
+        pass
+
+    stack: List[str] = []
+    in_string = escape = False
+    i, n = start, len(text)
+    while True:
+        match = _TOKEN_RE.search(text, i)
+        if match is None:
+            break
+        i = match.start()
+        c = text[i]
+        if in_string:
+            if c == '\\':
+                if i + 1 == n:
+                    escape = True
+                i += 2
+                continue
+            if c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in _CLOSERS:
+            stack.append(_CLOSERS[c])
+        elif c in ']}':
+            if c != stack[-1]:
+                return None, f"Beklenmeyen '{c}' (konum {i})"
+            stack.pop()
+            if not stack:
+                return _loads(text[start:i + 1])
+        i += 1
+
+    # Yarıda kesilmiş yanıt: açık string ve parantezler kapatılır
+    raw = text[start:]
+    if in_string:
+        raw = (raw[:-1] if escape else raw) + '"'
+    raw = raw.rstrip().rstrip(',')
+    value, error = _loads(raw + ''.join(reversed(stack)))
+    if error:
+        return None, f"Yanıt yarıda kesilmiş ve onarılamadı: {error}"
+    return value, None
+
+
+def validate_question(question: Any) -> List[str]:
+    """
+    Üretilen soruyu şemaya göre doğrular.
+    Geçerli sorularda seçenek anahtarları ve doğru cevap büyük harfe çevrilir ("b)" -> "B").
+
+    Args:
+        question: Ayrıştırılmış soru
+
+    Returns:
+        List: Hata mesajları (boşsa soru geçerli)
+    """
+    if not isinstance(question, dict):
+        return ["Soru bir JSON nesnesi değil"]
+
+    errors = []
+    if not str(question.get('soru') or '').strip():
+        errors.append("'soru' alanı boş")
+
+    options = question.get('secenekler')
+    if isinstance(options, dict):
+        options = {str(key).strip().upper(): value for key, value in options.items()}
+        missing = [key for key in OPTION_KEYS if not str(options.get(key) or '').strip()]
+        extra = [key for key in options if key not in OPTION_KEYS]
+        if missing:
+            errors.append(f"Eksik seçenekler: {', '.join(missing)}")
+        if extra:
+            errors.append(f"Fazla seçenekler: {', '.join(extra)}")
+    else:
+        errors.append("'secenekler' A-D anahtarlı bir nesne olmalı")
+
+    answer = str(question.get('dogru_cevap') or '').strip().upper().rstrip(').')
+    if answer not in OPTION_KEYS:
+        errors.append(f"'dogru_cevap' A-D seçeneklerinden biri olmalı: {question.get('dogru_cevap')!r}")
+
+    if not errors:
+        question['secenekler'] = options
+        question['dogru_cevap'] = answer
+    return errors
+
+
+def parse_questions(text: str) -> Tuple[List[Dict], List[Dict]]:
+    """
+    LLM yanıtındaki soru dizisini tek geçişte ayrıştırır ve doğrular.
+    Bozuk veya şemaya uymayan sorular ayıklanır; geçerli olanlar korunur
+    (tek hatalı nesne tüm yanıtı düşürmez). Dizi yerine tek nesne dönmüşse o kabul edilir.
+
+    Args:
+        text: LLM yanıtı
+
+    Returns:
+        Tuple: (geçerli sorular, geçersizler [{'index', 'errors'}])
+    """
+    content = _content_start(text)
+    start = array_start(text, content)
+    if start != -1:
+        try:
+            items = _DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            items = None
+        if isinstance(items, list):
+            # Hızlı yol: JSON geçerli, sadece şema doğrulanır
+            return _validate_items(items, [])
+
+    parser = IncrementalArrayParser()
+    items = parser.feed(text[content:])
+    invalid = list(parser.errors)
+
+    if not parser.started:
+        value, error = extract_json(text, '{')
+        if error:
+            return [], [{"index": None, "errors": [error]}]
+        items = [value]
+    elif parser.incomplete:
+        invalid.append({"index": parser.count, "errors": ["Yanıt yarıda kesilmiş; son soru tamamlanmamış"]})
+
+    return _validate_items(items, invalid)
+
+
+def _validate_items(items: List[Any], invalid: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Ayrıştırılan elemanları doğrular; ayrıştırılamayanların sırası korunarak numaralanır."""
+    failed = {entry["index"] for entry in invalid}
+    valid = []
+    index = 0
+    for item in items:
+        while index in failed:
+            index += 1
+        errors = validate_question(item)
+        if errors:
+            invalid.append({"index": index, "errors": errors})
+        else:
+            valid.append(item)
+        index += 1
+
+    invalid.sort(key=lambda entry: -1 if entry["index"] is None else entry["index"])
+    return valid, invalid
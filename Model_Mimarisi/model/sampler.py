@@ -0,0 +1,94 @@
+"""
+LGS Türkçe Soru Tahminleme - Örnekleme Modülü
+Satır numaraları üzerinde katmanlı (stratified) few-shot örnekleme
+"""
+
+import random
+import threading
+from typing import List, Sequence
+
+import numpy as np
+
+
+class StratifiedSampler:
+    """
+    Satır numaraları üzerinde çalışan katmanlı örnekleyici.
+    Global random durumunu kullanmaz; kendi RNG'si kilitle korunur,
+    istek bazlı seed verilirse o isteğe özel RNG oluşturulur.
+    """
+
+    def __init__(self, seed: int = None):
+        """
+        Args:
+            seed: Örnekleyicinin kendi RNG'si için başlangıç değeri
+        """
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(
+        self,
+        rows: Sequence[int],
+        n: int,
+        strata: np.ndarray = None,
+        seed: int = None
+    ) -> List[int]:
+        """
+        Aday satırlardan n tanesini seçer.
+
+        Args:
+            rows: Aday satır numaraları
+            n: Seçilecek satır sayısı
+            strata: Satır -> katman kodu dizisi (tüm korpus için); None ise basit örnekleme
+            seed: İstek bazlı seed (tekrarlanabilir örnekleme için)
+
+        Returns:
+            List: Seçilen satır numaraları
+        """
+        if n <= 0:
+            return []
+        if len(rows) <= n:
+            return list(rows)
+
+        if seed is not None:
+            return self._sample(random.Random(seed), rows, n, strata)
+
+        with self._lock:
+            return self._sample(self._rng, rows, n, strata)
+
+    def _sample(
+        self,
+        rng: random.Random,
+        rows: Sequence[int],
+        n: int,
+        strata: np.ndarray
+    ) -> List[int]:
+        if strata is None:
+            return [rows[i] for i in rng.sample(range(len(rows)), n)]
+
+        # Aday satırları katman koduna göre grupla
+        row_array = np.asarray(rows, dtype=np.int64)
+        codes = strata[row_array]
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+        groups = np.split(row_array[order], boundaries)
+
+        # Katmanlar karışık sırayla dolaşılır; her turda her katmandan birer satır
+        # (alt başlık çeşitliliği önce sağlanır, büyük katmanlar sonra tekrar seçilir)
+        group_order = list(range(len(groups)))
+        rng.shuffle(group_order)
+        quotas = [0] * len(groups)
+        remaining = n
+        while remaining:
+            for g in group_order:
+                if remaining and quotas[g] < len(groups[g]):
+                    quotas[g] += 1
+                    remaining -= 1
+
+        selected = []
+        for g, quota in enumerate(quotas):
+            if quota:
+                group = groups[g]
+                selected.extend(int(group[i]) for i in rng.sample(range(len(group)), quota))
+
+        rng.shuffle(selected)
+        return selected
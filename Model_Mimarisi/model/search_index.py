@@ -0,0 +1,275 @@
+"""
+LGS Türkçe Soru Tahminleme - Tam Metin Arama Modülü
+Metin, soru kökü, cevap ve anahtar kelimeler üzerinde BM25 ters indeksi
+"""
+
+import json
+import zipfile
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .text_processing import tokenize, normalize_text
+
+
+# İndekslenen sütunlar ve BM25F alan ağırlıkları
+SEARCH_FIELDS = {
+    'Soru Kökleri': 1.5,
+    'Metinler': 1.0,
+    'Cevaplar': 0.5,
+    'Keywords': 2.0
+}
+
+
+def _field_text(value: Any) -> str:
+    """Sütun değerini metne çevirir (Keywords listesi birleştirilir)."""
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value)
+    return value or ''
+
+
+class BM25Index:
+    """
+    Alan ağırlıklı (BM25F) ters indeks.
+    Posting listeleri NumPy dizilerine derlenir; skorlar tüm korpus için
+    vektörel olarak biriktirilip top-k argpartition ile seçilir.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, fields: Dict[str, float] = None):
+        """
+        Args:
+            k1: Terim frekansı doygunluk parametresi
+            b: Doküman uzunluğu normalizasyonu
+            fields: Sütun -> ağırlık (varsayılan: SEARCH_FIELDS)
+        """
+        self.k1 = k1
+        self.b = b
+        self.fields = fields or SEARCH_FIELDS
+        self.fingerprint: Optional[str] = None
+
+        # Terim -> (satırlar, ağırlıklı tf) eklemeye açık ham listeler
+        self._raw: Dict[str, Tuple[array, array]] = {}
+        self._doc_len = array('f')
+
+        # Derlenmiş (salt okunur) hâl
+        self._compiled = False
+        self._vocab: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._rows = np.empty(0, dtype=np.int32)
+        self._tfs = np.empty(0, dtype=np.float32)
+        self._doc_len_arr = np.empty(0, dtype=np.float32)
+
+    @property
+    def size(self) -> int:
+        """İndekslenmiş doküman sayısı."""
+        return len(self._doc_len)
+
+    def build(self, data: Dict[str, Sequence[Any]], fingerprint: str = None):
+        """
+        İndeksi sıfırdan kurar.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+            fingerprint: Korpus sürümü (kalıcı indeksin geçerliliği için)
+        """
+        self.__init__(self.k1, self.b, self.fields)
+        self.add_rows(data, 0)
+        self.fingerprint = fingerprint
+
+    def add_rows(self, data: Dict[str, Sequence[Any]], start: int = None):
+        """
+        Yeni satırları indekse ekler.
+
+        Args:
+            data: Kanonik sütunlardaki soru verisi
+            start: İlk yeni satır (varsayılan: indekslenmiş son satırdan sonrası)
+        """
+        if start is None:
+            start = self.size
+
+        self._decompile()
+        total = len(data.get('Ticket_ID', []))
+
+        for row in range(start, total):
+            weighted = Counter()
+            for column, weight in self.fields.items():
+                values = data.get(column, [])
+                if row < len(values):
+                    for term in tokenize(_field_text(values[row])):
+                        weighted[term] += weight
+
+            for term, tf in weighted.items():
+                postings = self._raw.get(term)
+                if postings is None:
+                    postings = self._raw[term] = (array('i'), array('f'))
+                postings[0].append(row)
+                postings[1].append(tf)
+            self._doc_len.append(sum(weighted.values()))
+
+    def _decompile(self):
+        """Derlenmiş dizileri eklemeye açık ham listelere geri çevirir."""
+        if not self._compiled:
+            return
+        for term, code in self._vocab.items():
+            start, end = self._offsets[code], self._offsets[code + 1]
+            self._raw[term] = (
+                array('i', self._rows[start:end].tolist()),
+                array('f', self._tfs[start:end].tolist())
+            )
+        self._doc_len = array('f', self._doc_len_arr.tolist())
+        self._compiled = False
+
+    def _compile(self):
+        """Ham posting listelerini tek bir NumPy dizisinde birleştirir."""
+        if self._compiled:
+            return
+        self._vocab = {term: i for i, term in enumerate(self._raw)}
+        lengths = np.fromiter((len(p[0]) for p in self._raw.values()), dtype=np.int64, count=len(self._raw))
+        self._offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self._rows = np.frombuffer(b''.join(p[0].tobytes() for p in self._raw.values()), dtype=np.int32)
+        self._tfs = np.frombuffer(b''.join(p[1].tobytes() for p in self._raw.values()), dtype=np.float32)
+        self._doc_len_arr = np.frombuffer(self._doc_len.tobytes(), dtype=np.float32)
+        self._raw = {}
+        self._compiled = True
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        rows: Sequence[int] = None,
+        texts: Dict[str, Sequence[Any]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Sorguya en uygun satırları BM25 skoruyla döndürür.
+
+        Args:
+            query: Arama ifadesi (ör. "ana düşünce" veya şiir dizesi)
+            top_k: Döndürülecek sonuç sayısı
+            rows: Opsiyonel aday satırlar (kategori/yıl filtresi)
+            texts: Verilirse ilk adaylar ifadenin birebir geçişine göre öne alınır
+
+        Returns:
+            List: (satır, skor) çiftleri, skora göre azalan
+        """
+        self._compile()
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._vocab]
+        n_docs = len(self._doc_len_arr)
+        if not terms or n_docs == 0:
+            return []
+
+        avgdl = float(self._doc_len_arr.mean()) or 1.0
+        scores = np.zeros(n_docs, dtype=np.float32)
+
+        for term in terms:
+            code = self._vocab[term]
+            start, end = self._offsets[code], self._offsets[code + 1]
+            docs = self._rows[start:end]
+            tf = self._tfs[start:end]
+            df = end - start
+            idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self._doc_len_arr[docs] / avgdl)
+            scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        if rows is not None:
+            mask = np.zeros(n_docs, dtype=bool)
+            mask[np.asarray(rows, dtype=np.int64)] = True
+            scores[~mask] = 0.0
+
+        candidates = np.flatnonzero(scores)
+        if not len(candidates):
+            return []
+
+        # İfade eşleşmesiyle yeniden sıralama için biraz geniş aday kümesi alınır
+        pool = min(len(candidates), top_k * 3 if texts is not None else top_k)
+        top = candidates[np.argpartition(-scores[candidates], pool - 1)[:pool]]
+        results = [(int(row), float(scores[row])) for row in top]
+
+        if texts is not None:
+            phrase = normalize_text(query)
+            if ' ' in phrase:
+                results = [
+                    (row, score * 1.5 if self._contains_phrase(texts, row, phrase) else score)
+                    for row, score in results
+                ]
+
+        results.sort(key=lambda item: -item[1])
+        return results[:top_k]
+
+    def _contains_phrase(self, texts: Dict[str, Sequence[Any]], row: int, phrase: str) -> bool:
+        """İfadenin satırın indekslenen alanlarından birinde birebir geçip geçmediği."""
+        for column in self.fields:
+            values = texts.get(column, [])
+            if row < len(values) and phrase in normalize_text(_field_text(values[row])):
+                return True
+        return False
+
+    def save(self, path: Union[str, Path]) -> str:
+        """
+        İndeksi diske yazar (korpusun yanında saklanabilir).
+
+        Args:
+            path: .npz dosya yolu
+
+        Returns:
+            str: Yazılan dosya yolu
+        """
+        self._compile()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps({
+            'k1': self.k1,
+            'b': self.b,
+            'fields': self.fields,
+            'fingerprint': self.fingerprint,
+            'vocab': list(self._vocab)
+        }, ensure_ascii=False)
+
+        # Yarıda kesilen yazım eski indeksi bozmasın: önce geçici dosyaya yazılıp yer değiştirilir
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                meta=np.frombuffer(meta.encode('utf-8'), dtype=np.uint8),
+                offsets=self._offsets,
+                rows=self._rows,
+                tfs=self._tfs,
+                doc_len=self._doc_len_arr
+            )
+        tmp_path.replace(path)
+        return str(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], fingerprint: str = None) -> Optional['BM25Index']:
+        """
+        Diske yazılmış indeksi açar.
+
+        Args:
+            path: .npz dosya yolu
+            fingerprint: Beklenen korpus sürümü; uyuşmazsa None döner
+
+        Returns:
+            BM25Index veya None (dosya yoksa, bozuksa veya sürüm uyuşmazsa)
+        """
+        try:
+            with np.load(path) as archive:
+                meta = json.loads(archive['meta'].tobytes().decode('utf-8'))
+                if fingerprint is not None and meta['fingerprint'] != fingerprint:
+                    return None
+
+                index = cls(meta['k1'], meta['b'], meta['fields'])
+                index.fingerprint = meta['fingerprint']
+                index._vocab = {term: i for i, term in enumerate(meta['vocab'])}
+                index._offsets = archive['offsets']
+                index._rows = archive['rows']
+                index._tfs = archive['tfs']
+                index._doc_len_arr = archive['doc_len']
+                index._doc_len = array('f', index._doc_len_arr.tolist())
+                index._compiled = True
+                return index
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+            # Bozuk veya yarım dosya: çağıran indeksi yeniden kurar
+            print(f"Arama indeksi yüklenemedi: {e}")
+            return None
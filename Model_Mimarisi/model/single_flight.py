@@ -0,0 +1,67 @@
+"""
+LGS Türkçe Soru Tahminleme - İstek Birleştirme Modülü
+Aynı anahtarla eşzamanlı gelen LLM çağrılarını tek çağrıda birleştirir (single-flight)
+"""
+
+import asyncio
+from typing import Dict, Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için süren bir çağrı varsa yeni çağrı başlatmaz; bekleyenler
+    aynı sonucu paylaşır. Cache'in ilk yanıt gelene kadar kapatamadığı
+    "aynı anda gelen istek yığını" durumunu karşılar.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {'calls': 0, 'executions': 0, 'coalesced': 0, 'errors': 0}
+        self._peak_waiters = 0
+        self._waiters: Dict[str, int] = {}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Anahtar için süren çağrıya katılır veya yenisini başlatır.
+
+        Args:
+            key: Çağrı anahtarı (ör. yanıt cache anahtarı)
+            factory: Çağrıyı başlatan fonksiyon (sadece ilk çağıran için çalışır)
+
+        Returns:
+            Çağrının sonucu (tüm bekleyenlerle paylaşılır)
+        """
+        self._stats['calls'] += 1
+        task = self._inflight.get(key)
+
+        if task is None:
+            self._stats['executions'] += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        else:
+            self._stats['coalesced'] += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        self._peak_waiters = max(self._peak_waiters, self._waiters[key])
+
+        # shield: bekleyenlerden biri iptal edilirse ortak çağrı sürmeye devam eder
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self._stats['errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Birleştirme istatistikleri."""
+        calls = self._stats['calls']
+        return {
+            **self._stats,
+            'in_flight': len(self._inflight),
+            'peak_waiters': self._peak_waiters,
+            'coalesce_rate': round(self._stats['coalesced'] / calls, 3) if calls else 0.0
+        }
@@ -0,0 +1,65 @@
+"""
+LGS Türkçe Soru Tahminleme - Metin İşleme Modülü
+Türkçe'ye duyarlı küçük harfe çevirme ve tokenizasyon
+"""
+
+import re
+from typing import List
+
+
+# Python'un str.lower() fonksiyonu 'I' -> 'i' ve 'İ' -> 'i̇' yapar; Türkçe'de 'I' -> 'ı', 'İ' -> 'i'
+_TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Arama ve benzerlikte bilgi taşımayan sık sözcükler
+TURKISH_STOPWORDS = frozenset([
+    've', 'ile', 'bir', 'bu', 'şu', 'o', 'da', 'de', 'ki', 'mi', 'mı', 'mu', 'mü',
+    'için', 'gibi', 'daha', 'çok', 'en', 'ne', 'ya', 'veya', 'ama', 'fakat', 'ancak',
+    'her', 'hem', 'olan', 'olarak', 'kadar', 'sonra', 'önce', 'diye', 'ise', 'değil',
+    'bunu', 'buna', 'bunun', 'onun', 'ona', 'onu', 'şey', 'var', 'yok'
+])
+
+# Türkçe bitişken bir dil; ilk 5 harfe kesme (F5) basit ve etkili bir gövdeleme yöntemidir
+STEM_LENGTH = 5
+
+
+def turkish_lower(text: str) -> str:
+    """
+    Türkçe kurallarıyla küçük harfe çevirir.
+
+    Args:
+        text: Metin
+
+    Returns:
+        str: Küçük harfli metin ('IRMAK' -> 'ırmak', 'İSTANBUL' -> 'istanbul')
+    """
+    return text.translate(_TURKISH_UPPER).lower()
+
+
+def tokenize(text: str, stem: bool = True, stopwords: bool = True) -> List[str]:
+    """
+    Metni Türkçe'ye duyarlı şekilde tokenlara ayırır.
+
+    Args:
+        text: Metin
+        stem: True ise tokenlar ilk STEM_LENGTH harfe kesilir
+        stopwords: True ise sık sözcükler atılır
+
+    Returns:
+        List: Token listesi
+    """
+    if not text:
+        return []
+
+    tokens = _TOKEN_RE.findall(turkish_lower(text))
+    if stopwords:
+        tokens = [t for t in tokens if t not in TURKISH_STOPWORDS]
+    if stem:
+        tokens = [t[:STEM_LENGTH] for t in tokens]
+    return tokens
+
+
+def normalize_text(text: str) -> str:
+    """Karşılaştırma için metni küçük harf ve tek boşluklu hale getirir."""
+    return ' '.join(_TOKEN_RE.findall(turkish_lower(text or '')))
@@ -0,0 +1,105 @@
+"""
+LGS Türkçe Soru Tahminleme - Metin Vektörleri Modülü
+Karakter n-gram TF-IDF vektörleri (hashing ile sabit boyutlu, NumPy tabanlı)
+"""
+
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from .text_processing import normalize_text
+
+
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_BASE = np.uint64(1000003)
+
+
+def _ngram_buckets(text: str, ngram_range: Tuple[int, int], dim: int) -> np.ndarray:
+    """
+    Metnin karakter n-gramlarını vektörel rolling hash ile kova numaralarına çevirir.
+
+    Args:
+        text: Normalize edilmiş metin
+        ngram_range: (en küçük n, en büyük n)
+        dim: Kova sayısı
+
+    Returns:
+        np.ndarray: Her n-gram için kova numarası
+    """
+    codes = np.frombuffer(f' {text} '.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    buckets = []
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        if len(codes) < n:
+            continue
+        h = np.zeros(len(codes) - n + 1, dtype=np.uint64)
+        for k in range(n):
+            h = h * _BASE + codes[k:len(codes) - n + 1 + k]
+        # n değeri de karışıma katılır, farklı uzunluktaki n-gramlar ayrışır
+        h = (h + np.uint64(n)) * _HASH_MULTIPLIER
+        buckets.append((h >> np.uint64(40)) % np.uint64(dim))
+    if not buckets:
+        return np.empty(0, dtype=np.uint64)
+    return np.concatenate(buckets)
+
+
+class CharNgramVectorizer:
+    """
+    Türkçe metinler için karakter n-gram TF-IDF vektörleştirici.
+    Sözlük tutulmaz; n-gramlar sabit boyutlu uzaya hash'lenir ve vektörler L2 normalize edilir.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (3, 4)):
+        """
+        Args:
+            dim: Vektör boyutu
+            ngram_range: Karakter n-gram aralığı
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.idf = np.ones(dim, dtype=np.float32)
+
+    def _term_frequencies(self, texts: Iterable[str]) -> np.ndarray:
+        rows: List[np.ndarray] = []
+        for text in texts:
+            buckets = _ngram_buckets(normalize_text(text), self.ngram_range, self.dim)
+            counts = np.bincount(buckets.astype(np.int64), minlength=self.dim).astype(np.float32)
+            # Alt-doğrusal tf: uzun metinlerin baskınlığını azaltır
+            np.log1p(counts, out=counts)
+            rows.append(counts)
+        if not rows:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.vstack(rows)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def fit_transform(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        IDF ağırlıklarını öğrenir ve metinleri vektörleştirir.
+
+        Args:
+            texts: Metinler
+
+        Returns:
+            np.ndarray: (metin sayısı × dim) L2 normalize matris
+        """
+        tf = self._term_frequencies(texts)
+        n_docs = len(tf)
+        df = np.count_nonzero(tf, axis=0)
+        self.idf = (np.log((n_docs + 1) / (df + 1)) + 1.0).astype(np.float32)
+        return self._normalize(tf * self.idf)
+
+    def transform(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Öğrenilmiş IDF ile metinleri vektörleştirir.
+
+        Args:
+            texts: Metinler
+
+        Returns:
+            np.ndarray: (metin sayısı × dim) L2 normalize matris
+        """
+        return self._normalize(self._term_frequencies(texts) * self.idf)
@@ -0,0 +1,28 @@
+"""Testler proje kökünden (Model_Mimarisi) çalıştırılır: python -m pytest -q tests"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from model.local_provider import LocalStandInProvider  # noqa: E402
+from model.question_predictor import QuestionPredictor  # noqa: E402
+from model.resilience import ResilientCaller  # noqa: E402
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data.json"
+
+
+@pytest.fixture
+def make_predictor(tmp_path):
+    """Yerel sağlayıcıyla (API anahtarsız, düşük gecikme) tahminleyici kurar."""
+    def make(provider: LocalStandInProvider = None, rpm: float = 1000, **kwargs) -> QuestionPredictor:
+        return QuestionPredictor(
+            str(DATA_FILE),
+            None,
+            search_index_path=str(tmp_path / "search_index.npz"),
+            resilience=ResilientCaller(rpm=rpm, max_attempts=1),
+            provider=provider or LocalStandInProvider(latency=0.01, jitter=0.0),
+            **kwargs
+        )
+    return make
@@ -0,0 +1,23 @@
+"""Veri analizi testleri"""
+from pathlib import Path
+
+from model.data_analyzer import DataAnalyzer
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data.json"
+
+
+def test_snapshot_pattern_analysis_follows_custom_patterns(tmp_path):
+    snapshot = str(tmp_path / "corpus.snapshot")
+    analyzer = DataAnalyzer(str(DATA_FILE))
+    analyzer.save_snapshot(snapshot)
+    default_patterns = analyzer.get_pattern_analysis()['question_patterns']
+
+    reloaded = DataAnalyzer(snapshot_path=snapshot)
+    assert reloaded.snapshot is not None
+    assert reloaded.get_pattern_analysis()['question_patterns'] == default_patterns
+
+    custom = DataAnalyzer(snapshot_path=snapshot, patterns={'olumsuz': ['değildir']})
+    assert custom.snapshot is not None
+    patterns = custom.get_pattern_analysis()['question_patterns']
+    assert list(patterns) == ['olumsuz']
+    assert patterns['olumsuz'] > 0
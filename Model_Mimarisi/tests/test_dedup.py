@@ -0,0 +1,71 @@
+"""Yakın kopya (MinHash/LSH) testleri"""
+from pathlib import Path
+
+import pytest
+
+from model.data_analyzer import DataAnalyzer
+from model.dedup import NearDuplicateIndex
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data.json"
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return DataAnalyzer(str(DATA_FILE)).data
+
+
+def corpus_text(data, row: int = 0) -> str:
+    return f"{data['Metinler'][row]} {data['Soru Kökleri'][row]}"
+
+
+def edited(text: str) -> str:
+    """Metnin ortasındaki tek sözcüğü değiştirir."""
+    words = text.split()
+    words[len(words) // 2] = "değiştirildi"
+    return " ".join(words)
+
+
+def test_corpus_copy_and_light_edit_are_detected(corpus):
+    index = NearDuplicateIndex()
+    index.add_corpus(corpus)
+    text = corpus_text(corpus)
+
+    exact = index.query(text)
+    assert exact == {"source": "corpus", "ref": corpus["Ticket_ID"][0], "similarity": 1.0}
+    assert index.query(edited(text))["ref"] == corpus["Ticket_ID"][0]
+
+
+def test_partial_overlap_and_unrelated_text_pass_default_threshold(corpus):
+    index = NearDuplicateIndex()
+    index.add_corpus(corpus)
+    words = corpus_text(corpus).split()
+
+    assert index.query(" ".join(words[:len(words) // 2])) is None
+    assert index.query("Bugün hava çok güzel, parkta uzun bir yürüyüş yaptık ve eve döndük.") is None
+
+
+def test_threshold_decides_rejection(corpus):
+    text = corpus_text(corpus)
+    similarity = None
+    for threshold in (0.6, 0.99):
+        index = NearDuplicateIndex(threshold=threshold)
+        index.add(text, "corpus", "ref")
+        signature = index.signature(edited(text))
+        similarity = float((index._signatures[0] == signature).mean())
+        match = index.query(edited(text), signature=signature)
+        assert (match is not None) == (similarity >= threshold)
+    assert 0.6 <= similarity < 0.99
+
+
+def test_predictor_rejects_or_flags_duplicates_in_one_response(make_predictor):
+    predictor = make_predictor()
+    data = predictor.data_analyzer.data
+    copy = {"metin": data["Metinler"][0], "soru": data["Soru Kökleri"][0]}
+    fresh = {"metin": "Bugün hava çok güzel, parkta uzun bir yürüyüş yaptık.", "soru": "Bu metnin konusu nedir?"}
+
+    kept, matches = predictor._check_duplicates([dict(copy), dict(fresh), dict(fresh)], "reject")
+    assert kept == [fresh]
+    assert [match["duplicate_of"]["source"] for match in matches] == ["corpus", "generated"]
+
+    flagged, _ = predictor._check_duplicates([dict(copy)], "flag")
+    assert flagged[0]["duplicate_of"]["source"] == "corpus"
@@ -0,0 +1,96 @@
+"""Deneme sınavı planlama ve birleştirme testleri"""
+import asyncio
+
+from model.exam_builder import ExamBuilder, largest_remainder
+
+
+def question(text: str, difficulty: str, answer: str = "A") -> dict:
+    return {"soru": text, "metin": "", "zorluk": difficulty, "dogru_cevap": answer, "aciklama": "x"}
+
+
+def test_largest_remainder_hits_total_and_prefers_largest_fraction():
+    counts = largest_remainder({"a": 0.45, "b": 0.35, "c": 0.2}, 7)
+    assert counts == {"a": 3, "b": 3, "c": 1}
+    assert sum(counts.values()) == 7
+    assert largest_remainder({"a": 0, "b": 0}, 5) == {"a": 0, "b": 0}
+
+
+def test_plan_gives_one_slot_per_category_with_full_difficulty_mix():
+    plan = ExamBuilder(total=20).plan({"A": 0.4, "B": 0.3, "C": 0.2, "D": 0.1})
+
+    assert plan["categories"] == {"A": 8, "B": 6, "C": 4, "D": 2}
+    assert [slot["category"] for slot in plan["slots"]] == ["A", "B", "C", "D"]
+    for slot in plan["slots"]:
+        assert sum(slot["difficulties"].values()) == slot["count"]
+    totals = {}
+    for slot in plan["slots"]:
+        for level, n in slot["difficulties"].items():
+            totals[level] = totals.get(level, 0) + n
+    assert totals == plan["difficulties"] == {"kolay": 6, "orta": 8, "zor": 6}
+
+
+def test_plan_caps_slots_and_reallocates_dropped_categories():
+    plan = ExamBuilder(total=20).plan({"A": 0.4, "B": 0.3, "C": 0.2, "D": 0.1}, max_slots=2)
+
+    assert len(plan["slots"]) == 2
+    assert set(plan["categories"]) == {"A", "B"}
+    assert sum(plan["categories"].values()) == 20
+
+
+def test_assemble_orders_by_category_then_difficulty_and_splits_answer_key():
+    builder = ExamBuilder(total=4)
+    exam = builder.assemble(
+        {
+            "B": [question("b zor", "zor", "C"), question("b kolay", "kolay", "D")],
+            "A": [question("a orta", "orta", "B"), question("a orta", "orta", "B"), question("a kolay", "kolay")],
+        },
+        category_order=["A", "B"],
+        difficulty_order=["kolay", "orta", "zor"]
+    )
+
+    assert [q["soru"] for q in exam["questions"]] == ["a kolay", "a orta", "b kolay", "b zor"]
+    assert [q["soru_no"] for q in exam["questions"]] == [1, 2, 3, 4]
+    assert all("dogru_cevap" not in q and "aciklama" not in q for q in exam["questions"])
+    assert [key["dogru_cevap"] for key in exam["answer_key"]] == ["A", "B", "D", "C"]
+    assert exam["duplicates_removed"] == 1
+
+
+def test_shortfall_targets_missing_difficulties():
+    slots = [
+        {"category": "A", "count": 3, "difficulties": {"kolay": 1, "orta": 1, "zor": 1}},
+        {"category": "B", "count": 1, "difficulties": {"orta": 1}},
+    ]
+    missing = ExamBuilder.shortfall(slots, {"A": [question("x", "kolay")], "B": [question("y", "orta")]})
+
+    assert missing == [{"category": "A", "count": 2, "difficulties": {"orta": 1, "zor": 1}}]
+
+
+def test_build_exam_makes_one_call_per_category_and_one_history_entry(make_predictor):
+    predictor = make_predictor()
+    provider = predictor.gemini_client.provider
+
+    result = asyncio.run(predictor.build_exam(total=20))
+
+    summary = result["summary"]
+    # Yerel sağlayıcının küçük kategorilerinde yakın kopya çıkabilir; eksikler raporlanır
+    assert summary["generated"] + sum(summary["shortfall"].values()) == 20
+    categories = len(result["blueprint"]["categories"])
+    assert summary["calls"] == provider.stats()["calls"]
+    # İlk turda kategori başına bir çağrı; ek turda sadece eksik kalan kategoriler
+    assert categories <= summary["calls"] <= 2 * categories
+    levels = [q["zorluk"] for q in result["exam"]["questions"]]
+    for level, planned in result["blueprint"]["difficulties"].items():
+        assert levels.count(level) <= planned
+    history = predictor.get_prediction_history()
+    assert len(history) == 1
+    assert history[0]["request"]["type"] == "exam"
+
+
+def test_build_exam_caps_calls_at_limiter_burst(make_predictor):
+    predictor = make_predictor(rpm=2)
+
+    result = asyncio.run(predictor.build_exam(total=10))
+
+    assert len(result["blueprint"]["categories"]) <= 2
+    assert result["summary"]["calls"] <= 2
+    assert result["exam"]["question_count"] == 10
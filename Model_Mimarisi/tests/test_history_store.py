@@ -0,0 +1,54 @@
+"""Tahmin geçmişi testleri"""
+from model.history_store import HistoryStore
+
+
+def record(number: int, category: str = "Paragrafta Anlam") -> dict:
+    return {
+        "timestamp": f"2026-01-01T00:00:{number:02d}",
+        "request": {"category": category, "difficulty": "orta"},
+        "generated_questions": [{"soru": f"soru {number}"}],
+    }
+
+
+def walk(store: HistoryStore, **filters) -> list:
+    """Tüm sayfaları imleçle dolaşıp kayıt numaralarını döndürür."""
+    numbers, cursor = [], None
+    while True:
+        page = store.page(cursor=cursor, limit=2, **filters)
+        numbers += [int(item["timestamp"][-2:]) for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return numbers
+
+
+def test_cursor_pages_continue_past_memory_into_sqlite(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite", max_entries=3)
+    for number in range(1, 9):
+        store.append(record(number, "Cümlede Anlam" if number % 2 else "Paragrafta Anlam"))
+
+    assert [int(r["timestamp"][-2:]) for r in store.recent()] == [6, 7, 8]
+    assert walk(store) == [8, 7, 6, 5, 4, 3, 2, 1]
+    assert walk(store, category="Cümlede Anlam") == [7, 5, 3, 1]
+    assert store.page(limit=2)["total"] == 8
+
+
+def test_reopened_store_keeps_ids_and_recent_window(tmp_path):
+    path = tmp_path / "history.sqlite"
+    first = HistoryStore(path, max_entries=3)
+    for number in range(1, 6):
+        first.append(record(number))
+
+    reopened = HistoryStore(path, max_entries=3)
+    reopened.append(record(6))
+
+    assert [int(r["timestamp"][-2:]) for r in reopened.recent()] == [4, 5, 6]
+    assert walk(reopened) == [6, 5, 4, 3, 2, 1]
+    assert len(reopened) == 6
+
+
+def test_memory_only_store_pages_its_window():
+    store = HistoryStore(max_entries=3)
+    for number in range(1, 6):
+        store.append(record(number))
+
+    assert walk(store) == [5, 4, 3]
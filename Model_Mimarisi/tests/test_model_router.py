@@ -0,0 +1,53 @@
+"""Model yönlendirme testleri"""
+import asyncio
+
+from model.llm_provider import LLMProvider
+from model.model_router import ModelRouter
+from model.resilience import RateLimiter
+
+ANSWER = '[{"soru": "x"}]'
+
+
+class DelayedProvider(LLMProvider):
+    def __init__(self, name: str, delay: float):
+        super().__init__(name)
+        self.delay = delay
+        self.calls = 0
+
+    async def generate_async(self, prompt, timeout=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return ANSWER
+
+
+def test_hedge_reserves_limiter_capacity_and_records_cancelled_attempt():
+    slow, fast = DelayedProvider("slow", 0.5), DelayedProvider("fast", 0.01)
+    router = ModelRouter([slow, fast], hedge_delay=0.05)
+    limiter = RateLimiter(rpm=60)
+    router.bind_limiter(limiter)
+
+    async def scenario():
+        assert await router.generate_async("prompt") == ANSWER
+        await asyncio.sleep(0.01)
+
+    before = limiter.requests.tokens
+    asyncio.run(scenario())
+
+    assert router.stats()['hedge_wins'] == 1
+    # Hedge kotadan bir istek düşer (ilk deneme ResilientCaller'da sayılır)
+    assert before - limiter.requests.tokens >= 0.99
+    # Kaybeden yavaş denemenin süresi alt sınır olarak kaydedilir
+    assert len(router.latency[0]) == 1
+    assert router.latency[0].percentile(0.95) >= 0.05
+
+
+def test_hedge_skipped_when_quota_is_exhausted():
+    slow, fast = DelayedProvider("slow", 0.2), DelayedProvider("fast", 0.01)
+    router = ModelRouter([slow, fast], hedge_delay=0.05)
+    limiter = RateLimiter(rpm=1)
+    limiter.requests.reserve(1)
+    router.bind_limiter(limiter)
+
+    assert asyncio.run(router.generate_async("prompt")) == ANSWER
+    assert fast.calls == 0
+    assert router.stats()['hedges_skipped'] == 1
@@ -0,0 +1,57 @@
+"""Toplu tahminleme testleri"""
+import asyncio
+
+from model.exceptions import LLMUnavailableError
+
+
+def test_failing_spec_does_not_affect_others(make_predictor):
+    predictor = make_predictor()
+    client = predictor.gemini_client
+    generate = client.generate_questions_async
+
+    async def flaky(context, category, subcategory=None, count=5, difficulty="orta", **kwargs):
+        if difficulty == "zor":
+            raise LLMUnavailableError("servis yok")
+        return await generate(context, category, subcategory, count, difficulty, **kwargs)
+
+    client.generate_questions_async = flaky
+    specs = [
+        {"category": "Paragrafta Anlam", "difficulty": "kolay", "count": 3},
+        {"category": "Olmayan Kategori", "count": 3},
+        {"category": "Cümlede Anlam", "difficulty": "zor", "count": 3},
+        {"category": "Cümlede Anlam", "difficulty": "orta", "count": 2},
+    ]
+
+    batch = asyncio.run(predictor.predict_batch(specs))
+    results = batch["results"]
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["success"] and len(results[0]["generated_questions"]) == 3
+    assert not results[1]["success"] and results[1]["status_code"] == 400
+    assert not results[2]["success"] and results[2]["status_code"] == 503
+    assert results[3]["success"] and len(results[3]["generated_questions"]) == 2
+    assert batch["summary"]["succeeded"] == 2 and batch["summary"]["failed"] == 2
+
+
+def test_shared_context_selects_examples_per_spec(make_predictor):
+    predictor = make_predictor()
+    client = predictor.gemini_client
+    generate = client.generate_questions_async
+    seen = {}
+
+    async def capture(context, category, subcategory=None, count=5, difficulty="orta", **kwargs):
+        seen[difficulty] = [question.row for question in context["sample_questions"]]
+        return await generate(context, category, subcategory, count, difficulty, **kwargs)
+
+    client.generate_questions_async = capture
+    specs = [{"category": "Paragrafta Anlam", "difficulty": level, "count": 2} for level in ("kolay", "zor")]
+
+    batch = asyncio.run(predictor.predict_batch(specs))
+
+    assert batch["summary"]["contexts_built"] == 1
+    expected = {
+        level: [q.row for q in predictor.data_analyzer.get_few_shot_examples("Paragrafta Anlam", None, level, 5)]
+        for level in ("kolay", "zor")
+    }
+    assert seen == expected
+    assert seen["kolay"] != seen["zor"]
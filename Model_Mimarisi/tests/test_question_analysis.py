@@ -0,0 +1,56 @@
+"""Soru analizi güven eşiği ve ders dışı filtre testleri"""
+import pytest
+
+
+def corpus_question(predictor, row: int = 0) -> str:
+    data = predictor.data_analyzer.data
+    return f"{data['Metinler'][row]} {data['Soru Kökleri'][row]}"
+
+
+def provider_calls(predictor) -> int:
+    return predictor.gemini_client.provider.stats()["calls"]
+
+
+def test_confident_category_stays_local_with_advisory_subcategory(make_predictor):
+    predictor = make_predictor(analysis_confidence=0.6)
+    text = corpus_question(predictor)
+    local = predictor.data_analyzer.classify_question(text)
+    assert local["guven"]["kategori"] >= 0.6 > local["guven"]["alt_kategori"]
+
+    analysis = predictor.analyze_question(text, narrative=False)["analysis"]
+
+    assert analysis["kaynak"] == "yerel"
+    assert analysis["kategori"] == local["kategori"]
+    assert analysis["alt_kategori_dusuk_guven"] is True
+    assert "dusuk_guven" not in analysis
+    assert provider_calls(predictor) == 0
+
+
+def test_low_category_confidence_goes_to_llm_only_with_narrative(make_predictor):
+    predictor = make_predictor(analysis_confidence=1.01)
+    text = corpus_question(predictor)
+
+    local_only = predictor.analyze_question(text, narrative=False)["analysis"]
+    assert local_only["kaynak"] == "yerel"
+    assert local_only["dusuk_guven"] is True
+    assert provider_calls(predictor) == 0
+
+    full = predictor.analyze_question(text, use_cache=False)["analysis"]
+    assert full["kaynak"] == "gemini"
+    assert full["yerel_tahmin"]["kategori"] == local_only["kategori"]
+    assert provider_calls(predictor) == 1
+    assert predictor.analysis_stats["llm"] == 1
+
+
+@pytest.mark.parametrize("text", [
+    "What is the capital of France and how many people live there?",
+    "Bir üçgenin iç açıları toplamı kaç derecedir? 3x + 5 = 20 denkleminde x kaçtır?",
+])
+def test_off_topic_questions_are_rejected_without_llm_call(make_predictor, text):
+    predictor = make_predictor()
+
+    result = predictor.analyze_question(text)
+
+    assert "error" in result
+    assert predictor.analysis_stats["off_topic"] == 1
+    assert provider_calls(predictor) == 0
@@ -0,0 +1,68 @@
+"""Dayanıklılık katmanı testleri"""
+import asyncio
+import time
+
+import pytest
+
+from model.exceptions import CircuitOpenError, LLMUnavailableError
+from model.resilience import CircuitBreaker, ResilientCaller
+
+
+def _open_caller() -> ResilientCaller:
+    caller = ResilientCaller(rpm=6000, max_attempts=1, failure_threshold=1, recovery_time=0.05)
+
+    async def fail():
+        raise LLMUnavailableError("upstream down")
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(caller.call(fail))
+    assert caller.breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    return caller
+
+
+def test_cancelled_half_open_call_reopens_breaker():
+    caller = _open_caller()
+
+    async def scenario():
+        task = asyncio.ensure_future(caller.call(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        assert caller.breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert caller.breaker.state == CircuitBreaker.OPEN
+
+        async def ok():
+            return "ok"
+
+        # Bekleme süresi dolmuştu: sıradaki çağrı yeni deneme çağrısıdır ve devreyi kapatır
+        assert await caller.call(ok) == "ok"
+        assert caller.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_open_breaker_rejects_without_calling():
+    caller = ResilientCaller(rpm=6000, max_attempts=1, failure_threshold=1, recovery_time=60)
+
+    async def fail():
+        raise LLMUnavailableError("upstream down")
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(caller.call(fail))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(caller.call(fail))
+
+
+def test_interrupted_sync_half_open_call_reopens_breaker():
+    caller = _open_caller()
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        caller.call_sync(interrupted)
+    assert caller.breaker.state == CircuitBreaker.OPEN
+    assert caller.call_sync(lambda: "ok") == "ok"
+    assert caller.breaker.state == CircuitBreaker.CLOSED
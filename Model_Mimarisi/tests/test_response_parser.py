@@ -0,0 +1,53 @@
+"""Yanıt ayrıştırma testleri"""
+import json
+
+from model.model_router import has_json
+from model.response_parser import IncrementalArrayParser, extract_json, parse_questions
+
+
+def _question(answer: str = "B") -> dict:
+    return {
+        "soru": "Bu parçada asıl anlatılmak istenen nedir?",
+        "secenekler": {"A": "a", "B": "b", "C": "c", "D": "d"},
+        "dogru_cevap": answer
+    }
+
+
+def test_bracketed_prose_before_array_is_skipped():
+    text = f"Here are [2] questions:\n{json.dumps([_question(), _question('C')])}"
+
+    valid, invalid = parse_questions(text)
+
+    assert [q["dogru_cevap"] for q in valid] == ["B", "C"]
+    assert invalid == []
+
+
+def test_bracketed_prose_before_truncated_array_uses_incremental_parser():
+    text = f"Here are [2] questions:\n[{json.dumps(_question())}, {{\"soru\": \"yarım"
+
+    valid, invalid = parse_questions(text)
+
+    assert len(valid) == 1
+    assert invalid[0]["index"] == 1
+
+
+def test_incremental_parser_skips_bracketed_prose_across_chunks():
+    parser = IncrementalArrayParser()
+    text = f"Toplam [2] soru:\n```json\n{json.dumps([_question(), _question()])}\n```"
+
+    items = [item for i in range(0, len(text), 7) for item in parser.feed(text[i:i + 7])]
+
+    assert len(items) == 2
+    assert parser.finished
+
+
+def test_extract_json_and_has_json_ignore_bracketed_prose():
+    text = 'Sonuç [1] aşağıdadır: [{"a": 1}]'
+
+    assert extract_json(text, '[')[0] == [{"a": 1}]
+    assert has_json(text)
+    assert not has_json("Sadece [2] parantez")
+
+
+def test_empty_array_is_valid_empty_response():
+    assert parse_questions("[]") == ([], [])
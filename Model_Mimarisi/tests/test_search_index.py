@@ -0,0 +1,79 @@
+"""BM25 arama indeksi testleri"""
+from pathlib import Path
+
+from model.data_analyzer import DataAnalyzer
+from model.search_index import BM25Index
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data.json"
+
+DOCS = {
+    'Ticket_ID': [1, 2, 3, 4],
+    'Metinler': [
+        "Kitap okumak insanın ufkunu genişletir.",
+        "Deniz kenarında yürüyüş yaptık.",
+        "Kitap kitap üstüne koyduk, kitap kulesi yaptık.",
+        "",
+    ],
+    'Soru Kökleri': [
+        "Bu paragrafın ana düşüncesi nedir?",
+        "Bu cümlede hangi duygu vardır?",
+        "Bu paragrafta hangisine değinilmiştir?",
+        "Ana düşünce aşağıdakilerden hangisidir?",
+    ],
+    'Cevaplar': ["", "", "", ""],
+    'Keywords': [["okuma"], ["deniz"], ["kitap"], ["ana düşünce"]],
+}
+
+
+def test_ranking_prefers_term_frequency_and_keyword_field():
+    index = BM25Index()
+    index.build(DOCS)
+
+    rows = [row for row, _ in index.search("kitap", top_k=3)]
+    assert rows[:2] == [2, 0]
+    assert 1 not in rows
+    assert index.search("olmayankelime") == []
+
+
+def test_rows_filter_limits_candidates():
+    index = BM25Index()
+    index.build(DOCS)
+
+    assert [row for row, _ in index.search("kitap", rows=[0, 1])] == [0]
+
+
+def test_save_load_round_trip_and_fingerprint_check(tmp_path):
+    path = tmp_path / "index.npz"
+    index = BM25Index()
+    index.build(DOCS, fingerprint="v1")
+    index.save(path)
+
+    assert not (tmp_path / "index.npz.tmp").exists()
+    loaded = BM25Index.load(path, fingerprint="v1")
+    assert loaded.search("ana düşünce") == index.search("ana düşünce")
+    assert BM25Index.load(path, fingerprint="v2") is None
+
+
+def test_load_returns_none_for_corrupt_file(tmp_path):
+    path = tmp_path / "index.npz"
+    index = BM25Index()
+    index.build(DOCS)
+    index.save(path)
+
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    assert BM25Index.load(path) is None
+    path.write_bytes(b"PK\x03\x04 bozuk")
+    assert BM25Index.load(path) is None
+
+
+def test_analyzer_rebuilds_corrupt_index_and_applies_category_filter(tmp_path):
+    path = tmp_path / "search_index.npz"
+    path.write_bytes(b"PK\x03\x04" + b"\x00" * 64)
+
+    analyzer = DataAnalyzer(str(DATA_FILE), search_index_path=str(path))
+    results = analyzer.search("paragraf", top_k=5, category="Paragrafta Anlam")
+
+    assert results
+    assert all(question['kategori'] == "Paragrafta Anlam" for question, _ in results)
+    assert BM25Index.load(path, fingerprint=analyzer.corpus_version) is not None